@@ -4,12 +4,19 @@ from pprint import pp
 
 class App:
 
-    def __init__(self, model, view, controller):
+    def __init__(self, model, view, controller, cache=None):
         self.model = model
         self.view = view
         self.controller = controller
+        self.cache = cache
 
     def run(self):
-        report = self.model.report()
-        with open("./out.json", "w", encoding='utf8') as f:
+        if self.cache is None:
+            report = self.model.report()
+        else:
+            report = self.cache.get_or_compute(self.model.initial_data, self.model.report)
+        self.save(report)
+
+    def save(self, report, path="./out.json"):
+        with open(path, "w", encoding='utf8') as f:
             json.dump(report, f, ensure_ascii=False, indent=4)
@@ -0,0 +1,240 @@
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from app.model import INITIAL_KEYS
+from app.stream import json_default
+
+# наибольшее число ключей в одном запросе (ограничение SQLite на число параметров)
+SQL_CHUNK = 500
+
+# пакеты, исходные тексты которых входят в версию кода
+CODE_PACKAGES = ("ftnp", "app")
+
+# способы расчета отчета: обычный (MobileNetworkEngineer) и пакетный
+# (from_columns, может использовать таблицу Эрланга B), отчеты разных
+# способов хранятся под разными ключами
+EVALUATIONS = ("scalar", "batch")
+
+
+@functools.lru_cache(maxsize=4)
+def code_version(root=None):
+    """
+    Хэш исходных текстов всех модулей пакетов CODE_PACKAGES, от которых
+    зависит отчет (расчет, пакетный режим, нормализация и запись):
+    при их изменении ранее сохраненные отчеты не используются
+
+    :param root: каталог с пакетами, по умолчанию - каталог этой установки
+    """
+    root = root or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+    for package in CODE_PACKAGES:
+        directory = os.path.join(root, package)
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".py"):
+                digest.update("{}/{}\0".format(package, name).encode("utf8"))
+                with open(os.path.join(directory, name), "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _normalize(value):
+    if type(value) is float:
+        return value
+    if isinstance(value, (bool, str)) or value is None:
+        return value
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    return [_normalize(v) for v in value]
+
+
+def scenario_key(initial, evaluation="scalar"):
+    """
+    Ключ отчета: хэш канонической записи исходных данных
+    (только ключи отчета, числа приведены к float), способа
+    расчета и версии кода
+
+    :param initial: словарь исходных данных
+    :param evaluation: способ расчета из EVALUATIONS
+    """
+    if evaluation not in EVALUATIONS:
+        raise ValueError("Неизвестный способ расчета: {}".format(evaluation))
+    canonical = json.dumps(
+        {key: _normalize(initial[key]) for key in INITIAL_KEYS},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256((code_version() + evaluation + canonical).encode("utf8")).hexdigest()
+
+
+class ReportCache:
+    """
+    Хранилище отчетов на диске (SQLite) с адресацией по содержимому
+    исходных данных. Безопасно при одновременной работе нескольких
+    процессов; при превышении max_bytes вытесняются давно не
+    использованные отчеты. Счетчики попаданий, промахов и вытеснений
+    общие для всех процессов.
+    """
+
+    def __init__(self, path, max_bytes=256 * 2 ** 20):
+        """
+        :param path: путь к файлу базы данных
+        :param max_bytes: наибольший суммарный размер отчетов, байт
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        with self._transaction() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+            db.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            db.executemany(
+                "INSERT OR IGNORE INTO stats VALUES (?, 0)",
+                [("hits",), ("misses",), ("evictions",), ("bytes",)]
+            )
+
+    def _transaction(self):
+        return _Transaction(self.connection)
+
+    def _count(self, db, name, delta):
+        db.execute("UPDATE stats SET value = value + ? WHERE name = ?", (delta, name))
+
+    def get(self, initial, evaluation="scalar"):
+        """
+        Сохраненный отчет для исходных данных или None
+
+        :param initial: словарь исходных данных
+        :param evaluation: способ расчета из EVALUATIONS
+        """
+        return self.get_many([initial], evaluation)[0]
+
+    def get_many(self, initials, evaluation="scalar"):
+        """
+        Сохраненные отчеты для списка исходных данных (None для
+        отсутствующих) в том же порядке, одной транзакцией
+
+        :param initials: список словарей исходных данных
+        :param evaluation: способ расчета из EVALUATIONS
+        """
+        keys = [scenario_key(initial, evaluation) for initial in initials]
+        unique = list(dict.fromkeys(keys))
+        found = {}
+        with self._transaction() as db:
+            for start in range(0, len(unique), SQL_CHUNK):
+                chunk = unique[start:start + SQL_CHUNK]
+                found.update(db.execute(
+                    "SELECT key, value FROM entries WHERE key IN ({})".format(", ".join("?" * len(chunk))),
+                    chunk
+                ))
+            now = time.time()
+            db.executemany("UPDATE entries SET last_access = ? WHERE key = ?", [(now, key) for key in found])
+            hits = sum(key in found for key in keys)
+            self._count(db, "hits", hits)
+            self._count(db, "misses", len(keys) - hits)
+        reports = {key: json.loads(value) for key, value in found.items()}
+        return [reports.get(key) for key in keys]
+
+    def put(self, initial, report, evaluation="scalar"):
+        """
+        Сохранение отчета с вытеснением давно не использованных при переполнении
+
+        :param initial: словарь исходных данных
+        :param report: отчет MobileNetworkEngineer.report()
+        :param evaluation: способ расчета из EVALUATIONS
+        """
+        self.put_many([(initial, report)], evaluation)
+
+    def put_many(self, items, evaluation="scalar"):
+        """
+        Сохранение нескольких отчетов одной транзакцией
+
+        :param items: список пар (исходные данные, отчет)
+        :param evaluation: способ расчета из EVALUATIONS
+        """
+        rows = {}
+        now = time.time()
+        for initial, report in items:
+            value = json.dumps(report, ensure_ascii=False, default=json_default).encode("utf8")
+            rows[scenario_key(initial, evaluation)] = (value, len(value), now)
+        if not rows:
+            return
+        keys = list(rows)
+        with self._transaction() as db:
+            old = {}
+            for start in range(0, len(keys), SQL_CHUNK):
+                chunk = keys[start:start + SQL_CHUNK]
+                old.update(db.execute(
+                    "SELECT key, size FROM entries WHERE key IN ({})".format(", ".join("?" * len(chunk))),
+                    chunk
+                ))
+            db.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                [(key,) + row for key, row in rows.items()]
+            )
+            self._count(db, "bytes", sum(size for _, size, _ in rows.values()) - sum(old.values()))
+            self._evict(db)
+
+    def _evict(self, db):
+        excess = db.execute("SELECT value FROM stats WHERE name = 'bytes'").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        freed = 0
+        for key, size in db.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        db.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self._count(db, "bytes", -freed)
+        self._count(db, "evictions", len(victims))
+
+    def get_or_compute(self, initial, compute, evaluation="scalar"):
+        """
+        Отчет из хранилища или результат compute(), который сохраняется
+
+        :param initial: словарь исходных данных
+        :param compute: функция расчета отчета без аргументов
+        :param evaluation: способ расчета из EVALUATIONS
+        """
+        report = self.get(initial, evaluation)
+        if report is None:
+            report = compute()
+            self.put(initial, report, evaluation)
+        return report
+
+    def stats(self):
+        """
+        Счетчики попаданий, промахов и вытеснений, число отчетов
+        и их суммарный размер в байтах
+        """
+        with self._transaction() as db:
+            result = dict(db.execute("SELECT name, value FROM stats"))
+            result["entries"] = db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return result
+
+    def close(self):
+        self.connection.close()
+
+
+class _Transaction:
+    # BEGIN IMMEDIATE сразу берет блокировку записи, что исключает
+    # взаимоблокировки при повышении уровня блокировки из чтения
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc, tb):
+        self.connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
@@ -0,0 +1,209 @@
+import itertools
+import json
+import os
+
+import numpy as np
+
+from app.model import REPORT_FIELDS
+
+FIELD_IDS = {name: field for field, name in REPORT_FIELDS}
+
+METADATA = "metadata.json"
+
+# число строк, переписываемых за раз при расширении типа столбца
+WIDEN_CHUNK = 65536
+
+# числовые типы NumPy: между ними тип столбца расширяется, но не к строкам
+NUMERIC_KINDS = "biuf"
+
+
+class ColumnarWriter:
+    """
+    Запись результатов по столбцам: каждый столбец - файл <id>.bin
+    с типизированными значениями подряд, в metadata.json - число строк,
+    тип, форма элемента и полное имя каждого столбца. Тип столбца
+    расширяется, если новая порция его не вмещает (целые -> float64,
+    короткие строки -> длинные). Строки добавляются порциями; число
+    строк в metadata.json обновляется после записи порции, поэтому
+    незавершенная порция при следующем открытии отбрасывается.
+    """
+
+    def __init__(self, directory):
+        """
+        :param directory: каталог результатов, существующий дописывается
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.metadata = {"rows": 0, "fields": {}}
+        path = os.path.join(directory, METADATA)
+        if os.path.exists(path):
+            with open(path, encoding="utf8") as f:
+                self.metadata = json.load(f)
+            for field, info in self.metadata["fields"].items():
+                with open(self._path(field), "r+b") as f:
+                    f.truncate(self.metadata["rows"] * _row_bytes(info))
+
+    def _path(self, field):
+        return os.path.join(self.directory, field + ".bin")
+
+    def append(self, columns):
+        """
+        Добавление порции строк
+
+        :param columns: словарь имя -> массив длины n; записи отчета
+            сохраняются под идентификаторами REPORT_FIELDS, остальные
+            ключи - как есть
+        """
+        arrays = {FIELD_IDS.get(name, name): (name, np.asarray(value)) for name, value in columns.items()}
+        lengths = {len(value) for _, value in arrays.values()}
+        if len(lengths) != 1:
+            raise ValueError("Столбцы разной длины: {}".format(sorted(lengths)))
+        fields = self.metadata["fields"]
+        if self.metadata["rows"] and set(arrays) != set(fields):
+            raise ValueError("Набор столбцов отличается от записанного ранее")
+        for field, (name, value) in arrays.items():
+            if field not in fields:
+                fields[field] = {
+                    "name": name,
+                    "dtype": value.dtype.str,
+                    "shape": list(value.shape[1:]),
+                }
+            info = fields[field]
+            if list(value.shape[1:]) != info["shape"]:
+                raise ValueError("Форма столбца {} отличается от записанной ранее".format(field))
+            self._widen(field, value.dtype)
+        for field, (name, value) in arrays.items():
+            value = np.ascontiguousarray(value, dtype=fields[field]["dtype"])
+            with open(self._path(field), "ab") as f:
+                f.write(value.tobytes())
+        self.metadata["rows"] += lengths.pop()
+        self._save_metadata()
+
+    def _widen(self, field, dtype):
+        # тип столбца расширяется так, чтобы вместить и записанные, и новые
+        # значения (например, целые -> float64), записанные строки
+        # переписываются в новом типе; несовместимые типы - ошибка
+        info = self.metadata["fields"][field]
+        old = np.dtype(info["dtype"])
+        try:
+            new = np.result_type(old, dtype)
+        except TypeError:
+            new = None
+        numeric = (old.kind in NUMERIC_KINDS, np.dtype(dtype).kind in NUMERIC_KINDS)
+        if new is None or numeric[0] != numeric[1] or not (
+                np.can_cast(dtype, new, "same_kind") and np.can_cast(old, new, "same_kind")):
+            raise ValueError("Тип {} несовместим с типом {} столбца {}".format(dtype, old, field))
+        if new == old:
+            return
+        rows = self.metadata["rows"]
+        if rows:
+            shape = (rows,) + tuple(info["shape"])
+            column = np.memmap(self._path(field), old, "r", shape=shape)
+            with open(self._path(field) + ".tmp", "wb") as f:
+                for start in range(0, rows, WIDEN_CHUNK):
+                    f.write(np.ascontiguousarray(column[start:start + WIDEN_CHUNK], dtype=new).tobytes())
+            del column
+            os.replace(self._path(field) + ".tmp", self._path(field))
+        info["dtype"] = new.str
+        self._save_metadata()
+
+    def _save_metadata(self):
+        path = os.path.join(self.directory, METADATA)
+        with open(path + ".tmp", "w", encoding="utf8") as f:
+            json.dump(self.metadata, f, ensure_ascii=False, indent=4)
+        os.replace(path + ".tmp", path)
+
+
+def _row_bytes(info):
+    return np.dtype(info["dtype"]).itemsize * int(np.prod(info["shape"], dtype=np.int64))
+
+
+def read_columnar(directory, names=False):
+    """
+    Столбцы, записанные ColumnarWriter, в виде массивов,
+    отображаемых в память только для чтения
+
+    :param directory: каталог результатов
+    :param names: ключи - полные имена столбцов вместо идентификаторов
+    """
+    with open(os.path.join(directory, METADATA), encoding="utf8") as f:
+        metadata = json.load(f)
+    rows = metadata["rows"]
+    result = {}
+    for field, info in metadata["fields"].items():
+        shape = (rows,) + tuple(info["shape"])
+        if rows:
+            value = np.memmap(os.path.join(directory, field + ".bin"), info["dtype"], "r", shape=shape)
+        else:
+            value = np.empty(shape, dtype=info["dtype"])
+        result[info["name"] if names else field] = value
+    return result
+
+
+def json_to_columnar(path, directory, chunk_size=65536):
+    """
+    Преобразование JSON в столбцы: отчет App.save (один объект, возможно
+    на нескольких строках) или JSONL потокового расчета (строки с "report",
+    строки с ошибками пропускаются, номер строки ввода - столбец "line").
+    JSONL читается построчно, в памяти - не больше одной порции.
+
+    :param path: файл JSON или JSONL
+    :param directory: каталог результатов
+    :param chunk_size: число строк в порции записи
+    """
+    writer = ColumnarWriter(directory)
+    with open(path, encoding="utf8") as f:
+        first = f.readline()
+        if first.strip() == "{":
+            # App.save пишет отчет с отступами, первая строка - одна скобка
+            first += f.read()
+        report = json.loads(first) if first.strip() else None
+        if isinstance(report, dict) and "line" not in report:
+            writer.append({key: [value] for key, value in report.items()})
+            return
+        rows = []
+        for line in itertools.chain([first], f):
+            if line.strip():
+                record = json.loads(line)
+                if "report" in record:
+                    rows.append(dict(line=record["line"], **record["report"]))
+            if len(rows) == chunk_size:
+                writer.append(_rows_to_columns(rows))
+                rows = []
+        if rows:
+            writer.append(_rows_to_columns(rows))
+
+
+def columnar_to_json(directory, path, chunk_size=65536):
+    """
+    Обратное преобразование: одна строка записывается как отчет App.save,
+    несколько - как JSONL записей {"line": ..., "report": ...}
+    (номер строки - из столбца "line" или по порядку). Столбцы читаются
+    порциями по chunk_size строк.
+
+    :param directory: каталог результатов
+    :param path: файл JSON или JSONL
+    :param chunk_size: число строк в порции чтения
+    """
+    columns = read_columnar(directory, names=True)
+    lines = columns.pop("line", None)
+    rows = len(next(iter(columns.values()), []))
+    with open(path, "w", encoding="utf8") as f:
+        if rows == 1 and lines is None:
+            json.dump({name: value[0].tolist() for name, value in columns.items()}, f, ensure_ascii=False, indent=4)
+            return
+        for start in range(0, rows, chunk_size):
+            stop = min(start + chunk_size, rows)
+            chunk = {name: value[start:stop].tolist() for name, value in columns.items()}
+            numbers = lines[start:stop].tolist() if lines is not None else range(start + 1, stop + 1)
+            for k, number in enumerate(numbers):
+                record = {
+                    "line": number,
+                    "report": {name: value[k] for name, value in chunk.items()},
+                }
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+
+
+def _rows_to_columns(rows):
+    return {key: [row[key] for row in rows] for key in rows[0]}
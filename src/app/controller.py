@@ -1,3 +1,116 @@
+import numpy as np
+
+from app.model import REPORT_ENTRIES
+from ftnp.cluster import ClusterBatch
+from ftnp.leb import LEBBatch
+from ftnp.nsp import NSPBatch
+
+
+# записи отчета в порядке расчета:
+# (запись, исходные данные, записи, от которых зависит, расчет по модели и готовым записям)
+REPORT_GRAPH = tuple(
+    (entry, inputs, needs, compute) for _, _, entry, inputs, needs, compute in REPORT_ENTRIES)
+
+# ключ исходных данных -> атрибуты калькуляторов, в которых он хранится
+CALCULATOR_ATTRIBUTES = {
+    "cluster_dim": (("cluster_calculator", "cluster_dim"), ("nsp", "cluster_dim")),
+    "tetta": (("cluster_calculator", "tetta"),),
+    "cell_sectors_num": (("cluster_calculator", "cell_sectors_num"), ("nsp", "cell_sectors_count")),
+    "signal_to_noise_ratio": (("cluster_calculator", "signal_to_noise_ratio"),),
+    "sector_radio_chan": (("nsp", "radio_chan_per_sector"),),
+    "traffic_transmission_ch_num": (("nsp", "traffic_transmission_ch_num"),),
+    "call_blocking_admissible_prob": (("nsp", "call_blocking_admissible_prob"),),
+    "subscribers_total": (("nsp", "subscribers_total_num"),),
+}
+
+
 class ConsoleController:
+    """
+    Интерактивный пересчет отчета MobileNetworkEngineer. Записи отчета
+    связаны с исходными данными графом REPORT_GRAPH: после изменения
+    исходных данных пересчитываются только зависящие от них записи,
+    остальные берутся из кэша. Работает и с пакетной моделью
+    MobileNetworkEngineer.from_columns, изменения можно задавать
+    для отдельных сценариев пакета.
+    """
+
+    def __init__(self, model=None):
+        self.model = None
+        self.report = {}
+        # счетчик пересчетов по записям отчета
+        self.recomputed = {}
+        if model is not None:
+            self.load(model)
+
+    def load(self, model):
+        """
+        Полный расчет отчета модели и заполнение кэша записей
+
+        :param model: MobileNetworkEngineer
+        """
+        self.model = model
+        self.report = {}
+        self._recompute(entry for entry, *_ in REPORT_GRAPH)
+        return self.report
+
+    def affected(self, keys):
+        """
+        Записи отчета, зависящие от ключей исходных данных keys, в порядке расчета
+
+        :param keys: ключи исходных данных
+        """
+        keys = set(keys)
+        result = []
+        for entry, inputs, needs, _ in REPORT_GRAPH:
+            if keys.intersection(inputs) or set(needs).intersection(result):
+                result.append(entry)
+        return result
+
+    def update(self, changes, rows=None):
+        """
+        Изменение исходных данных с пересчетом зависящих записей отчета.
+        Возвращает словарь пересчитанных записей.
+
+        :param changes: словарь ключ исходных данных -> новое значение
+        :param rows: для пакетной модели - номера изменяемых сценариев,
+            по умолчанию изменяются все сценарии; у обычной модели
+            один сценарий с номером 0
+        """
+        m = self.model
+        if rows is not None and not isinstance(m.nsp, NSPBatch):
+            if not np.arange(1)[rows].size:
+                return {}
+            rows = None
+        # все новые значения строятся и проверяются до изменения модели,
+        # чтобы ошибка не оставила модель в частично измененном состоянии
+        values = {}
+        for key, value in changes.items():
+            if rows is not None:
+                column = np.asarray(m.initial_data[key])
+                # тип строк фиксированной длины расширяется под новое значение
+                column = column.astype(np.result_type(column, np.asarray(value)))
+                column[rows] = value
+                value = column
+            if key == "city_type":
+                LEBBatch.is_large_city(value)
+            values[key] = value
+        if values.keys() & {"cluster_dim", "cell_sectors_num"}:
+            ClusterBatch.check_parameters(
+                values.get("cluster_dim", m.initial_data["cluster_dim"]),
+                values.get("cell_sectors_num", m.initial_data["cell_sectors_num"]))
+        for key, value in values.items():
+            m.initial_data[key] = value
+            for calculator, attribute in CALCULATOR_ATTRIBUTES.get(key, ()):
+                # NSP хранит вероятность блокировки в кортеже
+                if key == "call_blocking_admissible_prob":
+                    value = (value,)
+                setattr(getattr(m, calculator), attribute, value)
+        entries = self.affected(changes)
+        self._recompute(entries)
+        return {entry: self.report[entry] for entry in entries}
 
-    pass
\ No newline at end of file
+    def _recompute(self, entries):
+        graph = {entry: compute for entry, _, _, compute in REPORT_GRAPH}
+        for entry in entries:
+            self.report[entry] = graph[entry](self.model, self.report)
+            self.recomputed[entry] = self.recomputed.get(entry, 0) + 1
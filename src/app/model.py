@@ -1,102 +1,276 @@
-from ftnp.cluster import Cluster
-from ftnp.nsp import NSP
-from ftnp.leb import LEB
+import numpy as np
+
+from ftnp.cluster import Cluster, ClusterBatch
+from ftnp.nsp import NSP, NSPBatch
+from ftnp.leb import LEB, LEBBatch
+
+# ключи исходных данных, используемые в отчете
+INITIAL_KEYS = (
+    "cluster_dim", "tetta", "cell_sectors_num", "signal_to_noise_ratio",
+    "sector_radio_chan", "traffic_transmission_ch_num",
+    "call_blocking_admissible_prob", "subscribers_total",
+    "land_area", "one_fq_ch_bandwith", "busy_hour_activity",
+    "conversation_ch_num_per_carrier", "building_penetraition_loses",
+    "subscriber_body_loses", "location_coverage",
+    "eqv_isotropically_radiated_pow", "useful_signal_strength",
+    "transmitter_output_power", "transmitter_antenna_gain",
+    "transmission_antenna_feeder_loss", "duplex_filter_loss", "diplexer_loss",
+    "radiated_power_reduction_coefficient", "bandwidth",
+    "power_to_noise_power_ratio", "receiver_noise_figure",
+    "radio_frequency", "receiving_antenna_height",
+    "transmitting_antenna_height", "distance_between_antennas", "city_type",
+)
+
+# исходные данные, задаваемые парой значений (БС, АС)
+PAIRED_KEYS = ("eqv_isotropically_radiated_pow", "useful_signal_strength")
+
+# записи отчета в порядке расчета: (короткий постоянный идентификатор,
+# этап отчета, запись, исходные данные, записи, от которых зависит,
+# расчет по модели и готовым записям этапа); этапы - cluster (размерность
+# кластера), nsp (пространственные параметры), leb (энергетический бюджет)
+REPORT_ENTRIES = (
+    (
+        "sn_failure_prob", "cluster",
+        "Вероятность невыполнения требований по отношению сигнал/шум",
+        ("cluster_dim", "tetta", "cell_sectors_num", "signal_to_noise_ratio"), (),
+        lambda m, r: m.cluster_calculator.get_signal_to_noise_failure_probability()
+    ),
+    (
+        "interference_deviation", "cluster",
+        "Отклонения велечины уровня суммарной помехи по основному каналу приема",
+        ("cluster_dim", "tetta", "cell_sectors_num"), (),
+        lambda m, r: m.cluster_calculator.get_main_reception_channel_deviation()
+    ),
+    (
+        "interferer_attenuation", "cluster",
+        "Ослабление мешающих сигналов",
+        ("cluster_dim",), (),
+        lambda m, r: m.cluster_calculator.get_attenuation_of_interfering_signals()
+    ),
+    (
+        "relative_interference", "cluster",
+        "Относительный уровень суммарной помехи по основному канала приема",
+        ("cluster_dim", "tetta", "cell_sectors_num"), (),
+        lambda m, r: m.cluster_calculator.get_betta()
+    ),
+    (
+        "min_bandwidth", "nsp",
+        "Минимальная полоса частот необходимая для развертывания сети",
+        ("cell_sectors_num", "cluster_dim", "one_fq_ch_bandwith"), (),
+        lambda m, r: m.nsp.calc_minimum_bandwidth(m.initial_data["one_fq_ch_bandwith"])
+    ),
+    (
+        "fq_chan_total", "nsp",
+        "Общее число частотных каналов, выделяемых для развертывания сети",
+        ("cell_sectors_num", "cluster_dim"), (),
+        lambda m, r: m.nsp.calc_total_num_of_fq_chan()
+    ),
+    (
+        "subscribers_per_cell", "nsp",
+        "Количество абонентов в одной ячейке",
+        ("traffic_transmission_ch_num", "call_blocking_admissible_prob",
+         "busy_hour_activity", "cluster_dim"), (),
+        lambda m, r: m.nsp.calc_num_of_subscibers_per_cell(m.initial_data["busy_hour_activity"])
+    ),
+    (
+        "sector_load", "nsp",
+        "Телефонная нагрузка на один сектор соты",
+        ("traffic_transmission_ch_num", "call_blocking_admissible_prob"), (),
+        lambda m, r: m.nsp.calc_telephone_load_per_sector()
+    ),
+    (
+        "sector_load_erlang_b", "nsp",
+        "Телефонная нагрузка на один сектор соты по формуле Эрланга B",
+        ("traffic_transmission_ch_num", "call_blocking_admissible_prob"), (),
+        lambda m, r: m.nsp.calc_telephone_load_per_sector_erlang_b()
+    ),
+    (
+        "conv_chan_total", "nsp",
+        "Общее число разговорных каналов в одном секторе",
+        ("conversation_ch_num_per_carrier",), (),
+        lambda m, r: m.nsp.calc_total_num_of_conversation_chan(
+            m.initial_data["conversation_ch_num_per_carrier"])
+    ),
+    (
+        "bs_total", "nsp",
+        "Общее число базовых станций",
+        ("subscribers_total",), (),
+        lambda m, r: m.nsp.calc_total_num_of_base_stations()
+    ),
+    (
+        "bs_coverage_radius", "nsp",
+        "Радиус зоны покрытия одной базовой станции",
+        ("subscribers_total", "land_area"), (),
+        lambda m, r: m.nsp.calc_base_station_coverage_radius(m.initial_data["land_area"])
+    ),
+    (
+        "line_loss_margin", "leb",
+        "Запас по потерям в линии",
+        ("building_penetraition_loses", "subscriber_body_loses", "location_coverage"), (),
+        lambda m, r: m.leb.compute_line_loss_margin(
+            m.initial_data["building_penetraition_loses"],
+            m.initial_data["subscriber_body_loses"],
+            m.initial_data["location_coverage"]
+        )
+    ),
+    (
+        "total_losses", "leb",
+        "Суммарные потери радиосигнала при распространении радиоволн от базовой станции к абонентской станции",
+        ("eqv_isotropically_radiated_pow", "useful_signal_strength"),
+        ("Запас по потерям в линии",),
+        lambda m, r: m.leb.compute_total_losses(
+            m.initial_data["eqv_isotropically_radiated_pow"],
+            m.initial_data["useful_signal_strength"],
+            r["Запас по потерям в линии"]
+        )
+    ),
+    (
+        "eirp", "leb",
+        "Эквивалентная изотропно излучаемая мощность ЭИИМ",
+        ("transmitter_output_power", "transmitter_antenna_gain",
+         "transmission_antenna_feeder_loss", "duplex_filter_loss", "diplexer_loss",
+         "radiated_power_reduction_coefficient"), (),
+        lambda m, r: m.leb.compute_EIRP(
+            m.initial_data["transmitter_output_power"],
+            m.initial_data["transmitter_antenna_gain"],
+            m.initial_data["transmission_antenna_feeder_loss"],
+            m.initial_data["duplex_filter_loss"],
+            m.initial_data["diplexer_loss"],
+            m.initial_data["radiated_power_reduction_coefficient"]
+        )
+    ),
+    (
+        "receiver_sensitivity", "leb",
+        "Чувствительность приемника",
+        ("bandwidth", "power_to_noise_power_ratio", "receiver_noise_figure"), (),
+        lambda m, r: m.leb.compute_receiver_sensitivity(
+            m.initial_data["bandwidth"],
+            m.initial_data["power_to_noise_power_ratio"],
+            m.initial_data["receiver_noise_figure"]
+        )
+    ),
+    (
+        "useful_signal_required_power", "leb",
+        "Необходимая мощность полезного сигнала для обеспечения приема в случае 50% местоположений",
+        ("transmitter_antenna_gain", "transmission_antenna_feeder_loss", "diplexer_loss"),
+        ("Чувствительность приемника",),
+        lambda m, r: m.leb.compute_useful_signal_required_power(
+            r["Чувствительность приемника"],
+            m.initial_data["transmitter_antenna_gain"],
+            m.initial_data["transmission_antenna_feeder_loss"],
+            m.initial_data["diplexer_loss"]
+        )
+    ),
+    (
+        "antenna_height_correction", "leb",
+        "Поправочный коэффициент для высоты антенны подвижного объекта, зависящий от типа местности",
+        ("radio_frequency", "receiving_antenna_height", "city_type"), (),
+        lambda m, r: m.leb.compute_antenna_height_correction_factor(
+            m.initial_data["radio_frequency"],
+            m.initial_data["receiving_antenna_height"],
+            m.initial_data["city_type"]
+        )
+    ),
+    (
+        "bs_as_losses", "leb",
+        "Потери сигнала от базовой станции (БС) до абонентской станции (АС)",
+        ("radio_frequency", "transmitting_antenna_height", "distance_between_antennas", "city_type"),
+        ("Поправочный коэффициент для высоты антенны подвижного объекта, зависящий от типа местности",),
+        lambda m, r: m.leb.COST231_Hata(
+            r["Поправочный коэффициент для высоты антенны подвижного объекта, зависящий от типа местности"],
+            m.initial_data["radio_frequency"],
+            m.initial_data["transmitting_antenna_height"],
+            m.initial_data["distance_between_antennas"],
+            m.initial_data["city_type"]
+        )
+    ),
+)
+
+
+# короткие постоянные идентификаторы записей отчета
+REPORT_FIELDS = tuple((field, entry) for field, _, entry, *_ in REPORT_ENTRIES)
+
+
+def rows_to_columns(rows):
+    """
+    Преобразует список словарей исходных данных в столбцы для from_columns
+
+    :param rows: список словарей с ключами initial.json
+    """
+    return {key: [row[key] for row in rows] for key in INITIAL_KEYS}
+
+
+def broadcast_columns(columns):
+    """
+    Приводит столбцы исходных данных к общему числу сценариев N:
+    скаляры размножаются на все сценарии, пары (БС, АС) - до формы (N, 2)
+
+    :param columns: словарь ключ initial.json -> скаляр или массив
+    """
+    arrays = {key: np.asarray(value) for key, value in columns.items()}
+    lengths = {
+        len(value) for key, value in arrays.items()
+        if value.ndim == (2 if key in PAIRED_KEYS else 1)
+    }
+    if len(lengths) > 1:
+        raise ValueError("Столбцы разной длины: {}".format(sorted(lengths)))
+    n = lengths.pop() if lengths else 1
+    return {
+        key: np.broadcast_to(value, (n, 2) if key in PAIRED_KEYS else (n,))
+        for key, value in arrays.items()
+    }
 
 
 class MobileNetworkEngineer:
-    
+
     def __init__(self, initial_data, cluster_calculator: Cluster, nsp: NSP, leb: LEB):
         self.initial_data = initial_data
         self.cluster_calculator = cluster_calculator
         self.nsp = nsp
         self.leb = leb
 
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Пакетный режим для N сценариев, заданных столбцами NumPy.
+        Ключи совпадают с ключами initial.json, report() возвращает
+        словарь с теми же ключами, что и в обычном режиме,
+        значения - массивы длины N (пары значений - формы (N, 2)).
+
+        :param columns: словарь ключ initial.json -> скаляр или массив
+        """
+        i = broadcast_columns(columns)
+        cluster_calculator = ClusterBatch(
+            i["cluster_dim"],
+            i["tetta"],
+            i["cell_sectors_num"],
+            i["signal_to_noise_ratio"]
+        )
+        nsp = NSPBatch(
+            i["cell_sectors_num"],
+            i["sector_radio_chan"],
+            i["cluster_dim"],
+            i["traffic_transmission_ch_num"],
+            i["call_blocking_admissible_prob"],
+            i["subscribers_total"]
+        )
+        return cls(i, cluster_calculator, nsp, LEBBatch())
+
+    def _evaluate(self, stage):
+        result = {}
+        for _, entry_stage, entry, _, _, compute in REPORT_ENTRIES:
+            if entry_stage == stage:
+                result[entry] = compute(self, result)
+        return result
+
     def _determine_cluster_size(self):
-        cc = self.cluster_calculator
-        sn_failure_prob = cc.get_signal_to_noise_failure_probability()
-        main_rec_chan_deviation = cc.get_main_reception_channel_deviation()
-        interfering_signals_attenuation = cc.get_attenuation_of_interfering_signals()
-        main_rec_chan_relative_total_interfer = cc.get_betta()
-        return {
-            "Вероятность невыполнения требований по отношению сигнал/шум": sn_failure_prob,
-            "Отклонения велечины уровня суммарной помехи по основному каналу приема": main_rec_chan_deviation,
-            "Ослабление мешающих сигналов": interfering_signals_attenuation,
-            "Относительный уровень суммарной помехи по основному канала приема": main_rec_chan_relative_total_interfer
-        }
+        return self._evaluate("cluster")
 
     def _calc_nsp_spatial_parameters(self):
-        nsp = self.nsp
-        i = self.initial_data
-        bs_coverage_radius = nsp.calc_base_station_coverage_radius(i["land_area"])
-        min_bandwidth = nsp.calc_minimum_bandwidth(i["one_fq_ch_bandwith"])
-        subscribers_per_cell = nsp.calc_num_of_subscibers_per_cell(i["busy_hour_activity"])
-        sector_telephone_load = nsp.calc_telephone_load_per_sector()
-        fq_chan_total = nsp.calc_total_num_of_fq_chan()
-        bs_total =  nsp.calc_total_num_of_base_stations()
-        conv_chan_total = nsp.calc_total_num_of_conversation_chan(i["conversation_ch_num_per_carrier"])
-        return {
-            "Минимальная полоса частот необходимая для развертывания сети": min_bandwidth,
-            "Общее число частотных каналов, выделяемых для развертывания сети": fq_chan_total,
-            "Количество абонентов в одной ячейке": subscribers_per_cell,
-            "Телефонная нагрузка на один сектор соты": sector_telephone_load,
-            "Общее число разговорных каналов в одном секторе": conv_chan_total,
-            "Общее число базовых станций": bs_total,
-            "Радиус зоны покрытия одной базовой станции": bs_coverage_radius,
-        }
+        return self._evaluate("nsp")
 
     def _conduct_leb_assessment(self):
-        leb = self.leb
-        i = self.initial_data
-        line_loss_margin = leb.compute_line_loss_margin(
-            i["building_penetraition_loses"],
-            i["subscriber_body_loses"],
-            i["location_coverage"]
-        )
-        total_loss = leb.compute_total_losses(
-            i["eqv_isotropically_radiated_pow"],
-            i["useful_signal_strength"],
-            line_loss_margin
-        )
-        eirp = leb.compute_EIRP(
-            i["transmitter_output_power"],
-            i["transmitter_antenna_gain"],
-            i["transmission_antenna_feeder_loss"],
-            i["duplex_filter_loss"],
-            i["diplexer_loss"],
-            i["radiated_power_reduction_coefficient"]
-        )
-        receiver_sensitivity = leb.compute_receiver_sensitivity(
-            i["bandwidth"],
-            i["power_to_noise_power_ratio"],
-            i["receiver_noise_figure"]
-        )
-        useful_sign_req_power = leb.compute_useful_signal_required_power(
-            receiver_sensitivity,
-            i["transmitter_antenna_gain"],
-            i["transmission_antenna_feeder_loss"],
-            i["diplexer_loss"]
-        )
-        antenna_height_correction_factor = leb.compute_antenna_height_correction_factor(
-            i["radio_frequency"],
-            i["receiving_antenna_height"],
-            i["city_type"]
-        )
-        bs_as_losses = leb.COST231_Hata(
-            antenna_height_correction_factor,
-            i["radio_frequency"],
-            i["transmitting_antenna_height"],
-            i["distance_between_antennas"],
-            i["city_type"]
-        )
-        return {
-            "Запас по потерям в линии": line_loss_margin,
-            "Суммарные потери радиосигнала при распространении радиоволн от базовой станции к абонентской станции": total_loss,
-            "Эквивалентная изотропно излучаемая мощность ЭИИМ": eirp,
-            "Чувствительность приемника": receiver_sensitivity,
-            "Необходимая мощность полезного сигнала для обеспечения приема в случае 50% местоположений": useful_sign_req_power,
-            "Поправочный коэффициент для высоты антенны подвижного объекта, зависящий от типа местности": antenna_height_correction_factor,
-            "Потери сигнала от базовой станции (БС) до абонентской станции (АС)": bs_as_losses,
-        }
+        return self._evaluate("leb")
 
     def report(self):
         result = {}
@@ -0,0 +1,133 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+
+class Profiler:
+    """
+    Замеры времени, числа вызовов и выделенной памяти по этапам расчета
+    и методам калькуляторов. Пока профилировщик выключен, методы классов
+    не изменены и накладных расходов нет; enable() подменяет методы
+    классов из targets обертками, disable() возвращает исходные методы.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.trace = False
+        # имя -> [число вызовов, суммарное время, нс, выделенная память, байт]
+        self.stats = {}
+        # события в формате Chrome trace (chrome://tracing, Perfetto)
+        self.events = []
+        self._originals = []
+
+    def enable(self, memory=False, trace=False, targets=None):
+        """
+        :param memory: учитывать выделенную память (через tracemalloc)
+        :param trace: записывать события для save_trace
+        :param targets: список пар (класс или модуль, имена методов или функций
+            либо None - все открытые методы), по умолчанию - default_targets()
+        """
+        if self.enabled:
+            self.disable()
+        self.memory = memory
+        self.trace = trace
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        for cls, names in targets or default_targets():
+            if names is None:
+                names = [
+                    name for name, value in vars(cls).items()
+                    if not name.startswith("_") and inspect.isfunction(value)
+                ]
+            for name in names:
+                original = vars(cls)[name]
+                self._originals.append((cls, name, original))
+                setattr(cls, name, self._wrap("{}.{}".format(cls.__name__, name), original))
+        self.enabled = True
+
+    def disable(self):
+        for cls, name, original in reversed(self._originals):
+            setattr(cls, name, original)
+        self._originals.clear()
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.enabled = False
+
+    def reset(self):
+        self.stats.clear()
+        self.events.clear()
+
+    def _wrap(self, name, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            memory_before = tracemalloc.get_traced_memory()[0] if self.memory else 0
+            start = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - start
+                stat = self.stats.setdefault(name, [0, 0, 0])
+                stat[0] += 1
+                stat[1] += elapsed
+                if self.memory:
+                    stat[2] += max(0, tracemalloc.get_traced_memory()[0] - memory_before)
+                if self.trace:
+                    self.events.append({
+                        "name": name, "ph": "X", "ts": start / 1000, "dur": elapsed / 1000,
+                        "pid": os.getpid(), "tid": threading.get_ident(),
+                    })
+        return wrapper
+
+    def summary(self):
+        """
+        Таблица замеров, упорядоченная по суммарному времени.
+        Время этапа включает время вложенных вызовов.
+        """
+        lines = ["{:<60} {:>10} {:>12} {:>12} {:>12}".format(
+            "Этап", "Вызовы", "Всего, мс", "Среднее, мкс", "Память, КиБ")]
+        for name, (calls, total, allocated) in sorted(
+                self.stats.items(), key=lambda item: -item[1][1]):
+            lines.append("{:<60} {:>10} {:>12.3f} {:>12.3f} {:>12.1f}".format(
+                name, calls, total / 1e6, total / calls / 1e3, allocated / 1024))
+        return "\n".join(lines)
+
+    def save_trace(self, path):
+        """
+        Запись событий в файл формата Chrome trace
+
+        :param path: путь к файлу JSON
+        """
+        with open(path, "w", encoding="utf8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+
+
+def default_targets():
+    """
+    Этапы отчета, потоковый расчет, запись результатов
+    и открытые методы калькуляторов
+    """
+    from app import App, stream
+    from app.model import MobileNetworkEngineer
+    from ftnp.cluster import Cluster, ClusterBatch
+    from ftnp.leb import LEB, LEBBatch
+    from ftnp.nsp import NSP, NSPBatch
+
+    return [
+        (App, ["run", "save"]),
+        (MobileNetworkEngineer, [
+            "report", "_determine_cluster_size",
+            "_calc_nsp_spatial_parameters", "_conduct_leb_assessment",
+        ]),
+        (stream, ["parse_scenario", "evaluate_batch"]),
+        (Cluster, None), (ClusterBatch, None),
+        (NSP, None), (NSPBatch, None),
+        (LEB, None), (LEBBatch, None),
+    ]
+
+
+profiler = Profiler()
@@ -0,0 +1,87 @@
+import numpy as np
+
+from app.model import INITIAL_KEYS, PAIRED_KEYS, MobileNetworkEngineer, broadcast_columns
+
+# исходные данные с дискретными значениями, по которым производные не считаются
+DISCRETE_KEYS = (
+    "cluster_dim", "cell_sectors_num", "sector_radio_chan",
+    "traffic_transmission_ch_num", "conversation_ch_num_per_carrier", "city_type",
+)
+
+# непрерывные исходные данные: (ключ, номер элемента пары или None)
+CONTINUOUS_INPUTS = tuple(
+    (key, component)
+    for key in INITIAL_KEYS if key not in DISCRETE_KEYS
+    for component in ((0, 1) if key in PAIRED_KEYS else (None,))
+)
+
+
+def input_name(key, component):
+    return key if component is None else "{}[{}]".format(key, component)
+
+
+def _flatten(report):
+    # записи отчета -> список (имя, массив (N,)), пары раскладываются по элементам
+    result = []
+    for name, value in report.items():
+        value = np.asarray(value, dtype=float)
+        if value.ndim == 2:
+            result += [("{}[{}]".format(name, k), value[:, k]) for k in range(value.shape[1])]
+        else:
+            result.append((name, value))
+    return result
+
+
+def sensitivity(columns, inputs=None, step=1e-6):
+    """
+    Матрица частных производных записей отчета по непрерывным исходным
+    данным и эластичности (d ln y / d ln x) для N сценариев.
+    Производные считаются центральными разностями: для каждого
+    исходного параметра один пакетный расчет from_columns на 2N
+    сценариях (x + h и x - h), h = step * max(|x|, 1).
+    Возвращает словарь: "inputs" и "outputs" - имена, "report" -
+    отчет в исходной точке, "jacobian" и "elasticity" - массивы float32
+    формы (N, число записей, число исходных данных). Эластичность
+    при нулевом значении записи - nan.
+
+    :param columns: словарь ключ initial.json -> скаляр или массив
+    :param inputs: список (ключ, номер элемента пары или None),
+        по умолчанию CONTINUOUS_INPUTS
+    :param step: относительный шаг приращения
+    """
+    inputs = CONTINUOUS_INPUTS if inputs is None else tuple(inputs)
+    base = {key: np.asarray(value) for key, value in broadcast_columns(columns).items()}
+    report = MobileNetworkEngineer.from_columns(base).report()
+    outputs = _flatten(report)
+    n = len(outputs[0][1])
+    y = np.stack([value for _, value in outputs], axis=1)
+
+    jacobian = np.empty((n, len(outputs), len(inputs)), dtype=np.float32)
+    elasticity = np.empty_like(jacobian)
+    doubled = {key: np.concatenate((value, value)) for key, value in base.items()}
+    for k, (key, component) in enumerate(inputs):
+        x = np.asarray(base[key], dtype=float)
+        if component is not None:
+            x = x[:, component]
+        h = step * np.maximum(np.abs(x), 1)
+        shifted = dict(doubled)
+        column = np.array(doubled[key], dtype=float)
+        if component is None:
+            column += np.concatenate((h, -h))
+        else:
+            column[:, component] += np.concatenate((h, -h))
+        shifted[key] = column
+        values = _flatten(MobileNetworkEngineer.from_columns(shifted).report())
+        forward = np.stack([value[:n] for _, value in values], axis=1)
+        backward = np.stack([value[n:] for _, value in values], axis=1)
+        derivative = (forward - backward) / (2 * h[:, None])
+        jacobian[:, :, k] = derivative
+        with np.errstate(divide="ignore", invalid="ignore"):
+            elasticity[:, :, k] = np.where(y != 0, derivative * x[:, None] / y, np.nan)
+    return {
+        "inputs": [input_name(key, component) for key, component in inputs],
+        "outputs": [name for name, _ in outputs],
+        "report": report,
+        "jacobian": jacobian,
+        "elasticity": elasticity,
+    }
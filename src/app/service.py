@@ -0,0 +1,271 @@
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from app.stream import evaluate_batch, format_error, json_default, parse_scenario
+from ftnp.cluster import Cluster
+from ftnp.leb import CityType
+from ftnp.montecarlo import MonteCarloOutage
+
+# ключи исходных данных Cluster для /outage
+OUTAGE_KEYS = ("cluster_dim", "tetta", "cell_sectors_num", "signal_to_noise_ratio")
+
+CITY_TYPES = tuple(t.name for t in CityType)
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class ReportService:
+    """
+    Сервер расчета отчетов на asyncio (HTTP/1.1 по TCP или Unix-сокету).
+    POST /report с объектом JSON исходных данных возвращает отчет;
+    одновременные запросы собираются в пакеты не больше max_batch,
+    ожидая не дольше max_delay, и считаются пакетно (evaluate_batch)
+    в отдельном потоке. POST /outage считает вероятность невыполнения
+    требований интегрированием (method="quad") или методом Монте-Карло
+    (method="montecarlo", samples) в пуле процессов. GET /metrics -
+    число запросов и пакетов, пропускная способность и задержки.
+    """
+
+    def __init__(self, max_batch=1024, max_delay=0.002, workers=None, latency_window=10000):
+        """
+        :param max_batch: наибольшее число сценариев в пакете
+        :param max_delay: наибольшее ожидание пополнения пакета, с
+        :param workers: число процессов для тяжелых расчетов, по умолчанию - по числу ядер
+        :param latency_window: число последних запросов для оценки задержек
+        """
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.workers = workers or os.cpu_count() or 1
+        self.queue = None
+        self.batch_executor = None
+        self.pool = None
+        # задачи пула процессов, отменяемые при остановке сервера
+        self.pending = set()
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched = 0
+        self.latencies = deque(maxlen=latency_window)
+
+    async def serve(self, host="127.0.0.1", port=8080, path=None):
+        """
+        Запуск сервера до отмены задачи
+
+        :param host: адрес TCP
+        :param port: порт TCP
+        :param path: путь Unix-сокета, если задан - вместо TCP
+        """
+        self.queue = asyncio.Queue()
+        self.batch_executor = ThreadPoolExecutor(1)
+        # процессы, порожденные fork, унаследовали бы открытые сокеты
+        # соединений, и клиент не получал бы конца ответа
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self.started = time.monotonic()
+        batcher = asyncio.ensure_future(self._batcher())
+        if path is not None:
+            server = await asyncio.start_unix_server(self._handle, path)
+        else:
+            server = await asyncio.start_server(self._handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self.batch_executor.shutdown()
+            # cancel_futures появился только в Python 3.9
+            for future in self.pending:
+                future.cancel()
+            self.pool.shutdown(wait=True)
+
+    async def report(self, scenario):
+        """
+        Отчет для одного сценария через очередь пакетного расчета
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((scenario, future))
+        return await future
+
+    async def outage(self, params):
+        """
+        Вероятность невыполнения требований для /outage в пуле процессов
+        """
+        future = self.pool.submit(_outage_task, params)
+        self.pending.add(future)
+        future.add_done_callback(self.pending.discard)
+        return await asyncio.wrap_future(future)
+
+    async def _batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.batches += 1
+            self.batched += len(batch)
+            scenarios = [scenario for scenario, _ in batch]
+            try:
+                reports = await loop.run_in_executor(self.batch_executor, evaluate_batch, scenarios)
+            except Exception:
+                # ошибка одного сценария не должна касаться остальных
+                reports = []
+                for scenario in scenarios:
+                    try:
+                        reports.append((await loop.run_in_executor(
+                            self.batch_executor, evaluate_batch, [scenario]))[0])
+                    except Exception as e:
+                        reports.append((False, e))
+            for (_, future), (ok, report) in zip(batch, reports):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(report)
+                else:
+                    future.set_exception(report)
+
+    def metrics(self):
+        """
+        Число запросов, ошибок и пакетов, средний размер пакета,
+        пропускная способность (запросов в секунду с запуска)
+        и квантили задержки по последним запросам, мс
+        """
+        uptime = time.monotonic() - self.started
+        result = {
+            "uptime": uptime,
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_size": self.batched / self.batches if self.batches else 0.0,
+            "throughput": self.requests / uptime if uptime > 0 else 0.0,
+            "in_flight": self.queue.qsize() if self.queue is not None else 0,
+        }
+        if self.latencies:
+            p50, p95, p99 = np.percentile(np.fromiter(self.latencies, float), (50, 95, 99)) * 1000
+            result.update(latency_p50=p50, latency_p95=p95, latency_p99=p99)
+        return result
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ValueError as e:
+                    self.requests += 1
+                    self.errors += 1
+                    _write_response(writer, 400, {"error": "Некорректный запрос: {}".format(e)}, False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, body, keep_alive = request
+                start = time.monotonic()
+                status, payload = await self._dispatch(method, target, body)
+                if target != "/metrics":
+                    self.requests += 1
+                    self.errors += status != 200
+                    self.latencies.append(time.monotonic() - start)
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, target, body):
+        routes = {"/report": ("POST", self._report), "/outage": ("POST", self._outage),
+                  "/metrics": ("GET", self._metrics)}
+        if target not in routes:
+            return 404, {"error": "Неизвестный адрес {}".format(target)}
+        expected, handler = routes[target]
+        if method != expected:
+            return 405, {"error": "Ожидается метод {}".format(expected)}
+        try:
+            return 200, await handler(body)
+        except ValueError as e:
+            return 400, {"error": format_error(e)}
+        except Exception as e:
+            return 500, {"error": format_error(e)}
+
+    async def _report(self, body):
+        scenario = parse_scenario(body)
+        if scenario["city_type"] not in CITY_TYPES:
+            raise ValueError("Неизвестный тип города {}".format(scenario["city_type"]))
+        return await self.report(scenario)
+
+    async def _outage(self, body):
+        params = json.loads(body)
+        missing = [key for key in OUTAGE_KEYS if key not in params]
+        if missing:
+            raise ValueError("Отсутствуют исходные данные: {}".format(", ".join(missing)))
+        if params.get("method", "quad") not in ("quad", "montecarlo"):
+            raise ValueError("Метод должен быть quad или montecarlo")
+        return await self.outage(params)
+
+    async def _metrics(self, body):
+        return self.metrics()
+
+
+def _outage_task(params):
+    cluster = Cluster(*(params[key] for key in OUTAGE_KEYS))
+    if params.get("method", "quad") == "quad":
+        return {"outage": cluster.get_signal_to_noise_failure_probability(method="quad")}
+    estimate = MonteCarloOutage(cluster, seed=params.get("seed")).estimate(
+        samples=int(params.get("samples", 10 ** 7)),
+        precision=params.get("precision"),
+        relative_precision=params.get("relative_precision"),
+        workers=1,
+    )
+    return {key: float(value) for key, value in estimate.items()}
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise ValueError("строка запроса {!r}".format(line.decode("latin-1").strip()))
+    method, target, version = parts
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise ValueError("Content-Length {!r}".format(headers["content-length"])) from None
+    if length < 0:
+        raise ValueError("Content-Length {}".format(length))
+    body = (await reader.readexactly(length)).decode("utf8") if length else ""
+    connection = headers.get("connection", "").lower()
+    keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+    return method, target.split("?")[0], body, keep_alive
+
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False, default=json_default).encode("utf8")
+    writer.write(
+        "HTTP/1.1 {} {}\r\nContent-Type: application/json; charset=utf-8\r\n"
+        "Content-Length: {}\r\nConnection: {}\r\n\r\n".format(
+            status, REASONS[status], len(body), "keep-alive" if keep_alive else "close"
+        ).encode("latin-1") + body
+    )
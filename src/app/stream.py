@@ -0,0 +1,176 @@
+import itertools
+import json
+
+import numpy as np
+
+from app.model import INITIAL_KEYS, MobileNetworkEngineer, rows_to_columns
+
+
+def parse_scenario(line):
+    """
+    Разбор одной строки JSONL со сценарием, при ошибке - ValueError
+
+    :param line: строка с объектом JSON исходных данных
+    """
+    scenario = json.loads(line)
+    if not isinstance(scenario, dict):
+        raise ValueError("Сценарий должен быть объектом JSON")
+    missing = [key for key in INITIAL_KEYS if key not in scenario]
+    if missing:
+        raise ValueError("Отсутствуют исходные данные: {}".format(", ".join(missing)))
+    return scenario
+
+
+def format_error(error):
+    """
+    Описание ошибки для записей с ошибками: "<Тип>: <сообщение>"
+
+    :param error: исключение
+    """
+    return "{}: {}".format(type(error).__name__, error)
+
+
+def json_default(value):
+    """
+    Преобразование массивов и скаляров NumPy для json.dumps(default=...)
+
+    :param value: значение, которое json не умеет записывать
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError("Object of type {} is not JSON serializable".format(type(value).__name__))
+
+
+def evaluate_batch(scenarios):
+    """
+    Пакетный расчет отчетов для списка сценариев, возвращает список пар
+    (True, отчет) или (False, исключение) в том же порядке. Для
+    сценариев вне области определения формул (бесконечные или
+    неопределенные записи отчета) исключение - ValueError с перечнем
+    таких записей.
+
+    :param scenarios: список словарей исходных данных
+    """
+    with np.errstate(all="ignore"):
+        report = MobileNetworkEngineer.from_columns(rows_to_columns(scenarios)).report()
+    finite = {}
+    for key, value in report.items():
+        value = np.isfinite(np.asarray(value, dtype=float))
+        finite[key] = value.reshape(len(value), -1).all(axis=1)
+    columns = {key: value.tolist() for key, value in report.items()}
+    result = []
+    for row in range(len(scenarios)):
+        invalid = [key for key, value in finite.items() if not value[row]]
+        if invalid:
+            result.append((False, ValueError("Значения вне области определения: {}".format(", ".join(invalid)))))
+        else:
+            result.append((True, {key: value[row] for key, value in columns.items()}))
+    return result
+
+
+def iter_records(lines, batch_size=1024, cache=None):
+    """
+    Потоковый расчет: читает сценарии построчно, считает их порциями
+    по batch_size и выдает по одной записи на каждую непустую строку в
+    порядке ввода: {"line": номер, "report": отчет} или
+    {"line": номер, "error": описание}. Если порция не считается целиком,
+    ее сценарии пересчитываются по одному, чтобы ошибка касалась только
+    своей строки.
+
+    :param lines: итерируемый источник строк JSONL
+    :param batch_size: число сценариев в порции
+    :param cache: ReportCache, из которого берутся ранее посчитанные отчеты
+    """
+    numbered = ((number, line) for number, line in enumerate(lines, start=1) if line.strip())
+    while True:
+        chunk = list(itertools.islice(numbered, batch_size))
+        if not chunk:
+            return
+        records = {}
+        parsed = {}
+        for number, line in chunk:
+            try:
+                parsed[number] = parse_scenario(line)
+            except ValueError as e:
+                records[number] = {"line": number, "error": format_error(e)}
+        cached = cache.get_many(list(parsed.values()), "batch") if cache is not None else [None] * len(parsed)
+        scenarios = {}
+        for (number, scenario), report in zip(parsed.items(), cached):
+            if report is None:
+                scenarios[number] = scenario
+            else:
+                records[number] = {"line": number, "report": report}
+        try:
+            reports = evaluate_batch(list(scenarios.values()))
+        except Exception:
+            reports = None
+        computed = []
+        for k, (number, scenario) in enumerate(scenarios.items()):
+            try:
+                ok, report = reports[k] if reports is not None else evaluate_batch([scenario])[0]
+            except Exception as e:
+                ok, report = False, e
+            if not ok:
+                records[number] = {"line": number, "error": format_error(report)}
+                continue
+            records[number] = {"line": number, "report": report}
+            computed.append((scenario, report))
+        if cache is not None:
+            cache.put_many(computed, "batch")
+        for number, _ in chunk:
+            yield records[number]
+
+
+def run_stream(source, sink, batch_size=1024, cache=None):
+    """
+    Пишет в sink по одной строке JSON на каждую запись iter_records,
+    сбрасывая буфер после каждой порции
+
+    :param source: итерируемый источник строк JSONL (файл или stdin)
+    :param sink: текстовый поток вывода (файл или stdout)
+    :param batch_size: число сценариев в порции
+    :param cache: ReportCache, из которого берутся ранее посчитанные отчеты
+    """
+    for k, record in enumerate(iter_records(source, batch_size, cache), start=1):
+        sink.write(json.dumps(record, ensure_ascii=False, allow_nan=False))
+        sink.write("\n")
+        if k % batch_size == 0:
+            sink.flush()
+    sink.flush()
+
+
+def run_stream_columnar(source, directory, errors, batch_size=1024, cache=None):
+    """
+    Потоковый расчет с записью отчетов по столбцам (app.columnar):
+    каждая порция дописывается в каталог directory вместе со столбцом
+    номеров строк "line", записи с ошибками пишутся в errors как JSONL
+
+    :param source: итерируемый источник строк JSONL (файл или stdin)
+    :param directory: каталог результатов ColumnarWriter
+    :param errors: текстовый поток для записей с ошибками
+    :param batch_size: число сценариев в порции
+    :param cache: ReportCache, из которого берутся ранее посчитанные отчеты
+    """
+    from app.columnar import ColumnarWriter
+
+    writer = ColumnarWriter(directory)
+    records = iter_records(source, batch_size, cache)
+    while True:
+        chunk = list(itertools.islice(records, batch_size))
+        if not chunk:
+            return
+        rows = [record for record in chunk if "report" in record]
+        for record in chunk:
+            if "error" in record:
+                errors.write(json.dumps(record, ensure_ascii=False, allow_nan=False))
+                errors.write("\n")
+        errors.flush()
+        if rows:
+            columns = {"line": [record["line"] for record in rows]}
+            columns.update({
+                key: [record["report"][key] for record in rows]
+                for key in rows[0]["report"]
+            })
+            writer.append(columns)
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from app.model import MobileNetworkEngineer
+from app.stream import format_error
+
+
+def expand_values(definition):
+    """
+    Значения одного перебираемого параметра: список значений
+    или диапазон {"start": ..., "stop": ..., "step": ...} (stop включительно)
+
+    :param definition: список или словарь диапазона
+    """
+    if isinstance(definition, dict):
+        start, stop, step = definition["start"], definition["stop"], definition["step"]
+        return np.arange(start, stop + step / 2, step)
+    return np.asarray(definition)
+
+
+class Sweep:
+    """
+    Перебор декартова произведения значений параметров initial.json.
+    Пространство сценариев нумеруется в смешанной системе счисления и
+    делится на шарды по shard_size сценариев, каждый шард считается
+    пакетно через MobileNetworkEngineer.from_columns.
+    """
+
+    def __init__(self, base, parameters, shard_size=100000):
+        """
+        :param base: исходные данные, общие для всех сценариев
+        :param parameters: словарь ключ initial.json -> определение значений (см. expand_values)
+        :param shard_size: число сценариев в шарде
+        """
+        self.base = base
+        self.parameters = parameters
+        self.keys = list(parameters)
+        self.values = [expand_values(parameters[key]) for key in self.keys]
+        self.shape = tuple(len(v) for v in self.values)
+        self.size = int(np.prod(self.shape, dtype=np.int64))
+        self.shard_size = shard_size
+        self.shard_count = -(-self.size // shard_size)
+        # ошибки последнего run: номер шарда -> описание
+        self.failures = {}
+
+    @classmethod
+    def from_file(cls, path, shard_size=100000):
+        """
+        Загрузка описания перебора из файла JSON вида
+        {"base": {...} или путь к initial.json, "parameters": {...}}
+
+        :param path: путь к файлу описания
+        :param shard_size: число сценариев в шарде
+        """
+        with open(path, encoding="utf8") as f:
+            spec = json.load(f)
+        base = spec["base"]
+        if isinstance(base, str):
+            with open(os.path.join(os.path.dirname(path), base), encoding="utf8") as f:
+                base = json.load(f)
+        return cls(base, spec["parameters"], shard_size)
+
+    def signature(self):
+        """
+        Хэш описания перебора, по которому проверяется продолжение с контрольной точки
+        """
+        spec = json.dumps(
+            [self.base, self.parameters, self.shard_size], sort_keys=True, default=str)
+        return hashlib.sha256(spec.encode("utf8")).hexdigest()
+
+    def shard_range(self, shard):
+        start = shard * self.shard_size
+        return start, min(start + self.shard_size, self.size)
+
+    def columns(self, start, stop):
+        """
+        Столбцы исходных данных для сценариев с номерами [start, stop)
+        """
+        positions = np.unravel_index(np.arange(start, stop), self.shape)
+        columns = dict(self.base)
+        for key, values, position in zip(self.keys, self.values, positions):
+            columns[key] = values[position]
+        return columns
+
+    def run_shard(self, shard):
+        """
+        Расчет одного шарда, возвращает столбцы номеров сценариев,
+        перебираемых параметров и отчета
+        """
+        start, stop = self.shard_range(shard)
+        columns = self.columns(start, stop)
+        result = {"index": np.arange(start, stop)}
+        result.update({key: columns[key] for key in self.keys})
+        result.update(MobileNetworkEngineer.from_columns(columns).report())
+        return result
+
+    def machine_shards(self, machine=0, machines=1):
+        """
+        Шарды, которые считает машина machine из machines
+        (распределение по остатку от деления номера шарда)
+        """
+        return range(machine, self.shard_count, machines)
+
+    def run(self, directory, workers=None, machine=0, machines=1, checkpoint_interval=30.0,
+            output_format="npz"):
+        """
+        Расчет шардов машины machine из machines в пуле из workers процессов
+        (по умолчанию - по числу ядер). Каждый шард записывается в
+        <directory>/shard-<номер>.npz (при output_format="columnar" - в
+        каталог <directory>/shard-<номер>, см. app.columnar), список готовых шардов периодически
+        сохраняется в контрольную точку, при повторном запуске готовые
+        шарды пропускаются. Ошибка в шарде не останавливает остальные,
+        описания ошибок сохраняются в failures (номер шарда -> описание);
+        при прерывании (KeyboardInterrupt) новые шарды не запускаются.
+        Возвращает число шардов, посчитанных в этом запуске.
+
+        :param directory: каталог результатов
+        :param workers: число процессов
+        :param machine: номер машины
+        :param machines: число машин, делящих перебор
+        :param checkpoint_interval: период записи контрольной точки, с
+        :param output_format: "npz" или "columnar"
+        """
+        os.makedirs(directory, exist_ok=True)
+        checkpoint = Checkpoint(
+            os.path.join(directory, "checkpoint-{}-of-{}.json".format(machine, machines)),
+            self.signature()
+        )
+        todo = [
+            shard for shard in self.machine_shards(machine, machines)
+            if shard not in checkpoint.done
+            and not os.path.exists(shard_path(directory, shard, output_format))
+        ]
+        workers = workers or os.cpu_count() or 1
+        self.failures = {}
+        completed_count = 0
+        last_save = time.monotonic()
+        with ProcessPoolExecutor(workers) as pool:
+            shards = iter(todo)
+            # задача -> номер шарда
+            pending = {}
+            try:
+                while True:
+                    for shard in shards:
+                        pending[pool.submit(_run_shard_task, self, shard, directory, output_format)] = shard
+                        if len(pending) >= 2 * workers:
+                            break
+                    if not pending:
+                        break
+                    completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        shard = pending.pop(future)
+                        try:
+                            checkpoint.done.add(future.result())
+                        except Exception as e:
+                            self.failures[shard] = format_error(e)
+                        else:
+                            completed_count += 1
+                    if time.monotonic() - last_save >= checkpoint_interval:
+                        checkpoint.save()
+                        last_save = time.monotonic()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                for future in pending:
+                    future.cancel()
+                checkpoint.save()
+        return completed_count
+
+
+class Checkpoint:
+    """
+    Контрольная точка перебора: множество готовых шардов
+    и хэш описания перебора
+    """
+
+    def __init__(self, path, signature):
+        self.path = path
+        self.signature = signature
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf8") as f:
+                state = json.load(f)
+            if state["signature"] != signature:
+                raise ValueError("Контрольная точка {} относится к другому перебору".format(path))
+            self.done = set(state["done"])
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf8") as f:
+            json.dump({"signature": self.signature, "done": sorted(self.done)}, f)
+        os.replace(tmp, self.path)
+
+
+def shard_path(directory, shard, output_format="npz"):
+    name = "shard-{:06d}".format(shard)
+    return os.path.join(directory, name + ".npz" if output_format == "npz" else name)
+
+
+def _run_shard_task(sweep, shard, directory, output_format="npz"):
+    result = sweep.run_shard(shard)
+    path = shard_path(directory, shard, output_format)
+    if output_format == "npz":
+        with open(path + ".tmp", "wb") as f:
+            np.savez(f, **result)
+    else:
+        from app.columnar import ColumnarWriter
+
+        shutil.rmtree(path + ".tmp", ignore_errors=True)
+        ColumnarWriter(path + ".tmp").append(result)
+    os.replace(path + ".tmp", path)
+    return shard
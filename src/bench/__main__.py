@@ -0,0 +1,35 @@
+import argparse
+import sys
+
+from bench.cases import cases
+from bench.runner import compare, load, run_cases, save
+
+
+def main(argv=None):
+    """
+    Измерение производительности расчетов Cluster, NSP, LEB и
+    MobileNetworkEngineer.report. Запуск из каталога src: python -m bench.
+    При заданном --baseline завершается с кодом 1, если какой-либо
+    расчет замедлился больше чем на --threshold.
+    """
+    parser = argparse.ArgumentParser(prog="python -m bench", description=main.__doc__)
+    parser.add_argument("--output", default="bench.json", help="файл результатов JSON")
+    parser.add_argument("--baseline", help="файл опорных результатов JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимое снижение оп/с, доля")
+    parser.add_argument("--batch-size", type=int, default=100000, help="число сценариев в пакете")
+    parser.add_argument("--min-time", type=float, default=0.2, help="длительность измерения расчета, с")
+    parser.add_argument("--filter", help="подстрока имени расчета")
+    args = parser.parse_args(argv)
+
+    results = run_cases(cases(args.batch_size), args.filter, args.min_time, log=print)
+    save(results, args.output)
+    if args.baseline is None:
+        return 0
+    regressions = compare(results, load(args.baseline), args.threshold)
+    for name, reference, current in regressions:
+        print("Регрессия {}: {:.0f} -> {:.0f} оп/с".format(name, reference, current))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
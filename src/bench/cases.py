@@ -0,0 +1,213 @@
+import copy
+
+import numpy as np
+
+from app.model import MobileNetworkEngineer, broadcast_columns
+from ftnp.cluster import Cluster, ClusterBatch
+from ftnp.leb import LEB, LEBBatch, CityType
+from ftnp.nsp import NSP, NSPBatch
+from ftnp.propagation import MODELS, path_loss
+
+# сценарий, на котором измеряются все расчеты
+INITIAL = {
+    "cluster_dim": 7, "tetta": 6, "cell_sectors_num": 3, "signal_to_noise_ratio": 9,
+    "sector_radio_chan": 2, "traffic_transmission_ch_num": 20,
+    "call_blocking_admissible_prob": 0.02, "subscribers_total": 500000,
+    "land_area": 400, "one_fq_ch_bandwith": 0.2, "busy_hour_activity": 0.025,
+    "conversation_ch_num_per_carrier": 8, "building_penetraition_loses": 10,
+    "subscriber_body_loses": 3, "location_coverage": 8,
+    "eqv_isotropically_radiated_pow": [55, 23], "useful_signal_strength": [-110, -105],
+    "transmitter_output_power": 43, "transmitter_antenna_gain": 17,
+    "transmission_antenna_feeder_loss": -3, "duplex_filter_loss": -1, "diplexer_loss": -0.5,
+    "radiated_power_reduction_coefficient": 0, "bandwidth": 200000,
+    "power_to_noise_power_ratio": 9, "receiver_noise_figure": 5,
+    "radio_frequency": 1800, "receiving_antenna_height": 1.5,
+    "transmitting_antenna_height": 30, "distance_between_antennas": 2, "city_type": "LARGE",
+}
+
+SECTORS = (1, 3, 6)
+CITY_TYPES = tuple(t.name for t in CityType)
+
+CLUSTER_METHODS = (
+    "get_attenuation_of_interfering_signals",
+    "derive_betta_i",
+    "get_main_reception_channel_deviation",
+    "get_betta",
+    "derive_x1",
+    "get_signal_to_noise_failure_probability",
+)
+
+
+def _nsp_args(i):
+    return {
+        "calc_total_num_of_fq_chan": (),
+        "calc_minimum_bandwidth": (i["one_fq_ch_bandwith"],),
+        "calc_total_num_of_conversation_chan": (i["conversation_ch_num_per_carrier"],),
+        "calc_telephone_load_per_sector": (),
+        "calc_telephone_load_per_sector_erlang_b": (),
+        "calc_num_of_subscibers_per_cell": (i["busy_hour_activity"],),
+        "calc_total_num_of_base_stations": (),
+        "calc_base_station_coverage_radius": (i["land_area"],),
+    }
+
+
+def _leb_args(i, leb):
+    margin = leb.compute_line_loss_margin(
+        i["building_penetraition_loses"], i["subscriber_body_loses"], i["location_coverage"])
+    correction = leb.compute_antenna_height_correction_factor(
+        i["radio_frequency"], i["receiving_antenna_height"], i["city_type"])
+    return {
+        "compute_line_loss_margin": (
+            i["building_penetraition_loses"], i["subscriber_body_loses"], i["location_coverage"]),
+        "compute_total_losses": (
+            i["eqv_isotropically_radiated_pow"], i["useful_signal_strength"], margin),
+        "compute_EIRP": (
+            i["transmitter_output_power"], i["transmitter_antenna_gain"],
+            i["transmission_antenna_feeder_loss"], i["duplex_filter_loss"],
+            i["diplexer_loss"], i["radiated_power_reduction_coefficient"]),
+        "compute_receiver_sensitivity": (
+            i["bandwidth"], i["power_to_noise_power_ratio"], i["receiver_noise_figure"]),
+        "compute_useful_signal_required_power": (
+            -107, i["transmitter_antenna_gain"], i["transmission_antenna_feeder_loss"],
+            i["diplexer_loss"]),
+        "compute_antenna_height_correction_factor": (
+            i["radio_frequency"], i["receiving_antenna_height"], i["city_type"]),
+        "COST231_Hata": (
+            correction, i["radio_frequency"], i["transmitting_antenna_height"],
+            i["distance_between_antennas"], i["city_type"]),
+    }
+
+
+def scenario(**changes):
+    i = copy.deepcopy(INITIAL)
+    i.update(changes)
+    return i
+
+
+def columns(n, **changes):
+    return broadcast_columns({
+        key: np.repeat(np.asarray(value)[None], n, axis=0)
+        for key, value in scenario(**changes).items()
+    })
+
+
+def _cluster(i, batch):
+    cls = ClusterBatch if batch else Cluster
+    return cls(i["cluster_dim"], i["tetta"], i["cell_sectors_num"], i["signal_to_noise_ratio"])
+
+
+def _nsp(i, batch):
+    cls = NSPBatch if batch else NSP
+    return cls(
+        i["cell_sectors_num"], i["sector_radio_chan"], i["cluster_dim"],
+        i["traffic_transmission_ch_num"], i["call_blocking_admissible_prob"],
+        i["subscribers_total"])
+
+
+def _engineer(i, batch):
+    if batch:
+        return MobileNetworkEngineer.from_columns(i)
+    return MobileNetworkEngineer(i, _cluster(i, False), _nsp(i, False), LEB())
+
+
+def _cluster_case(i, method, batch):
+    cluster = _cluster(i, batch)
+    bound = getattr(cluster, method)
+
+    def run():
+        # присваивание параметра сбрасывает кэш промежуточных величин
+        cluster.tetta = cluster.tetta
+        return bound()
+    return run
+
+
+def _report_case(i, batch):
+    def run():
+        return _engineer(i, batch).report()
+    return run
+
+
+def cases(batch_size):
+    """
+    Набор измерений: имя -> (число сценариев за вызов, фабрика функции).
+    Каждый расчет измеряется для одного сценария и для пакета из
+    batch_size сценариев, по всем числам секторов и типам городов.
+    """
+    result = {}
+    modes = (("scalar", 1, scenario), ("batch", batch_size, lambda **c: columns(batch_size, **c)))
+    for mode, n, make in modes:
+        batch = mode == "batch"
+        for m in SECTORS:
+            i = make(cell_sectors_num=m)
+            for method in CLUSTER_METHODS:
+                result["Cluster.{}[{},M={}]".format(method, mode, m)] = (
+                    n, lambda i=i, method=method, batch=batch: _cluster_case(i, method, batch))
+            if not batch:
+                result["Cluster.get_signal_to_noise_failure_probability_quad[scalar,M={}]".format(m)] = (
+                    n, lambda i=i: _quad_case(i))
+        i = make()
+        nsp_args = _nsp_args(i)
+        for method, args in nsp_args.items():
+            result["NSP.{}[{}]".format(method, mode)] = (
+                n, lambda i=i, method=method, args=args, batch=batch:
+                    _method_case(_nsp(i, batch), method, args))
+        for city in CITY_TYPES:
+            i = make(city_type=city)
+            leb = LEBBatch() if batch else LEB()
+            for method, args in _leb_args(i, leb).items():
+                result["LEB.{}[{},{}]".format(method, mode, city)] = (
+                    n, lambda leb=leb, method=method, args=args: _method_case(leb, method, args))
+            for m in SECTORS:
+                i = make(city_type=city, cell_sectors_num=m)
+                result["MobileNetworkEngineer.report[{},{},M={}]".format(mode, city, m)] = (
+                    n, lambda i=i, batch=batch: _report_case(i, batch))
+    # потери на batch_size расстояниях: расчет LEB при каждом вызове
+    # против заранее посчитанных коэффициентов моделей распространения
+    distance = np.geomspace(0.05, 20, batch_size)
+    for city in CITY_TYPES:
+        i = scenario(city_type=city)
+        result["Propagation.COST231_Hata[per-call,{}]".format(city)] = (
+            batch_size, lambda i=i: _per_call_hata_case(i, distance))
+        for model in MODELS:
+            result["Propagation.{}[affine,{}]".format(model, city)] = (
+                batch_size, lambda i=i, model=model: _affine_case(i, model, distance))
+    return result
+
+
+def _quad_case(i):
+    cluster = _cluster(i, False)
+
+    def run():
+        cluster.tetta = cluster.tetta
+        return cluster.get_signal_to_noise_failure_probability(method="quad")
+    return run
+
+
+def _method_case(obj, method, args):
+    bound = getattr(obj, method)
+
+    def run():
+        return bound(*args)
+    return run
+
+
+def _per_call_hata_case(i, distance):
+    leb = LEBBatch()
+    city = np.full(len(distance), i["city_type"])
+
+    def run():
+        correction = leb.compute_antenna_height_correction_factor(
+            i["radio_frequency"], i["receiving_antenna_height"], city)
+        return leb.COST231_Hata(
+            correction, i["radio_frequency"], i["transmitting_antenna_height"], distance, city)
+    return run
+
+
+def _affine_case(i, model, distance):
+    loss = path_loss(
+        model, i["radio_frequency"], i["transmitting_antenna_height"],
+        i["receiving_antenna_height"], i["city_type"])
+
+    def run():
+        return loss.loss(distance)
+    return run
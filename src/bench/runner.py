@@ -0,0 +1,126 @@
+import json
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+
+def measure(make, scenarios, min_time=0.2, max_groups=200, max_calls=10000):
+    """
+    Измерение одного расчета. Для пропускной способности вызовы
+    группируются так, чтобы группа длилась не меньше 1 мс; задержки
+    p50/p99 считаются по отдельно измеренным вызовам (для очень быстрых
+    расчетов включают накладные расходы таймера), пиковая память - по
+    отдельному вызову под tracemalloc.
+
+    :param make: фабрика функции без аргументов
+    :param scenarios: число сценариев, обрабатываемых одним вызовом
+    :param min_time: наименьшая суммарная длительность каждой серии измерений, с
+    :param max_groups: наибольшее число групп
+    :param max_calls: наибольшее число отдельно измеряемых вызовов
+    """
+    run = make()
+    run()
+    inner = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(inner):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= 1e-3:
+            break
+        inner *= 2
+
+    groups = []
+    total = 0.0
+    while total < min_time and len(groups) < max_groups:
+        start = time.perf_counter()
+        for _ in range(inner):
+            run()
+        elapsed = time.perf_counter() - start
+        groups.append(elapsed / inner)
+        total += elapsed
+
+    latencies = []
+    total = 0.0
+    while total < min_time and len(latencies) < max_calls:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        latencies.append(elapsed)
+        total += elapsed
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    groups = np.array(groups)
+    latencies = np.array(latencies)
+    return {
+        "scenarios": scenarios,
+        "ops_per_sec": scenarios * len(groups) / groups.sum(),
+        "p50_us": float(np.percentile(latencies, 50) * 1e6),
+        "p99_us": float(np.percentile(latencies, 99) * 1e6),
+        "peak_kib": peak / 1024,
+    }
+
+
+def run_cases(cases, pattern=None, min_time=0.2, log=None):
+    """
+    Измерение набора расчетов, возвращает словарь для записи в JSON
+
+    :param cases: словарь имя -> (число сценариев, фабрика функции)
+    :param pattern: подстрока имени для отбора измерений
+    :param min_time: наименьшая длительность измерения одного расчета, с
+    :param log: функция вывода хода измерений
+    """
+    results = {}
+    for name, (scenarios, make) in cases.items():
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(make, scenarios, min_time)
+        if log:
+            log("{:<90} {:>14.0f} оп/с".format(name, results[name]["ops_per_sec"]))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """
+    Сравнение с опорными результатами, возвращает список регрессий
+    (имя, опорные оп/с, текущие оп/с) - расчетов, производительность
+    которых упала больше чем на долю threshold
+
+    :param current: результаты run_cases
+    :param baseline: опорные результаты run_cases
+    :param threshold: допустимое относительное снижение оп/с
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        if result["ops_per_sec"] < reference["ops_per_sec"] * (1 - threshold):
+            regressions.append((name, reference["ops_per_sec"], result["ops_per_sec"]))
+    return regressions
+
+
+def load(path):
+    with open(path, encoding="utf8") as f:
+        return json.load(f)
+
+
+def save(results, path):
+    with open(path, "w", encoding="utf8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=4)
@@ -0,0 +1,227 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from ftnp.nsp import NSP
+
+
+class ChannelAssignment:
+    """
+    Назначение частотных каналов (несущих) секторам размещения SiteLayout.
+    Ограничения задаются парами секторов и наименьшим разносом номеров
+    каналов: секторы одной площадки - cosite_separation, секторы
+    площадок ближе adjacent_radius - adjacent_separation (запрет соседних
+    каналов), ближе reuse_radius - 1 (запрет совпадающих каналов).
+    Каналы назначаются жадной раскраской графа ограничений: каждый
+    сектор получает наименьшие допустимые номера с учетом уже
+    назначенных соседей. Порядок обхода - по убыванию спроса, затем
+    по положению площадок, что дает раскраску, близкую к регулярной.
+    """
+
+    def __init__(
+        self,
+        layout,
+        demand,
+        reuse_radius=None,
+        adjacent_radius=None,
+        cosite_separation=2,
+        adjacent_separation=2,
+        cluster_dim=7,
+    ):
+        """
+        :param layout: SiteLayout
+        :param demand: число несущих каждого сектора, скаляр или массив
+            длины (число площадок * M)
+        :param reuse_radius: расстояние, ближе которого совпадающие каналы
+            запрещены, по умолчанию чуть меньше расстояния между
+            одноканальными площадками sqrt(cluster_dim) * spacing
+        :param adjacent_radius: расстояние, ближе которого запрещены соседние
+            каналы, по умолчанию чуть больше spacing (первое кольцо площадок)
+        :param cosite_separation: наименьший разнос каналов на одной площадке
+        :param adjacent_separation: наименьший разнос каналов соседних площадок
+        :param cluster_dim: размерность кластера (частотного плана)
+        """
+        self.layout = layout
+        self.cluster_dim = cluster_dim
+        self.reuse_radius = reuse_radius or 0.99 * np.sqrt(cluster_dim) * layout.spacing
+        self.adjacent_radius = adjacent_radius or 1.01 * layout.spacing
+        self.cosite_separation = cosite_separation
+        self.adjacent_separation = adjacent_separation
+        sectors = len(layout.x) * layout.cell_sectors_num
+        self.demand = np.broadcast_to(np.asarray(demand, dtype=np.int64), (sectors,)).copy()
+        self.channels = np.full((sectors, int(self.demand.max(initial=0))), -1, dtype=np.int32)
+        self.build_constraints()
+
+    def build_constraints(self):
+        """
+        Граф ограничений в сжатом виде (CSR): для сектора s соседи
+        neighbors[indptr[s]:indptr[s + 1]] и разнос separation[...]
+        """
+        points = np.column_stack((self.layout.x, self.layout.y))
+        pairs = cKDTree(points).query_pairs(self.reuse_radius, output_type="ndarray")
+        # пары площадок в обоих направлениях и пары площадки с собой
+        own = np.arange(len(points))
+        a = np.concatenate((pairs[:, 0], pairs[:, 1], own))
+        b = np.concatenate((pairs[:, 1], pairs[:, 0], own))
+        source, self.neighbors, self.separation = self._sector_edges(points, a, b)
+        self.indptr = np.searchsorted(source, np.arange(len(self.demand) + 1))
+
+    def update_constraints(self, sites):
+        """
+        Пересчет графа ограничений после перемещения площадок sites:
+        заново строятся только строки секторов этих площадок и их
+        соседей до и после перемещения, остальные строки копируются
+
+        :param sites: номера перемещенных площадок
+        """
+        m = self.layout.cell_sectors_num
+        points = np.column_stack((self.layout.x, self.layout.y))
+        sites = np.unique(np.asarray(sites, dtype=np.int64))
+        tree = cKDTree(points)
+        # соседи до перемещения - из текущего графа, после - по новым координатам
+        before = [self.neighbors[self.indptr[s * m]:self.indptr[(s + 1) * m]] // m for s in sites]
+        after = tree.query_ball_point(points[sites], self.reuse_radius)
+        affected = np.unique(np.concatenate([sites] + before + [np.asarray(v, dtype=np.int64) for v in after]))
+        near = tree.query_ball_point(points[affected], self.reuse_radius)
+        a = np.repeat(affected, [len(v) for v in near])
+        b = np.concatenate([np.asarray(v, dtype=np.int64) for v in near])
+        source, target, separation = self._sector_edges(points, a, b)
+
+        # строки затронутых площадок заменяются, остальные копируются участками
+        new_start = np.searchsorted(source, affected * m)
+        new_stop = np.searchsorted(source, (affected + 1) * m)
+        neighbors, separations, count = [], [], np.diff(self.indptr)
+        previous = 0
+        for site, start, stop in zip(affected, new_start, new_stop):
+            old_start, old_stop = self.indptr[site * m], self.indptr[(site + 1) * m]
+            neighbors += [self.neighbors[previous:old_start], target[start:stop]]
+            separations += [self.separation[previous:old_start], separation[start:stop]]
+            count[site * m:(site + 1) * m] = np.bincount(source[start:stop] - site * m, minlength=m)
+            previous = old_stop
+        self.neighbors = np.concatenate(neighbors + [self.neighbors[previous:]])
+        self.separation = np.concatenate(separations + [self.separation[previous:]])
+        self.indptr = np.concatenate(([0], np.cumsum(count)))
+
+    def _sector_edges(self, points, a, b):
+        # ребра графа ограничений между всеми секторами пар площадок (a, b),
+        # кроме сектора с самим собой, упорядоченные по сектору-источнику
+        m = self.layout.cell_sectors_num
+        distance = np.hypot(*(points[a] - points[b]).T)
+        site_separation = np.where(
+            a == b, self.cosite_separation,
+            np.where(distance <= self.adjacent_radius, self.adjacent_separation, 1))
+        k1, k2 = np.divmod(np.arange(m * m), m)
+        source = (a[:, None] * m + k1).ravel()
+        target = (b[:, None] * m + k2).ravel()
+        separation = np.repeat(site_separation, m * m)
+        keep = source != target
+        source, target, separation = source[keep], target[keep], separation[keep]
+        order = np.argsort(source, kind="stable")
+        return source[order], target[order].astype(np.int64), separation[order].astype(np.int8)
+
+    def _assign_sector(self, s):
+        start, stop = self.indptr[s], self.indptr[s + 1]
+        used = self.channels[self.neighbors[start:stop]]
+        sep = self.separation[start:stop, None]
+        forbidden = np.zeros(
+            int(used.max(initial=0)) + self.adjacent_separation + self.cosite_separation * (self.demand[s] + 1) + 2,
+            dtype=bool)
+        for offset in range(-int(sep.max(initial=1)) + 1, int(sep.max(initial=1))):
+            values = used + offset
+            values = values[(used >= 0) & (abs(offset) < sep) & (values >= 0)]
+            forbidden[values] = True
+        result = self.channels[s]
+        result[:] = -1
+        count = 0
+        last = -self.cosite_separation
+        for channel in np.flatnonzero(~forbidden):
+            if count == self.demand[s]:
+                break
+            if channel - last >= self.cosite_separation:
+                result[count] = channel
+                count += 1
+                last = channel
+
+    def order(self, sectors=None):
+        """
+        Порядок назначения: по убыванию спроса, затем по положению площадок
+        """
+        sectors = np.arange(len(self.demand)) if sectors is None else np.asarray(sectors)
+        site = sectors // self.layout.cell_sectors_num
+        return sectors[np.lexsort((sectors, self.layout.x[site], self.layout.y[site], -self.demand[sectors]))]
+
+    def assign(self):
+        """
+        Назначение каналов всем секторам, возвращает массив
+        (секторы, наибольший спрос), неиспользуемые позиции - -1
+        """
+        self.channels[:] = -1
+        for s in self.order():
+            self._assign_sector(s)
+        return self.channels
+
+    def reassign(self, sites, demand=None):
+        """
+        Повторное назначение каналов секторам измененных площадок
+        (координаты в layout уже обновлены и/или задан новый спрос),
+        каналы остальных секторов не меняются. Граф ограничений
+        обновляется только в окрестности этих площадок
+
+        :param sites: номера измененных площадок
+        :param demand: новый спрос секторов этих площадок, (len(sites) * M,)
+        """
+        m = self.layout.cell_sectors_num
+        sectors = (np.asarray(sites)[:, None] * m + np.arange(m)).ravel()
+        if demand is not None:
+            self.demand[sectors] = demand
+            if self.demand.max() > self.channels.shape[1]:
+                grown = np.full((len(self.demand), self.demand.max()), -1, dtype=np.int32)
+                grown[:, :self.channels.shape[1]] = self.channels
+                self.channels = grown
+        self.update_constraints(sites)
+        self.channels[sectors] = -1
+        for s in self.order(sectors):
+            self._assign_sector(s)
+        return self.channels
+
+    def violations(self):
+        """
+        Число нарушенных ограничений (пар каналов соседних секторов
+        с разносом меньше требуемого, каждая пара считается дважды)
+        """
+        source = np.repeat(np.arange(len(self.demand)), np.diff(self.indptr))
+        count = 0
+        d = self.channels.shape[1]
+        for i in range(d):
+            for j in range(d):
+                a = self.channels[source, i]
+                b = self.channels[self.neighbors, j]
+                count += np.count_nonzero((a >= 0) & (b >= 0) & (np.abs(a - b) < self.separation))
+        # разнос несущих внутри сектора
+        for i in range(d):
+            for j in range(i + 1, d):
+                a, b = self.channels[:, i], self.channels[:, j]
+                count += np.count_nonzero((a >= 0) & (b >= 0) & (np.abs(a - b) < self.cosite_separation))
+        return count
+
+    def spectrum(self, one_fq_ch_bandwith, radio_chan_per_sector=None):
+        """
+        Занятая полоса в сравнении с оценкой NSP.calc_minimum_bandwidth
+
+        :param one_fq_ch_bandwith: полоса частот, занимаемая одним частотным каналом
+        :param radio_chan_per_sector: число радиоканалов на сектор для NSP,
+            по умолчанию - наибольший спрос
+        """
+        used = int(self.channels.max(initial=-1)) + 1
+        nsp = NSP(
+            self.layout.cell_sectors_num,
+            radio_chan_per_sector or int(self.demand.max(initial=0)),
+            self.cluster_dim, 0, 0, 0
+        )
+        estimate = nsp.calc_minimum_bandwidth(one_fq_ch_bandwith)
+        return {
+            "channels_used": used,
+            "channels_estimate": nsp.calc_total_num_of_fq_chan(),
+            "bandwidth": used * one_fq_ch_bandwith,
+            "bandwidth_estimate": estimate,
+            "ratio": used * one_fq_ch_bandwith / estimate if estimate else np.nan,
+        }
@@ -1,16 +1,67 @@
+import functools
 import math as m
 import numpy as np
 from scipy.integrate import quad
+from scipy.special import erfc
+
+
+def signal_to_noise_failure_probability(x1):
+    """
+    Вероятность невыполнения требований по отношению сигнал/шум, %,
+    через дополнительную функцию ошибок: Q(x1) = erfc(x1 / sqrt(2)) / 2.
+    Устойчива при больших |x1|, принимает скаляр или массив x1.
+
+    :param x1: нижний предел интеграла нормального распределения
+    """
+    if np.ndim(x1) == 0:
+        return 0.5 * m.erfc(x1 / m.sqrt(2)) * 100
+    return 0.5 * erfc(np.asarray(x1, dtype=float) / m.sqrt(2)) * 100
+
+
+def memoized(name):
+    """
+    Кэширует результат метода Cluster под именем name до изменения
+    параметров конструктора и учитывает вычисления и повторные
+    использования в Cluster.cache_stats
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self):
+            counters = self.cache_stats.setdefault(name, {"computed": 0, "reused": 0})
+            if name in self._cache:
+                counters["reused"] += 1
+            else:
+                counters["computed"] += 1
+                self._cache[name] = method(self)
+            return self._cache[name]
+        return wrapper
+    return decorator
 
 
 class Cluster:
-    
+    """
+    Промежуточные величины (q, betta_i, tetta_e^2, betta, x1) кэшируются
+    в экземпляре и сбрасываются при присваивании любого из параметров
+    конструктора. Изменение массивов параметров на месте не отслеживается.
+    """
+
+    PARAMETERS = ("cluster_dim", "tetta", "cell_sectors_num", "signal_to_noise_ratio")
+
     def __init__(self, cluster_dim, tetta, cell_sectors_num, signal_to_noise_ratio) -> None:
+        self._cache = {}
+        # имя величины -> {"computed": число вычислений, "reused": число обращений к кэшу}
+        self.cache_stats = {}
         self.cluster_dim = cluster_dim
         self.tetta = tetta
         self.cell_sectors_num = cell_sectors_num # --> M
         self.signal_to_noise_ratio = signal_to_noise_ratio 
 
+    def __setattr__(self, name, value):
+        if name in self.PARAMETERS:
+            self._cache.clear()
+        super().__setattr__(name, value)
+
+    @memoized("q")
     def get_attenuation_of_interfering_signals(self):
         """
         Ослабление мешающих сигналов
@@ -18,6 +69,7 @@ class Cluster:
         q = m.sqrt(3 * self.cluster_dim)
         return q
     
+    @memoized("betta_i")
     def derive_betta_i(self):
         q = self.get_attenuation_of_interfering_signals()
         if self.cell_sectors_num == 1:
@@ -29,6 +81,7 @@ class Cluster:
         elif self.cell_sectors_num == 6:
             return (1, (q + 1) ** (-4))
     
+    @memoized("tetta_e_squared")
     def get_main_reception_channel_deviation(self):
         """
         Отклонения велечины уровня суммарной помехи по основному каналу приема
@@ -47,6 +100,7 @@ class Cluster:
         )
         return tetta_e_squared
 
+    @memoized("betta")
     def get_betta(self):
         """
         Относительный уровень суммарной помехи по основному канала приема
@@ -59,16 +113,25 @@ class Cluster:
         betta = sum_b * np.exp((0.053 * (self.tetta ** 2 - tetta_squared)) / 2)
         return betta
     
+    @memoized("x1")
     def derive_x1(self):
         tetta_squared = self.get_main_reception_channel_deviation()
         b = self.get_betta()
         x1 = (10 * m.log10(1/b) - self.signal_to_noise_ratio) / m.sqrt(self.tetta ** 2 + tetta_squared)
         return x1
 
-    def get_signal_to_noise_failure_probability(self):
+    def get_signal_to_noise_failure_probability(self, method="erfc"):
         """
         Вероятность невыполнения требований по отношению сигнал/шум
+
+        :param method:
+            "erfc" - замкнутая формула signal_to_noise_failure_probability,
+            "quad" - численное интегрирование хвоста нормального распределения
         """
+        if method == "erfc":
+            return signal_to_noise_failure_probability(self.derive_x1())
+        if method != "quad":
+            raise ValueError("Неизвестный метод: {}".format(method))
 
         def integrand(x):
             return np.exp((-x**2) / 2) 
@@ -76,3 +139,142 @@ class Cluster:
         x1 = self.derive_x1()
         I = quad(integrand, x1, np.inf)[0]
         return (1 / m.sqrt(2 * np.pi) * I) * 100
+
+
+class ClusterBatch(Cluster):
+    """
+    Векторизованный расчет размерности кластера для N сценариев.
+    Параметры конструктора - массивы одинаковой длины (или скаляры),
+    методы возвращают массивы результатов по каждому сценарию.
+    """
+
+    SECTORS = (1, 3, 6)
+
+    def __init__(self, cluster_dim, tetta, cell_sectors_num, signal_to_noise_ratio) -> None:
+        super().__init__(
+            np.asarray(cluster_dim, dtype=float),
+            np.asarray(tetta, dtype=float),
+            np.asarray(cell_sectors_num),
+            np.asarray(signal_to_noise_ratio, dtype=float)
+        )
+        self.check_parameters(self.cluster_dim, self.cell_sectors_num)
+
+    @classmethod
+    def check_parameters(cls, cluster_dim, cell_sectors_num):
+        """
+        Проверка размерности кластера (положительная) и числа секторов
+        (из SECTORS), при недопустимых значениях - ValueError
+
+        :param cluster_dim: размерность кластера, скаляр или массив
+        :param cell_sectors_num: число секторов, скаляр или массив
+        """
+        cluster_dim = np.asarray(cluster_dim, dtype=float)
+        invalid = ~(cluster_dim > 0)
+        if invalid.any():
+            raise ValueError(
+                "Недопустимая размерность кластера: {}".format(
+                    np.unique(cluster_dim[invalid]).tolist()))
+        cell_sectors_num = np.asarray(cell_sectors_num)
+        unsupported = ~np.isin(cell_sectors_num, cls.SECTORS)
+        if unsupported.any():
+            raise ValueError(
+                "Неподдерживаемое число секторов: {}".format(
+                    np.unique(cell_sectors_num[unsupported]).tolist()))
+
+    @classmethod
+    def from_tuples(cls, params):
+        """
+        Создает пакет из последовательности кортежей
+        (cluster_dim, tetta, cell_sectors_num, signal_to_noise_ratio)
+
+        :param params: итерируемый набор кортежей параметров Cluster
+        """
+        columns = np.array(list(params), dtype=float).reshape(-1, 4)
+        return cls(
+            columns[:, 0],
+            columns[:, 1],
+            columns[:, 2].astype(int),
+            columns[:, 3]
+        )
+
+    @memoized("q")
+    def get_attenuation_of_interfering_signals(self):
+        """
+        Ослабление мешающих сигналов
+        """
+        return np.sqrt(3 * self.cluster_dim)
+
+    # наибольшее число мешающих сигналов (M = 1)
+    MAX_INTERFERERS = 6
+
+    @memoized("betta_i")
+    def derive_betta_i(self):
+        """
+        Мешающие сигналы в той же раскладке, что и Cluster.derive_betta_i:
+        (число сигналов, betta_1, ..., betta_6), каждый элемент - массив
+        по сценариям; сигналы сверх числа сигналов сценария равны 0
+        """
+        q = self.get_attenuation_of_interfering_signals()
+        sectors = self.cell_sectors_num
+        zero = np.zeros_like(q)
+        # M = 1: четыре мешающих сигнала (q - 1)^4 и два (q + 1)^4
+        near, far = (q - 1) ** 4, (q + 1) ** 4
+        omni = (near, near, near, near, far, far)
+        # M = 3: (q + 0.7)^-4 и q^-4
+        with np.errstate(divide="ignore"):
+            tri = ((q + 0.7) ** (-4), q ** (-4), zero, zero, zero, zero)
+        # M = 6: (q + 1)^-4
+        hexa = ((q + 1) ** (-4), zero, zero, zero, zero, zero)
+        counts = np.select([sectors == 1, sectors == 3], [6, 2], 1)
+        return (counts,) + tuple(
+            np.where(sectors == 1, omni[k], np.where(sectors == 3, tri[k], hexa[k]))
+            for k in range(self.MAX_INTERFERERS)
+        )
+
+    @memoized("betta_sums")
+    def derive_betta_sums(self):
+        """
+        Суммы по мешающим сигналам из derive_betta_i для каждого сценария:
+        сумма квадратов betta_i, квадрат суммы betta_i и последний betta_i
+        """
+        counts, *betta_i = self.derive_betta_i()
+        betta_i = np.stack(np.broadcast_arrays(*betta_i))
+        counts = np.broadcast_to(counts, betta_i.shape[1:])
+        last = np.take_along_axis(betta_i, (counts - 1)[None], axis=0)[0]
+        return (betta_i ** 2).sum(axis=0), betta_i.sum(axis=0) ** 2, last
+
+    @memoized("tetta_e_squared")
+    def get_main_reception_channel_deviation(self):
+        """
+        Отклонения велечины уровня суммарной помехи по основному каналу приема
+        """
+        sum_one, sum_two, _ = self.derive_betta_sums()
+        tetta_e_squared = (1/0.053) * np.log(
+            1 + (
+                np.exp(0.053 * (self.tetta ** 2)) - 1
+            ) * sum_one / sum_two
+        )
+        return tetta_e_squared
+
+    @memoized("betta")
+    def get_betta(self):
+        """
+        Относительный уровень суммарной помехи по основному канала приема
+        """
+        _, _, sum_b = self.derive_betta_sums()
+        tetta_squared = self.get_main_reception_channel_deviation()
+        betta = sum_b * np.exp((0.053 * (self.tetta ** 2 - tetta_squared)) / 2)
+        return betta
+
+    @memoized("x1")
+    def derive_x1(self):
+        tetta_squared = self.get_main_reception_channel_deviation()
+        b = self.get_betta()
+        x1 = (10 * np.log10(1/b) - self.signal_to_noise_ratio) / np.sqrt(self.tetta ** 2 + tetta_squared)
+        return x1
+
+    def get_signal_to_noise_failure_probability(self):
+        """
+        Вероятность невыполнения требований по отношению сигнал/шум
+        """
+        return signal_to_noise_failure_probability(self.derive_x1())
@@ -0,0 +1,216 @@
+import functools
+import math
+import numpy as np
+from scipy.special import gammaln
+
+
+def _check_blocking(channels, blocking):
+    if np.any(channels < 1):
+        raise ValueError("Число каналов должно быть не меньше 1")
+    if np.any((blocking <= 0) | (blocking >= 1)):
+        raise ValueError("Вероятность блокировки должна лежать в интервале (0, 1)")
+
+
+def erlang_b(traffic, channels):
+    """
+    Вероятность блокировки вызова по формуле Эрланга B.
+    Устойчивая рекурсия B(k) = A * B(k - 1) / (k + A * B(k - 1)), B(0) = 1.
+    Принимает скаляры или массивы, приводимые к общей форме.
+
+    :param traffic: поступающая нагрузка, Эрл
+    :param channels: число каналов
+    """
+    if np.ndim(traffic) == 0 and np.ndim(channels) == 0:
+        b = 1.0
+        for k in range(1, int(channels) + 1):
+            b = traffic * b / (k + traffic * b)
+        return float(b)
+    a, n = np.broadcast_arrays(
+        np.asarray(traffic, dtype=float), np.asarray(channels, dtype=int))
+    # после сортировки по убыванию n на шаге k обновляется только префикс
+    order = np.argsort(-n, axis=None, kind="stable")
+    a_sorted, n_sorted = a.ravel()[order], n.ravel()[order]
+    max_n = int(n.max(initial=0))
+    # число элементов с n >= k для k = 1..max_n
+    active = np.searchsorted(-n_sorted, -np.arange(1, max_n + 1), side="right")
+    b_sorted = np.ones(n.size)
+    for k, count in enumerate(active, start=1):
+        ab = a_sorted[:count] * b_sorted[:count]
+        b_sorted[:count] = ab / (k + ab)
+    b = np.empty(n.size)
+    b[order] = b_sorted
+    b = b.reshape(n.shape)
+    return b if b.ndim else float(b)
+
+
+def erlang_b_traffic(channels, blocking, tol=1e-12, max_iter=100, initial=None):
+    """
+    Поступающая нагрузка, при которой n каналов обеспечивают заданную
+    вероятность блокировки (обращение формулы Эрланга B).
+    Метод Ньютона по log(A) для log(B) с защитой бисекцией на отрезке
+    [(p * n!)^(1/n), n / (1 - p)], векторизован по массивам числа каналов
+    и вероятностей блокировки.
+
+    :param channels: число каналов
+    :param blocking: допустимая вероятность блокировки
+    :param tol: относительная точность по нагрузке
+    :param max_iter: наибольшее число итераций
+    :param initial: начальное приближение нагрузки, например из ErlangBTable
+    """
+    if np.ndim(channels) == 0 and np.ndim(blocking) == 0 and initial is None:
+        return _erlang_b_traffic_scalar(int(channels), float(blocking), tol, max_iter)
+    n, p = np.broadcast_arrays(
+        np.asarray(channels, dtype=int), np.asarray(blocking, dtype=float))
+    _check_blocking(n, p)
+    n, log_p = n.ravel(), np.log(p).ravel()
+    # B <= A^n / n!, а перенесенная нагрузка A * (1 - B) не превышает n
+    lo = (log_p + gammaln(n + 1)) / n
+    hi = np.log(n / (1 - p.ravel()))
+    if initial is None:
+        x = np.minimum(np.log(n), (lo + hi) / 2)
+    else:
+        x = np.clip(np.log(np.broadcast_to(initial, p.shape)).ravel(), lo, hi)
+    active = np.arange(n.size)
+    for _ in range(max_iter):
+        a = np.exp(x[active])
+        b = erlang_b(a, n[active])
+        f = np.log(b) - log_p[active]
+        lo[active] = np.where(f < 0, x[active], lo[active])
+        hi[active] = np.where(f > 0, x[active], hi[active])
+        # d log(B) / d log(A) = n - A + A * B
+        newton = x[active] - f / (n[active] - a + a * b)
+        inside = (newton > lo[active]) & (newton < hi[active])
+        step = np.where(inside, newton, (lo[active] + hi[active]) / 2)
+        done = np.abs(step - x[active]) <= tol
+        x[active] = step
+        active = active[~done]
+        if not active.size:
+            break
+    a = np.exp(x).reshape(p.shape)
+    return a if a.ndim else float(a)
+
+
+def _erlang_b_traffic_scalar(n, p, tol, max_iter):
+    # тот же метод, что и в erlang_b_traffic, без накладных расходов NumPy
+    _check_blocking(np.int64(n), np.float64(p))
+    log_p = math.log(p)
+    lo = (log_p + math.lgamma(n + 1)) / n
+    hi = math.log(n / (1 - p))
+    x = min(math.log(n), (lo + hi) / 2)
+    for _ in range(max_iter):
+        a = math.exp(x)
+        b = erlang_b(a, n)
+        f = math.log(b) - log_p
+        if f < 0:
+            lo = x
+        elif f > 0:
+            hi = x
+        newton = x - f / (n - a + a * b)
+        step = newton if lo < newton < hi else (lo + hi) / 2
+        done = abs(step - x) <= tol
+        x = step
+        if done:
+            break
+    return math.exp(x)
+
+
+class ErlangBTable:
+    """
+    Таблица нагрузки (число каналов x вероятность блокировки) для
+    многократных обращений при переборе параметров. Строки (число каналов)
+    строятся лениво при первом обращении, построение строки стоит points
+    точных решений. Между узлами сетки вероятностей log(A) интерполируется
+    кубическим многочленом Эрмита по log(p) с точными производными
+    d log(A) / d log(p) = 1 / (n - A + A p). При параметрах по умолчанию
+    относительная погрешность нагрузки не больше MAX_RELATIVE_ERROR
+    (наибольшая - при p около 0.5), значения вне таблицы рассчитываются
+    точно через erlang_b_traffic.
+    """
+
+    MAX_RELATIVE_ERROR = 5e-8
+
+    def __init__(self, max_channels=256, min_blocking=1e-6, max_blocking=0.5, points=512):
+        """
+        :param max_channels: наибольшее число каналов в таблице
+        :param min_blocking: наименьшая вероятность блокировки в таблице
+        :param max_blocking: наибольшая вероятность блокировки в таблице
+        :param points: число узлов сетки вероятностей блокировки
+        """
+        self.max_channels = max_channels
+        self.points = points
+        self.log_blocking = np.linspace(np.log(min_blocking), np.log(max_blocking), points)
+        self.log_traffic = np.full((max_channels, points), np.nan)
+        self.slope = np.full((max_channels, points), np.nan)
+        # built[n - 1] - строка n каналов построена
+        self.built = np.zeros(max_channels, dtype=bool)
+
+    def covers(self, channels, blocking):
+        """
+        Маска значений, лежащих внутри таблицы
+
+        :param channels: число каналов
+        :param blocking: вероятность блокировки
+        """
+        n = np.asarray(channels)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_p = np.log(blocking)
+        return (n >= 1) & (n <= self.max_channels) & \
+            (log_p >= self.log_blocking[0]) & (log_p <= self.log_blocking[-1])
+
+    def build(self, channels):
+        """
+        Построение строк таблицы для заданных чисел каналов
+
+        :param channels: числа каналов от 1 до max_channels
+        """
+        rows = np.unique(np.asarray(channels, dtype=int))
+        rows = rows[~self.built[rows - 1]]
+        if not rows.size:
+            return
+        n = rows[:, None]
+        blocking = np.exp(self.log_blocking)[None, :]
+        traffic = erlang_b_traffic(n, blocking)
+        self.log_traffic[rows - 1] = np.log(traffic)
+        self.slope[rows - 1] = 1 / (n - traffic + traffic * blocking)
+        self.built[rows - 1] = True
+
+    def traffic(self, channels, blocking):
+        """
+        Поступающая нагрузка для заданных числа каналов и вероятности блокировки
+
+        :param channels: число каналов
+        :param blocking: допустимая вероятность блокировки
+        """
+        n, p = np.broadcast_arrays(
+            np.asarray(channels, dtype=int), np.asarray(blocking, dtype=float))
+        _check_blocking(n, p)
+        inside = self.covers(n, p)
+        result = np.empty(n.shape)
+
+        self.build(n[inside])
+        row = n[inside] - 1
+        grid = self.log_blocking
+        step = grid[1] - grid[0]
+        position = (np.log(p[inside]) - grid[0]) / step
+        col = np.minimum(position.astype(int), len(grid) - 2)
+        t = position - col
+        t2, t3 = t ** 2, t ** 3
+        table, slope = self.log_traffic, self.slope
+        result[inside] = np.exp(
+            (2 * t3 - 3 * t2 + 1) * table[row, col]
+            + (t3 - 2 * t2 + t) * step * slope[row, col]
+            + (3 * t2 - 2 * t3) * table[row, col + 1]
+            + (t3 - t2) * step * slope[row, col + 1]
+        )
+        if not inside.all():
+            result[~inside] = erlang_b_traffic(n[~inside], p[~inside])
+        return result if result.ndim else float(result)
+
+
+@functools.lru_cache(maxsize=4)
+def erlang_b_table(max_channels=256, min_blocking=1e-6, max_blocking=0.5, points=512):
+    """
+    Общая таблица ErlangBTable с заданными параметрами,
+    в памяти одновременно хранится не более четырех таблиц
+    """
+    return ErlangBTable(max_channels, min_blocking, max_blocking, points)
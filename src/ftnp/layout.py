@@ -0,0 +1,246 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from ftnp.cluster import signal_to_noise_failure_probability
+
+SQRT3 = np.sqrt(3)
+
+# ширина диаграммы направленности секторной антенны по уровню -3 дБ, градусы
+BEAMWIDTH = {3: 65.0, 6: 33.0}
+
+# наибольшее ослабление вне главного лепестка, дБ
+FRONT_TO_BACK = 20.0
+
+
+def reuse_shift(cluster_dim):
+    """
+    Параметры сдвига (i, j), i >= j >= 0, для размерности кластера C = i^2 + i*j + j^2
+
+    :param cluster_dim: размерность кластера
+    """
+    for i in range(int(np.sqrt(cluster_dim)) + 1):
+        for j in range(i + 1):
+            if i * i + i * j + j * j == cluster_dim:
+                return i, j
+    raise ValueError("Недопустимая размерность кластера: {}".format(cluster_dim))
+
+
+def axial_coordinates(x, y, spacing):
+    """
+    Ближайшие узлы гексагональной решетки с шагом spacing в осевых координатах (a, b)
+
+    :param x: координаты по оси x
+    :param y: координаты по оси y
+    :param spacing: расстояние между соседними площадками
+    """
+    b = np.asarray(y, dtype=float) / (spacing * SQRT3 / 2)
+    a = np.asarray(x, dtype=float) / spacing - b / 2
+    c = -a - b
+    ra, rb, rc = np.round(a), np.round(b), np.round(c)
+    da, db, dc = np.abs(ra - a), np.abs(rb - b), np.abs(rc - c)
+    fix_a = (da > db) & (da > dc)
+    fix_b = ~fix_a & (db > dc)
+    ra = np.where(fix_a, -rb - rc, ra)
+    rb = np.where(fix_b, -ra - rc, rb)
+    return ra.astype(np.int64), rb.astype(np.int64)
+
+
+def cochannel_groups(a, b, cluster_dim):
+    """
+    Номер группы частот 0..C-1 для узлов гексагональной решетки (a, b).
+    Узлы с одинаковым номером образуют решетку, натянутую на векторы
+    сдвига (i, j) и (-j, i + j).
+
+    :param a: осевая координата a
+    :param b: осевая координата b
+    :param cluster_dim: размерность кластера
+    """
+    i, j = reuse_shift(cluster_dim)
+    basis = np.array([[i, -j], [j, i + j]], dtype=float)
+    inverse = np.linalg.inv(basis)
+
+    def reduce(a, b):
+        # представитель смежного класса внутри основного параллелограмма решетки
+        points = np.stack((a, b)).astype(float)
+        shift = np.floor(inverse @ points + 1e-9)
+        return (points - basis @ shift).round().astype(np.int64)
+
+    # перечисление всех C представителей
+    span = 2 * (i + j) + 1
+    grid_a, grid_b = np.meshgrid(np.arange(-span, span + 1), np.arange(-span, span + 1))
+    reps = np.unique(reduce(grid_a.ravel(), grid_b.ravel()), axis=1)
+    low = reps.min(axis=1)
+    width = reps[1].max() - low[1] + 1
+    lookup = np.full((reps[0].max() - low[0] + 1) * width, -1, dtype=np.int64)
+    lookup[(reps[0] - low[0]) * width + (reps[1] - low[1])] = np.arange(reps.shape[1])
+    rep = reduce(np.asarray(a), np.asarray(b))
+    return lookup[(rep[0] - low[0]) * width + (rep[1] - low[1])]
+
+
+def sector_gain(angle, sectors):
+    """
+    Усиление секторной антенны относительно главного направления, разы
+    (диаграмма -min(12 * (angle / BEAMWIDTH)^2, FRONT_TO_BACK) дБ)
+
+    :param angle: угол относительно главного направления, градусы
+    :param sectors: число секторов в соте
+    """
+    if sectors == 1:
+        return np.ones(np.shape(angle))
+    angle = (np.asarray(angle) + 180) % 360 - 180
+    attenuation = np.minimum(12 * (angle / BEAMWIDTH[sectors]) ** 2, FRONT_TO_BACK)
+    return 10 ** (-attenuation / 10)
+
+
+class SiteLayout:
+    """
+    Размещение площадок сети: координаты, азимут первого сектора,
+    число секторов и группа частот (по размерности кластера).
+    Сектор k площадки s имеет азимут azimuth[s] + 360 / M * k и
+    номер s * M + k; одноименные секторы площадок одной группы
+    работают на одних частотах.
+    """
+
+    def __init__(self, x, y, cell_sectors_num, azimuth=0.0, groups=None, spacing=None):
+        """
+        :param x: координаты площадок по оси x, км
+        :param y: координаты площадок по оси y, км
+        :param cell_sectors_num: число секторов в соте (1, 3 или 6)
+        :param azimuth: азимут первого сектора, градусы от оси y, скаляр или массив
+        :param groups: группы частот площадок, если уже назначены
+        :param spacing: расстояние между соседними площадками, км
+        """
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.cell_sectors_num = cell_sectors_num
+        self.azimuth = np.broadcast_to(np.asarray(azimuth, dtype=float), self.x.shape)
+        self.groups = None if groups is None else np.asarray(groups, dtype=np.int64)
+        self.spacing = spacing
+
+    @classmethod
+    def hexagonal(cls, rows, cols, spacing, cell_sectors_num, cluster_dim=None):
+        """
+        Прямоугольный участок гексагональной сети из rows x cols площадок
+
+        :param rows: число рядов площадок
+        :param cols: число площадок в ряду
+        :param spacing: расстояние между соседними площадками, км
+        :param cell_sectors_num: число секторов в соте
+        :param cluster_dim: размерность кластера для назначения групп частот
+        """
+        r, c = np.divmod(np.arange(rows * cols), cols)
+        a, b = c - r // 2, r
+        layout = cls(
+            spacing * (a + b / 2), spacing * SQRT3 / 2 * b,
+            cell_sectors_num, spacing=spacing
+        )
+        if cluster_dim is not None:
+            layout.groups = cochannel_groups(a, b, cluster_dim)
+        return layout
+
+    @classmethod
+    def load(cls, path):
+        """
+        Загрузка из файла .npz, записанного save
+        """
+        with np.load(path) as data:
+            groups = data["groups"] if "groups" in data else None
+            spacing = float(data["spacing"]) if "spacing" in data else None
+            return cls(
+                data["x"], data["y"], int(data["cell_sectors_num"]),
+                data["azimuth"], groups, spacing
+            )
+
+    def save(self, path):
+        arrays = {
+            "x": self.x, "y": self.y, "azimuth": self.azimuth,
+            "cell_sectors_num": self.cell_sectors_num,
+        }
+        if self.groups is not None:
+            arrays["groups"] = self.groups
+        if self.spacing is not None:
+            arrays["spacing"] = self.spacing
+        np.savez(path, **arrays)
+
+    def assign_groups(self, cluster_dim, spacing=None):
+        """
+        Назначение групп частот по ближайшим узлам гексагональной решетки
+
+        :param cluster_dim: размерность кластера
+        :param spacing: шаг решетки, по умолчанию - заданный для размещения
+        """
+        spacing = spacing or self.spacing
+        self.groups = cochannel_groups(*axial_coordinates(self.x, self.y, spacing), cluster_dim)
+        return self.groups
+
+    def cochannel_pairs(self, radius):
+        """
+        Пары площадок одной группы частот на расстоянии не больше radius,
+        по одному k-d дереву на группу. Возвращает массив (P, 2), каждая
+        пара встречается в обоих направлениях.
+
+        :param radius: радиус поиска мешающих площадок, км
+        """
+        if self.groups is None:
+            raise ValueError("Группы частот не назначены")
+        points = np.column_stack((self.x, self.y))
+        pairs = []
+        for group in np.unique(self.groups):
+            members = np.flatnonzero(self.groups == group)
+            found = cKDTree(points[members]).query_pairs(radius, output_type="ndarray")
+            pairs.append(members[found])
+        pairs = np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+        return np.concatenate((pairs, pairs[:, ::-1]))
+
+    def interference(self, radius, cell_radius=None, tetta=6.0, signal_to_noise_ratio=9.0, gamma=4.0):
+        """
+        Отношение сигнал/помеха и вероятность невыполнения требований по
+        отношению сигнал/шум для каждого сектора. Абонент находится на
+        границе соты в главном направлении сектора, мешают одноименные
+        секторы площадок той же группы в радиусе radius с учетом диаграммы
+        направленности; потери растут как d^gamma. Вероятность считается
+        как в Cluster, по сумме всех мешающих сигналов.
+        Возвращает словарь массивов длины (число площадок * M):
+        "ci" (дБ, float32), "outage" (%, float32) и "interferers" (int32).
+
+        :param radius: радиус поиска мешающих площадок, км
+        :param cell_radius: радиус соты, по умолчанию spacing / sqrt(3)
+        :param tetta: стандартное отклонение уровня сигнала, дБ
+        :param signal_to_noise_ratio: требуемое отношение сигнал/помеха, дБ
+        :param gamma: показатель степени затухания
+        """
+        m = self.cell_sectors_num
+        cell_radius = cell_radius or self.spacing / SQRT3
+        sectors = len(self.x) * m
+        source, target = self.cochannel_pairs(radius).T
+
+        k = np.arange(m)
+        bearing = np.radians(self.azimuth[:, None] + 360 / m * k)
+        # точка абонента каждого сектора, форма (площадки, M)
+        px = self.x[:, None] + cell_radius * np.sin(bearing)
+        py = self.y[:, None] + cell_radius * np.cos(bearing)
+
+        dx = px[target] - self.x[source][:, None]
+        dy = py[target] - self.y[source][:, None]
+        distance = np.hypot(dx, dy)
+        angle = np.degrees(np.arctan2(dx, dy)) - (self.azimuth[source][:, None] + 360 / m * k)
+        betta = sector_gain(angle, m) * (distance / cell_radius) ** (-gamma)
+
+        index = (target[:, None] * m + k).ravel()
+        sum_b = np.bincount(index, betta.ravel(), sectors)
+        sum_b2 = np.bincount(index, (betta ** 2).ravel(), sectors)
+        count = np.bincount(index, minlength=sectors).astype(np.int32)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ci = -10 * np.log10(sum_b)
+            tetta_e_squared = (1/0.053) * np.log(
+                1 + (np.exp(0.053 * tetta ** 2) - 1) * sum_b2 / sum_b ** 2)
+            betta_e = sum_b * np.exp(0.053 * (tetta ** 2 - tetta_e_squared) / 2)
+            x1 = (10 * np.log10(1 / betta_e) - signal_to_noise_ratio) /\
+                np.sqrt(tetta ** 2 + tetta_e_squared)
+        outage = np.where(count > 0, signal_to_noise_failure_probability(np.nan_to_num(x1)), 0.0)
+        return {
+            "ci": ci.astype(np.float32),
+            "outage": outage.astype(np.float32),
+            "interferers": count,
+        }
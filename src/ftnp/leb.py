@@ -180,3 +180,126 @@ class LEB:
             (44.9 - 6.55 * np.log10(transmitting_antenna_height)) *\
             np.log10(distance_between_antennas) + C
         return L
+
+    def COST231_Hata_distance(
+        self,
+        antenna_height_correction_factor,   # 𝐴(hпрм)
+        radio_frequency,    # f
+        transmitting_antenna_height,    # hпрд
+        path_loss,  # L
+        city_type: CityType,
+    ):
+        """
+        Расстояние между антеннами, на котором потери по модели
+        COST231-Хата равны заданным (обращение COST231_Hata)
+
+        :param antenna_height_correction_factor:
+            Поправочный коэффициент для высоты антенны подвижного объекта,
+            зависящий от типа местности
+        :param radio_frequency: частота радиосигнала
+        :param transmitting_antenna_height: высота передающей антенны
+        :param path_loss: допустимые потери сигнала
+        :param city_type: размер города
+        """
+        L_1km = self.COST231_Hata(
+            antenna_height_correction_factor,
+            radio_frequency,
+            transmitting_antenna_height,
+            1,
+            city_type
+        )
+        slope = 44.9 - 6.55 * np.log10(transmitting_antenna_height)
+        d = 10 ** ((path_loss - L_1km) / slope)
+        return d
+
+
+class LEBBatch(LEB):
+    """
+    Векторизованная оценка энергетического бюджета линий для N сценариев.
+    Пары значений (БС, АС) передаются массивами формы (N, 2),
+    тип города - массивом имен CityType.
+    """
+
+    @staticmethod
+    def is_large_city(city_type):
+        """
+        Маска сценариев с типом города LARGE
+
+        :param city_type: массив имен CityType
+        """
+        names = np.asarray(city_type)
+        known = np.isin(names, [t.name for t in CityType])
+        if not known.all():
+            raise KeyError(str(names[~known].flat[0]))
+        return names == CityType.LARGE.name
+
+    def compute_total_losses(
+        self,
+        eqv_isotropically_radiated_pow,
+        useful_signal_strength,
+        line_loss_margin,
+    ):
+        """
+        Суммарные потери радиосигнала при распространении радиоволн от
+        базовой станции к абонентской станции, массив формы (N, 2)
+
+        :param eqv_isotropically_radiated_pow:
+            эквивалентная изотропно излучаемая мощность БС и АС соответственно
+        :param useful_signal_strength:
+            необходимая мощность полезного сигнала для 50% вероятности обеспечения связью
+        :param line_loss_margin: запас по потерям в линии
+        """
+        eirp = np.asarray(eqv_isotropically_radiated_pow, dtype=float)
+        p_min = np.asarray(useful_signal_strength, dtype=float)
+        temp1 = eirp[..., 0] - p_min[..., 1] - line_loss_margin
+        temp2 = eirp[..., 1] - p_min[..., 0] - line_loss_margin
+        return np.stack((temp1, temp2), axis=-1)
+
+    def compute_antenna_height_correction_factor(
+        self,
+        radio_frequency,
+        receiving_antenna_height,
+        city_type
+    ):
+        """
+        Поправочный коэффициент для высоты антенны подвижного
+        объекта, зависящий от типа местности
+
+        :param radio_frequency: частота радиосигнала
+        :param receiving_antenna_height: высота приемной антенны
+        :param city_type: размер города
+        """
+        large = self.is_large_city(city_type)
+        log_f = np.log10(radio_frequency)
+        return np.where(
+            large,
+            3.2 * (np.log10(11.75 * receiving_antenna_height)) ** 2 - 4.97,
+            (1.1 * log_f - 0.7) * receiving_antenna_height - (1.56 * log_f - 0.8)
+        )
+
+    def COST231_Hata(
+        self,
+        antenna_height_correction_factor,
+        radio_frequency,
+        transmitting_antenna_height,
+        distance_between_antennas,
+        city_type,
+    ):
+        """
+        Потери сигнала от базовой станции (БС) до абонентской станции (АС)
+        на основе модели COST231-Хата
+
+        :param antenna_height_correction_factor:
+            Поправочный коэффициент для высоты антенны подвижного объекта,
+            зависящий от типа местности
+        :param radio_frequency: частота радиосигнала
+        :param transmitting_antenna_height: высота передающей антенны
+        :param distance_between_antennas: расстояние между антеннами
+        :param city_type: размер города
+        """
+        C = np.where(self.is_large_city(city_type), 3, 0)
+        log_h = np.log10(transmitting_antenna_height)
+        L = 46.3 + 33.91 * np.log10(radio_frequency) - 13.821 * log_h -\
+            antenna_height_correction_factor +\
+            (44.9 - 6.55 * log_h) * np.log10(distance_between_antennas) + C
+        return L
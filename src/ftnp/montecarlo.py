@@ -0,0 +1,148 @@
+import math as m
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.special import ndtri
+
+# множитель перехода от дБ к натуральному показателю: 10^(x/10) = exp(DB * x)
+DB = m.log(10) / 10
+
+
+def count_outages(betta_i, tetta, signal_to_noise_ratio, size, seed, chunk_index):
+    """
+    Число отказов в одной порции из size испытаний. Уровни полезного
+    сигнала и каждой помехи имеют логнормальное распределение со
+    стандартным отклонением tetta дБ, медианные уровни помех относительно
+    полезного сигнала равны betta_i. Отказ - отношение сигнал/помеха
+    ниже signal_to_noise_ratio дБ. Порция chunk_index получает собственный
+    генератор из SeedSequence(seed), поэтому результат не зависит от того,
+    в каком процессе она считается.
+
+    :param betta_i: относительные уровни мешающих сигналов
+    :param tetta: стандартное отклонение уровня сигнала, дБ
+    :param signal_to_noise_ratio: защитное отношение сигнал/помеха, дБ
+    :param size: число испытаний в порции
+    :param seed: начальное значение генератора
+    :param chunk_index: номер порции
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index,)))
+    scale = DB * tetta
+    interference = np.zeros(size)
+    for betta in betta_i:
+        interference += betta * np.exp(scale * rng.standard_normal(size))
+    wanted = np.exp(scale * rng.standard_normal(size))
+    return int(np.count_nonzero(wanted < m.exp(DB * signal_to_noise_ratio) * interference))
+
+
+def _count_outages_task(args):
+    return count_outages(*args)
+
+
+class MonteCarloOutage:
+    """
+    Статистическая проверка аналитической оценки вероятности невыполнения
+    требований по отношению сигнал/шум, рассчитываемой Cluster.
+    Мешающие сигналы берутся из Cluster.derive_betta_i.
+    """
+
+    def __init__(self, cluster, chunk_size=1 << 20, seed=None):
+        """
+        :param cluster: калькулятор Cluster
+        :param chunk_size: число испытаний в одной порции
+        :param seed: начальное значение генератора, по умолчанию случайное
+        """
+        self.cluster = cluster
+        self.chunk_size = chunk_size
+        self.seed = np.random.SeedSequence(seed).entropy
+
+    def estimate(
+        self,
+        samples=10**9,
+        precision=None,
+        relative_precision=None,
+        confidence=0.95,
+        workers=None,
+    ):
+        """
+        Оценка вероятности невыполнения требований, %, с доверительным
+        интервалом Вильсона. Порции испытаний считаются в пуле из workers
+        процессов (по умолчанию - по числу ядер) и учитываются в порядке
+        номеров, расчет прекращается, когда полуширина интервала становится
+        не больше precision (в процентных пунктах) или relative_precision
+        (доля оценки), либо исчерпан бюджет samples.
+
+        :param samples: наибольшее число испытаний
+        :param precision: требуемая полуширина интервала, %
+        :param relative_precision: требуемая относительная полуширина интервала
+        :param confidence: доверительная вероятность
+        :param workers: число процессов
+        """
+        c = self.cluster
+        betta_i = c.derive_betta_i()[1:]
+        z = float(ndtri(0.5 + confidence / 2))
+        chunks = -(-samples // self.chunk_size)
+        sizes = [min(self.chunk_size, samples - k * self.chunk_size) for k in range(chunks)]
+        tasks = (
+            (betta_i, c.tetta, c.signal_to_noise_ratio, size, self.seed, k)
+            for k, size in enumerate(sizes)
+        )
+
+        failures = trials = 0
+        workers = workers or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(workers) if workers > 1 else None
+        # в работе держится не больше двух порций на процесс
+        in_flight = 2 * workers if pool else 1
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < in_flight:
+                    task = next(tasks, None)
+                    if task is None:
+                        break
+                    pending.append((task, pool.submit(_count_outages_task, task) if pool else None))
+                if not pending:
+                    break
+                task, future = pending.popleft()
+                failures += future.result() if future else _count_outages_task(task)
+                trials += task[3]
+                low, high = self.wilson_interval(failures, trials, z)
+                if self._is_precise(failures / trials, (high - low) / 2, precision, relative_precision):
+                    break
+        finally:
+            if pool:
+                # cancel_futures появился только в Python 3.9
+                for _, future in pending:
+                    future.cancel()
+                pool.shutdown(wait=True)
+
+        low, high = self.wilson_interval(failures, trials, z)
+        return {
+            "outage": failures / trials * 100,
+            "ci_low": low * 100,
+            "ci_high": high * 100,
+            "samples": trials,
+            "analytical": c.get_signal_to_noise_failure_probability(),
+        }
+
+    @staticmethod
+    def _is_precise(p, half_width, precision, relative_precision):
+        if precision is not None and half_width * 100 <= precision:
+            return True
+        return relative_precision is not None and p > 0 and half_width <= relative_precision * p
+
+    @staticmethod
+    def wilson_interval(failures, trials, z):
+        """
+        Доверительный интервал Вильсона для доли failures / trials
+
+        :param failures: число отказов
+        :param trials: число испытаний
+        :param z: квантиль нормального распределения
+        """
+        p = failures / trials
+        denominator = 1 + z ** 2 / trials
+        center = (p + z ** 2 / (2 * trials)) / denominator
+        spread = z * m.sqrt(p * (1 - p) / trials + z ** 2 / (4 * trials ** 2)) / denominator
+        return max(0.0, center - spread), min(1.0, center + spread)
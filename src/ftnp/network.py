@@ -0,0 +1,202 @@
+import json
+import os
+
+import numpy as np
+
+from ftnp.leb import CityType, LEBBatch
+from ftnp.nsp import NSPBatch
+
+# коды типов города в столбце city_type
+CITY_TYPES = tuple(t.name for t in CityType)
+
+# общие параметры сети, без которых не строится NSPBatch
+NSP_PARAMETERS = ("cell_sectors_num", "cluster_dim")
+
+# запись одного сектора сети
+SECTOR_DTYPE = np.dtype([
+    ("site", np.int32),
+    ("x", np.float64),
+    ("y", np.float64),
+    ("azimuth", np.float32),
+    ("transmitter_output_power", np.float32),
+    ("transmitter_antenna_gain", np.float32),
+    ("transmission_antenna_feeder_loss", np.float32),
+    ("duplex_filter_loss", np.float32),
+    ("diplexer_loss", np.float32),
+    ("radiated_power_reduction_coefficient", np.float32),
+    ("transmitting_antenna_height", np.float32),
+    ("receiving_antenna_height", np.float32),
+    ("radio_frequency", np.float32),
+    ("city_type", np.uint8),
+    ("carriers", np.uint16),
+    ("traffic_transmission_ch_num", np.uint16),
+    ("call_blocking_admissible_prob", np.float32),
+])
+
+
+class Network:
+    """
+    Сеть оператора в виде столбцов: одна запись SECTOR_DTYPE на сектор
+    и словарь общих параметров сети. Расчеты LEB и NSP выполняются
+    сразу над столбцами через LEBBatch и NSPBatch. На диске - каталог
+    с sectors.npy и network.json, sectors.npy открывается отображением
+    в память.
+    """
+
+    def __init__(self, sectors, parameters=None):
+        """
+        :param sectors: структурированный массив с типом SECTOR_DTYPE
+        :param parameters: общие параметры сети (ключи initial.json)
+        """
+        if sectors.dtype != SECTOR_DTYPE:
+            raise ValueError("Ожидается массив с типом SECTOR_DTYPE")
+        self.sectors = sectors
+        self.parameters = dict(parameters or {})
+        self.leb = LEBBatch()
+
+    @classmethod
+    def empty(cls, size, parameters=None):
+        return cls(np.zeros(size, dtype=SECTOR_DTYPE), parameters)
+
+    @classmethod
+    def from_layout(cls, layout, parameters=None, **fields):
+        """
+        Секторы размещения SiteLayout, остальные столбцы - из fields
+        (скаляры или массивы по секторам)
+
+        :param layout: SiteLayout
+        :param parameters: общие параметры сети
+        :param fields: значения столбцов SECTOR_DTYPE
+        """
+        m = layout.cell_sectors_num
+        network = cls.empty(len(layout.x) * m, parameters)
+        s = network.sectors
+        s["site"] = np.repeat(np.arange(len(layout.x)), m)
+        s["x"] = np.repeat(layout.x, m)
+        s["y"] = np.repeat(layout.y, m)
+        s["azimuth"] = (np.repeat(layout.azimuth, m) + np.tile(360 / m * np.arange(m), len(layout.x))) % 360
+        for name, value in fields.items():
+            network.set(name, value)
+        return network
+
+    @classmethod
+    def load(cls, directory, mmap_mode="r"):
+        """
+        Открытие сети, записанной save. По умолчанию секторы только
+        отображаются в память, данные читаются по мере обращения.
+
+        :param directory: каталог сети
+        :param mmap_mode: режим отображения numpy.load, None - чтение целиком
+        """
+        with open(os.path.join(directory, "network.json"), encoding="utf8") as f:
+            parameters = json.load(f)
+        return cls(np.load(os.path.join(directory, "sectors.npy"), mmap_mode=mmap_mode), parameters)
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "sectors.npy"), self.sectors)
+        with open(os.path.join(directory, "network.json"), "w", encoding="utf8") as f:
+            json.dump(self.parameters, f, ensure_ascii=False, indent=4)
+
+    def __len__(self):
+        return len(self.sectors)
+
+    def set(self, name, value):
+        """
+        Запись столбца; тип города задается именами CityType
+
+        :param name: имя поля SECTOR_DTYPE
+        :param value: скаляр или массив по секторам
+        """
+        if name == "city_type":
+            names = np.asarray(value)
+            codes = np.zeros(names.shape, dtype=np.uint8)
+            for code, city_type in enumerate(CITY_TYPES):
+                codes[names == city_type] = code
+            known = np.isin(names, CITY_TYPES)
+            if not known.all():
+                raise KeyError(str(names[~known].flat[0]))
+            value = codes
+        self.sectors[name] = value
+
+    def city_type(self):
+        """
+        Имена CityType по секторам, как ожидает LEBBatch
+        """
+        return np.asarray(CITY_TYPES)[self.sectors["city_type"]]
+
+    def compute_EIRP(self):
+        """
+        Эквивалентная изотропно излучаемая мощность ЭИИМ каждого сектора
+        """
+        s = self.sectors
+        return self.leb.compute_EIRP(
+            s["transmitter_output_power"],
+            s["transmitter_antenna_gain"],
+            s["transmission_antenna_feeder_loss"],
+            s["duplex_filter_loss"],
+            s["diplexer_loss"],
+            s["radiated_power_reduction_coefficient"]
+        )
+
+    def compute_antenna_height_correction_factor(self):
+        s = self.sectors
+        return self.leb.compute_antenna_height_correction_factor(
+            s["radio_frequency"], s["receiving_antenna_height"], self.city_type())
+
+    def COST231_Hata(self, distance_between_antennas):
+        """
+        Потери сигнала от каждого сектора до абонентской станции
+        на расстоянии distance_between_antennas (скаляр или массив по секторам)
+
+        :param distance_between_antennas: расстояние между антеннами, км
+        """
+        s = self.sectors
+        return self.leb.COST231_Hata(
+            self.compute_antenna_height_correction_factor(),
+            s["radio_frequency"],
+            s["transmitting_antenna_height"],
+            distance_between_antennas,
+            self.city_type()
+        )
+
+    def COST231_Hata_distance(self, path_loss):
+        """
+        Расстояние, на котором потери от каждого сектора равны path_loss
+
+        :param path_loss: допустимые потери сигнала
+        """
+        s = self.sectors
+        return self.leb.COST231_Hata_distance(
+            self.compute_antenna_height_correction_factor(),
+            s["radio_frequency"],
+            s["transmitting_antenna_height"],
+            path_loss,
+            self.city_type()
+        )
+
+    def nsp(self):
+        """
+        NSPBatch по секторам сети; размерность кластера, число секторов
+        (обязательные) и число абонентов (по умолчанию 0) берутся из
+        общих параметров
+        """
+        s = self.sectors
+        p = self.parameters
+        missing = [key for key in NSP_PARAMETERS if key not in p]
+        if missing:
+            raise ValueError("Отсутствуют общие параметры сети: {}".format(", ".join(missing)))
+        return NSPBatch(
+            p["cell_sectors_num"],
+            s["carriers"],
+            p["cluster_dim"],
+            s["traffic_transmission_ch_num"],
+            s["call_blocking_admissible_prob"],
+            p.get("subscribers_total", 0)
+        )
+
+    def calc_telephone_load_per_sector(self):
+        """
+        Телефонная нагрузка каждого сектора по точной формуле Эрланга B
+        """
+        return self.nsp().calc_telephone_load_per_sector_erlang_b()
@@ -1,6 +1,8 @@
 import numpy as np
 import math
 
+from ftnp.erlang import erlang_b_table, erlang_b_traffic
+
 
 class NSP:
     """
@@ -74,6 +76,16 @@ class NSP:
                         (traffic_transmission_ch_num * np.pi) / 2))) - math.sqrt(np.pi / 2)
             return A
 
+    def calc_telephone_load_per_sector_erlang_b(self):
+        """
+        Расчет телефонной нагрузки на один сектор соты
+        по точной формуле Эрланга B
+        """
+        return erlang_b_traffic(
+            self.traffic_transmission_ch_num,
+            self.call_blocking_admissible_prob[0]
+        )
+
     def calc_num_of_subscibers_per_cell(self, busy_hour_activity):
         """
         Расчет количества абонентов в одной ячейке
@@ -100,3 +112,63 @@ class NSP:
         N_bc = self.calc_total_num_of_base_stations()
         R_c = math.sqrt((2/(3 / math.sqrt(3)) * (land_area / N_bc)))
         return R_c
+
+
+class NSPBatch(NSP):
+    """
+    Векторизованный расчет пространственных параметров для N сценариев.
+    Параметры конструктора - массивы одинаковой длины (или скаляры).
+    """
+
+    def calc_telephone_load_per_sector(self):
+        """
+        Расчет телефонной нагрузки на один сектор соты
+        """
+        n = np.asarray(self.traffic_transmission_ch_num, dtype=float)
+        p = np.asarray(self.call_blocking_admissible_prob[0], dtype=float)
+        scaled = p * np.sqrt((n * np.pi) / 2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            low = n * np.trunc(1 - np.sqrt(1 - scaled ** (1 / n)))
+            high = n + np.sqrt(
+                np.pi / 2 + 2 * n * np.log10(scaled)) - np.sqrt(np.pi / 2)
+        return np.where(p <= np.sqrt(2 / (n * np.pi)), low, high)
+
+    def calc_telephone_load_per_sector_erlang_b(self):
+        """
+        Расчет телефонной нагрузки на один сектор соты по формуле Эрланга B,
+        по одному значению на каждую различную пару (число каналов,
+        вероятность блокировки). Из общей таблицы erlang_b_table (с
+        относительной погрешностью не больше ErlangBTable.MAX_RELATIVE_ERROR)
+        берутся пары, строка которых уже построена или окупает свое
+        построение: различных пар с этим числом каналов не меньше
+        points (построение строки стоит points точных решений).
+        Остальные пары решаются точно.
+        """
+        n, p = np.broadcast_arrays(
+            np.asarray(self.traffic_transmission_ch_num, dtype=int),
+            np.asarray(self.call_blocking_admissible_prob[0], dtype=float)
+        )
+        # при переборе параметров пары (n, p) обычно повторяются
+        p_values, p_index = np.unique(p, return_inverse=True)
+        stride = int(n.max(initial=0)) + 1
+        pairs, pair_index = np.unique(p_index.ravel() * stride + n.ravel(), return_inverse=True)
+        n_unique, p_unique = pairs % stride, p_values[pairs // stride]
+        table = erlang_b_table()
+        inside = table.covers(n_unique, p_unique)
+        pairs_per_row = np.bincount(n_unique[inside] - 1, minlength=table.max_channels)
+        row = np.clip(n_unique - 1, 0, table.max_channels - 1)
+        use_table = inside & (table.built[row] | (pairs_per_row[row] >= table.points))
+        A = np.empty(n_unique.shape)
+        A[use_table] = table.traffic(n_unique[use_table], p_unique[use_table])
+        A[~use_table] = erlang_b_traffic(n_unique[~use_table], p_unique[~use_table])
+        return A[pair_index].reshape(n.shape)
+
+    def calc_base_station_coverage_radius(self, land_area):
+        """
+        Расчет радиуса зоны покрытия одной базовой станции
+
+        :param land_area: площадь территории, на которой проектируется сеть
+        """
+        N_bc = self.calc_total_num_of_base_stations()
+        R_c = np.sqrt((2/(3 / math.sqrt(3)) * (np.asarray(land_area) / N_bc)))
+        return R_c
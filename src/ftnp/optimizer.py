@@ -0,0 +1,83 @@
+import numpy as np
+
+from ftnp.cluster import ClusterBatch
+from ftnp.nsp import NSPBatch
+
+
+def valid_cluster_sizes(max_cluster_dim):
+    """
+    Допустимые размерности кластера C = i^2 + i*j + j^2 не больше max_cluster_dim
+    в порядке возрастания
+
+    :param max_cluster_dim: наибольшая рассматриваемая размерность кластера
+    """
+    n = int(np.sqrt(max_cluster_dim)) + 1
+    i, j = np.meshgrid(np.arange(n + 1), np.arange(n + 1))
+    sizes = (i ** 2 + i * j + j ** 2).ravel()
+    return np.unique(sizes[(sizes > 0) & (sizes <= max_cluster_dim)])
+
+
+class ClusterOptimizer:
+    """
+    Подбор наименьшей размерности кластера, при которой вероятность
+    невыполнения требований по отношению сигнал/шум не превышает
+    допустимую, для каждого варианта секторизации
+    """
+
+    def __init__(self, max_outage, max_cluster_dim=49, sectors=ClusterBatch.SECTORS):
+        """
+        :param max_outage: допустимая вероятность невыполнения требований, %
+        :param max_cluster_dim: наибольшая рассматриваемая размерность кластера
+        :param sectors: рассматриваемые числа секторов в соте
+        """
+        self.max_outage = max_outage
+        self.cluster_sizes = valid_cluster_sizes(max_cluster_dim)
+        self.sectors = tuple(sectors)
+
+    def optimize(self, tetta, signal_to_noise_ratio, one_fq_ch_bandwith):
+        """
+        Расчет для D районов за один векторизованный проход по всем
+        сочетаниям (район, число секторов, размерность кластера).
+        Возвращает словарь число секторов -> словарь массивов длины D:
+        "cluster_dim" (0, если подходящей размерности нет), "feasible",
+        "outage" и "min_bandwidth" (NaN, если подходящей размерности нет).
+
+        :param tetta: стандартное отклонение сигнала в районах
+        :param signal_to_noise_ratio: требуемое отношение сигнал/помеха в районах
+        :param one_fq_ch_bandwith: полоса частот, занимаемая одним частотным каналом
+        """
+        tetta, snr, fq_bandwidth = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(tetta, dtype=float)),
+            np.asarray(signal_to_noise_ratio, dtype=float),
+            np.asarray(one_fq_ch_bandwith, dtype=float)
+        )
+        shape = (len(tetta), len(self.sectors), len(self.cluster_sizes))
+        district, sector, size = np.indices(shape)
+        sectors = np.asarray(self.sectors)[sector]
+        cluster_dim = self.cluster_sizes[size]
+        outage = ClusterBatch(
+            cluster_dim.ravel(),
+            tetta[district].ravel(),
+            sectors.ravel(),
+            snr[district].ravel()
+        ).get_signal_to_noise_failure_probability().reshape(shape)
+
+        acceptable = outage <= self.max_outage
+        feasible = acceptable.any(axis=2)
+        first = acceptable.argmax(axis=2)
+        best_dim = np.where(feasible, self.cluster_sizes[first], 0)
+        best_outage = np.where(
+            feasible, np.take_along_axis(outage, first[..., None], axis=2)[..., 0], np.nan)
+        bandwidth = NSPBatch(
+            np.asarray(self.sectors), None, best_dim, None, None, None
+        ).calc_minimum_bandwidth(fq_bandwidth[:, None])
+        bandwidth = np.where(feasible, bandwidth, np.nan)
+        return {
+            m: {
+                "cluster_dim": best_dim[:, k],
+                "feasible": feasible[:, k],
+                "outage": best_outage[:, k],
+                "min_bandwidth": bandwidth[:, k],
+            }
+            for k, m in enumerate(self.sectors)
+        }
@@ -0,0 +1,153 @@
+import abc
+import functools
+
+import numpy as np
+
+from ftnp.leb import LEBBatch
+
+# имя -> класс модели распространения
+MODELS = {}
+
+
+def register_model(cls):
+    """
+    Декоратор класса модели распространения: модель становится
+    доступной в path_loss по имени cls.name
+    """
+    MODELS[cls.name] = cls
+    return cls
+
+
+class PathLoss:
+    """
+    Потери при распространении для заданных частоты, высот и типа
+    местности: L(d) = intercept + slope * log10(d), d в км.
+    Коэффициенты - скаляры или массивы по площадкам.
+    """
+
+    def __init__(self, intercept, slope):
+        self.intercept = intercept
+        self.slope = slope
+
+    def loss(self, distance):
+        """
+        Потери на расстоянии distance, км
+
+        :param distance: расстояние, скаляр или массив
+        """
+        return self.intercept + self.slope * np.log10(distance)
+
+    def distance(self, path_loss):
+        """
+        Расстояние, км, на котором потери равны path_loss
+
+        :param path_loss: допустимые потери сигнала
+        """
+        return 10 ** ((path_loss - self.intercept) / self.slope)
+
+
+class PropagationModel(abc.ABC):
+    """
+    Модель распространения, потери которой - аффинная функция log10(d).
+    Наследники вычисляют коэффициенты по частоте (МГц), высотам
+    передающей и приемной антенн (м) и типу местности (имя CityType);
+    наследник без coefficients не создается (TypeError).
+    """
+
+    name = None
+
+    @abc.abstractmethod
+    def coefficients(self, radio_frequency, transmitting_antenna_height, receiving_antenna_height, city_type):
+        """
+        Коэффициенты (потери на 1 км, наклон на декаду расстояния)
+        """
+
+
+def _hata_height_terms(radio_frequency, transmitting_antenna_height, receiving_antenna_height, city_type):
+    leb = LEBBatch()
+    correction = leb.compute_antenna_height_correction_factor(
+        radio_frequency, receiving_antenna_height, city_type)
+    log_h = np.log10(transmitting_antenna_height)
+    return correction, log_h, 44.9 - 6.55 * log_h
+
+
+@register_model
+class OkumuraHata(PropagationModel):
+    """
+    Модель Окумура-Хата для городской застройки (150-1500 МГц)
+    """
+
+    name = "Okumura_Hata"
+
+    def coefficients(self, radio_frequency, transmitting_antenna_height, receiving_antenna_height, city_type):
+        correction, log_h, slope = _hata_height_terms(
+            radio_frequency, transmitting_antenna_height, receiving_antenna_height, city_type)
+        intercept = 69.55 + 26.16 * np.log10(radio_frequency) - 13.82 * log_h - correction
+        return intercept, slope
+
+
+@register_model
+class COST231Hata(PropagationModel):
+    """
+    Модель COST231-Хата (1500-2000 МГц), совпадает с LEB.COST231_Hata
+    """
+
+    name = "COST231_Hata"
+
+    def coefficients(self, radio_frequency, transmitting_antenna_height, receiving_antenna_height, city_type):
+        correction, log_h, slope = _hata_height_terms(
+            radio_frequency, transmitting_antenna_height, receiving_antenna_height, city_type)
+        C = np.where(LEBBatch.is_large_city(city_type), 3, 0)
+        intercept = 46.3 + 33.91 * np.log10(radio_frequency) - 13.821 * log_h - correction + C
+        return intercept, slope
+
+
+@register_model
+class FreeSpace(PropagationModel):
+    """
+    Потери в свободном пространстве: 32.44 + 20 lg f + 20 lg d
+    """
+
+    name = "free_space"
+
+    def coefficients(self, radio_frequency, transmitting_antenna_height, receiving_antenna_height, city_type):
+        intercept = 32.44 + 20 * np.log10(radio_frequency)
+        return intercept, np.full(np.shape(intercept), 20.0)
+
+
+@register_model
+class TwoRay(PropagationModel):
+    """
+    Двухлучевая модель над плоской землей: 40 lg d - 20 lg hпрд - 20 lg hпрм (d в м)
+    """
+
+    name = "two_ray"
+
+    def coefficients(self, radio_frequency, transmitting_antenna_height, receiving_antenna_height, city_type):
+        intercept = 120 - 20 * np.log10(transmitting_antenna_height) -\
+            20 * np.log10(receiving_antenna_height)
+        return intercept, np.full(np.shape(intercept), 40.0)
+
+
+def path_loss(model, radio_frequency, transmitting_antenna_height, receiving_antenna_height, city_type):
+    """
+    Потери PathLoss модели model (имя из MODELS) для площадок с заданными
+    параметрами. Для скалярных параметров результат кэшируется.
+
+    :param model: имя модели распространения
+    :param radio_frequency: частота радиосигнала, МГц
+    :param transmitting_antenna_height: высота передающей антенны, м
+    :param receiving_antenna_height: высота приемной антенны, м
+    :param city_type: размер города, имя CityType или массив имен
+    """
+    args = (radio_frequency, transmitting_antenna_height, receiving_antenna_height, city_type)
+    if all(np.ndim(arg) == 0 for arg in args):
+        return _scalar_path_loss(model, *(
+            str(arg) if k == 3 else float(arg) for k, arg in enumerate(args)))
+    return PathLoss(*MODELS[model]().coefficients(*args))
+
+
+@functools.lru_cache(maxsize=1024)
+def _scalar_path_loss(model, *args):
+    intercept, slope = MODELS[model]().coefficients(*args)
+    return PathLoss(float(intercept), float(slope))
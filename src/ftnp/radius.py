@@ -0,0 +1,49 @@
+import numpy as np
+
+from ftnp.leb import LEBBatch
+
+
+def cell_radius(
+    total_losses,
+    antenna_height_correction_factor,
+    radio_frequency,
+    transmitting_antenna_height,
+    city_type,
+    capacity_radius,
+):
+    """
+    Радиус соты, допускаемый энергетическим бюджетом линий, для N площадок.
+    Расстояния, на которых потери COST231-Хата равны допустимым потерям
+    (LEB.compute_total_losses) в направлениях БС-АС и АС-БС, ограничивают
+    радиус покрытия; итоговый радиус - меньший из радиуса покрытия и
+    радиуса по емкости (NSP.calc_base_station_coverage_radius).
+    Возвращает словарь массивов длины N: "downlink", "uplink", "coverage",
+    "capacity", "radius" и "coverage_limited" (True, если радиус
+    ограничен покрытием, а не емкостью).
+
+    :param total_losses: допустимые потери, массив формы (N, 2) (БС-АС, АС-БС)
+    :param antenna_height_correction_factor:
+        Поправочный коэффициент для высоты антенны подвижного объекта
+    :param radio_frequency: частота радиосигнала
+    :param transmitting_antenna_height: высота передающей антенны
+    :param city_type: размер города, имя CityType или массив имен
+    :param capacity_radius: радиус зоны обслуживания по емкости
+    """
+    losses = np.asarray(total_losses, dtype=float)
+    downlink, uplink = LEBBatch().COST231_Hata_distance(
+        np.asarray(antenna_height_correction_factor)[..., None],
+        np.asarray(radio_frequency)[..., None],
+        np.asarray(transmitting_antenna_height)[..., None],
+        losses,
+        np.asarray(city_type)[..., None]
+    ).T
+    coverage = np.minimum(downlink, uplink)
+    capacity = np.broadcast_to(np.asarray(capacity_radius, dtype=float), coverage.shape)
+    return {
+        "downlink": downlink,
+        "uplink": uplink,
+        "coverage": coverage,
+        "capacity": capacity,
+        "radius": np.minimum(coverage, capacity),
+        "coverage_limited": coverage < capacity,
+    }
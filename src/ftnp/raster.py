@@ -0,0 +1,174 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from ftnp.propagation import path_loss
+
+
+# слой -> тип данных растра
+LAYERS = {
+    "path_loss": np.float32,
+    "received_power": np.float32,
+    "coverage": np.uint8,
+    "server": np.int32,
+}
+
+# растр, с которым работает процесс пула, задается в _init_worker
+_worker_state = {}
+
+
+class CoverageRaster:
+    """
+    Растровый расчет покрытия для набора площадок по модели
+    распространения из ftnp.propagation (по умолчанию COST231-Хата).
+    Для каждого пиксела определяется наилучшая площадка (наибольшая
+    принимаемая мощность), потери до нее, принимаемая мощность
+    (ЭИИМ минус потери) и признак покрытия относительно необходимой
+    мощности полезного сигнала. Растр считается плитками фиксированного
+    размера и записывается в файлы .npy, отображаемые в память, поэтому
+    объем памяти не зависит от размера растра.
+    """
+
+    def __init__(
+        self,
+        sites_x,
+        sites_y,
+        eirp,
+        useful_signal_required_power,
+        radio_frequency,
+        transmitting_antenna_height,
+        receiving_antenna_height,
+        city_type,
+        max_radius=10.0,
+        min_distance=0.02,
+        propagation_model="COST231_Hata",
+    ):
+        """
+        :param sites_x: координаты площадок по оси x, км
+        :param sites_y: координаты площадок по оси y, км
+        :param eirp: ЭИИМ площадок (LEB.compute_EIRP), скаляр или массив
+        :param useful_signal_required_power:
+            необходимая мощность полезного сигнала
+            (LEB.compute_useful_signal_required_power), скаляр или массив
+        :param radio_frequency: частота радиосигнала, скаляр или массив
+        :param transmitting_antenna_height: высота передающей антенны, скаляр или массив
+        :param receiving_antenna_height: высота приемной антенны, скаляр или массив
+        :param city_type: размер города, имя CityType или массив имен
+        :param max_radius: радиус, за пределами которого площадка не учитывается, км
+        :param min_distance: наименьшее расстояние для модели распространения, км
+        :param propagation_model: имя модели распространения (ftnp.propagation.MODELS)
+        """
+        self.sites = np.column_stack((
+            np.asarray(sites_x, dtype=float), np.asarray(sites_y, dtype=float)))
+        n = len(self.sites)
+        loss = path_loss(
+            propagation_model,
+            np.broadcast_to(np.asarray(radio_frequency, dtype=float), (n,)),
+            np.broadcast_to(np.asarray(transmitting_antenna_height, dtype=float), (n,)),
+            np.broadcast_to(np.asarray(receiving_antenna_height, dtype=float), (n,)),
+            np.broadcast_to(np.asarray(city_type), (n,))
+        )
+        # L(d) = L(1 км) + наклон * log10(d)
+        self.loss_at_1km = loss.intercept
+        self.loss_slope = loss.slope
+        self.eirp = np.broadcast_to(np.asarray(eirp, dtype=float), (n,))
+        self.required_power = np.broadcast_to(
+            np.asarray(useful_signal_required_power, dtype=float), (n,))
+        self.max_radius = max_radius
+        self.min_distance = min_distance
+        self.tree = cKDTree(self.sites)
+
+    def render_tile(self, x0, y0, pixel_size, rows, cols):
+        """
+        Слои растра для одной плитки, возвращает словарь слой -> массив (rows, cols)
+
+        :param x0: координата x центра левого верхнего пиксела плитки, км
+        :param y0: координата y центра левого верхнего пиксела плитки, км
+        :param pixel_size: размер пиксела, км
+        :param rows: число строк плитки
+        :param cols: число столбцов плитки
+        """
+        x = x0 + pixel_size * np.arange(cols)
+        y = y0 - pixel_size * np.arange(rows)
+        best_power = np.full((rows, cols), -np.inf)
+        best_loss = np.full((rows, cols), np.nan)
+        server = np.full((rows, cols), -1, dtype=np.int32)
+
+        center = (x[0] + x[-1]) / 2, (y[0] + y[-1]) / 2
+        half_diagonal = np.hypot(x[-1] - x[0], y[-1] - y[0]) / 2
+        candidates = self.tree.query_ball_point(center, self.max_radius + half_diagonal)
+        for site in sorted(candidates):
+            dx = (x - self.sites[site, 0])[None, :]
+            dy = (y - self.sites[site, 1])[:, None]
+            distance = np.sqrt(dx ** 2 + dy ** 2)
+            loss = self.loss_at_1km[site] + self.loss_slope[site] *\
+                np.log10(np.maximum(distance, self.min_distance))
+            power = self.eirp[site] - loss
+            better = (power > best_power) & (distance <= self.max_radius)
+            best_power = np.where(better, power, best_power)
+            best_loss = np.where(better, loss, best_loss)
+            server[better] = site
+
+        served = server >= 0
+        required = np.where(served, self.required_power[np.maximum(server, 0)], np.inf)
+        return {
+            "path_loss": best_loss,
+            "received_power": np.where(served, best_power, np.nan),
+            "coverage": best_power >= required,
+            "server": server,
+        }
+
+    def compute(self, directory, origin, pixel_size, shape, tile=512, workers=None):
+        """
+        Расчет растра плитками tile x tile с записью слоев в файлы
+        <directory>/<слой>.npy. Плитки считаются параллельно в пуле
+        из workers процессов (по умолчанию - по числу ядер).
+        Возвращает словарь слой -> массив, отображаемый в память только для чтения.
+
+        :param directory: каталог для файлов слоев
+        :param origin: координаты (x, y) центра левого верхнего пиксела, км
+        :param pixel_size: размер пиксела, км
+        :param shape: размер растра (строки, столбцы)
+        :param tile: сторона плитки в пикселах
+        :param workers: число процессов
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = {name: os.path.join(directory, name + ".npy") for name in LAYERS}
+        for name, dtype in LAYERS.items():
+            np.lib.format.open_memmap(paths[name], mode="w+", dtype=dtype, shape=tuple(shape)).flush()
+
+        rows, cols = shape
+        tasks = [
+            (origin, pixel_size, r, c, min(tile, rows - r), min(tile, cols - c))
+            for r in range(0, rows, tile)
+            for c in range(0, cols, tile)
+        ]
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            _init_worker(self, paths)
+            for task in tasks:
+                _render_tile_task(task)
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(self, paths)) as pool:
+                for _ in pool.map(_render_tile_task, tasks, chunksize=4):
+                    pass
+        _worker_state.clear()
+        return {name: np.load(path, mmap_mode="r") for name, path in paths.items()}
+
+
+def _init_worker(raster, paths):
+    _worker_state["raster"] = raster
+    _worker_state["layers"] = {
+        name: np.load(path, mmap_mode="r+") for name, path in paths.items()}
+
+
+def _render_tile_task(task):
+    (x0, y0), pixel_size, r, c, rows, cols = task
+    raster = _worker_state["raster"]
+    tile = raster.render_tile(
+        x0 + c * pixel_size, y0 - r * pixel_size, pixel_size, rows, cols)
+    for name, layer in _worker_state["layers"].items():
+        layer[r:r + rows, c:c + cols] = tile[name]
+        layer.flush()
@@ -0,0 +1,134 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.special import gammaincc, gammaln
+
+from ftnp.erlang import erlang_b, erlang_b_traffic
+
+HOURS = 24
+
+
+def erlang_b_closed_form(traffic, channels):
+    """
+    Формула Эрланга B через неполную гамма-функцию:
+    B = A^n e^-A / n! / Q(n + 1, A), без рекурсии по числу каналов.
+    При исчезновении порядка (сильная перегрузка) значения
+    досчитываются рекурсией erlang_b.
+
+    :param traffic: поступающая нагрузка, Эрл
+    :param channels: число каналов
+    """
+    a, n = np.broadcast_arrays(np.asarray(traffic, dtype=float), np.asarray(channels, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore", under="ignore"):
+        b = np.exp(n * np.log(a) - gammaln(n + 1) - a) / gammaincc(n + 1, a)
+    b = np.where(a > 0, b, 0.0)
+    bad = ~np.isfinite(b)
+    if bad.any():
+        b[bad] = erlang_b(a[bad], n[bad].astype(int))
+    return b
+
+
+class TrafficProfile:
+    """
+    Суточный профиль нагрузки секторов: по числу абонентов сектора и
+    удельной активности абонента по часам (массивы секторы x 24) для
+    каждого часа определяются поступающая нагрузка, необходимое число
+    каналов и несущих для заданной вероятности блокировки и, если
+    задано число установленных каналов, вероятность блокировки.
+    Секторы обрабатываются порциями по chunk_size в пуле потоков,
+    поэтому промежуточная память ограничена размером порций.
+    """
+
+    def __init__(self, blocking=0.02, channels_per_carrier=8, chunk_size=32768, workers=None):
+        """
+        :param blocking: допустимая вероятность блокировки
+        :param channels_per_carrier: число разговорных каналов на одну несущую
+        :param chunk_size: число секторов в порции
+        :param workers: число потоков, по умолчанию - по числу ядер
+        """
+        self.blocking = blocking
+        self.channels_per_carrier = channels_per_carrier
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        # capacity[n - 1] - наибольшая нагрузка, которую n каналов
+        # обслуживают с вероятностью блокировки не больше blocking
+        self.capacity = np.empty(0)
+
+    def _extend_capacity(self, load):
+        n = max(len(self.capacity), 64)
+        while len(self.capacity) == 0 or self.capacity[-1] < load:
+            self.capacity = erlang_b_traffic(np.arange(1, n + 1), self.blocking)
+            n *= 2
+
+    def required_channels(self, load):
+        """
+        Наименьшее число каналов, обслуживающих нагрузку load
+        с вероятностью блокировки не больше blocking
+
+        :param load: поступающая нагрузка, Эрл, скаляр или массив
+        """
+        load = np.asarray(load, dtype=float)
+        self._extend_capacity(load.max(initial=0))
+        return np.where(load > 0, np.searchsorted(self.capacity, load) + 1, 0)
+
+    def evaluate(self, subscribers, activity, channels=None, out=None):
+        """
+        Почасовой расчет для S секторов. Возвращает словарь:
+        "load" (Эрл, float32), "required_channels" и "required_carriers"
+        (uint16), при заданном channels - "blocking" (float32), все формы
+        (S, 24); "busy_hour" (int8) и "busy_hour_load" (float32) формы (S,);
+        "network_load" - суммарная нагрузка сети по часам, "peak_hour"
+        и "peak_load" - час наибольшей нагрузки сети и нагрузка в этот час.
+
+        :param subscribers: число абонентов каждого сектора, (S,)
+        :param activity: активность одного абонента по часам, Эрл, (S, 24) или (24,)
+        :param channels: установленное число каналов каждого сектора, (S,)
+        :param out: словарь заранее выделенных массивов для части результатов
+            (например, np.lib.format.open_memmap), остальные создаются
+        """
+        subscribers = np.asarray(subscribers, dtype=float)
+        activity = np.asarray(activity, dtype=float)
+        if activity.shape[-1] != HOURS:
+            raise ValueError("Профиль активности должен содержать {} значений".format(HOURS))
+        s = len(subscribers)
+        shapes = {
+            "load": ((s, HOURS), np.float32),
+            "required_channels": ((s, HOURS), np.uint16),
+            "required_carriers": ((s, HOURS), np.uint16),
+            "busy_hour": ((s,), np.int8),
+            "busy_hour_load": ((s,), np.float32),
+        }
+        if channels is not None:
+            shapes["blocking"] = ((s, HOURS), np.float32)
+        result = dict(out or {})
+        for name, (shape, dtype) in shapes.items():
+            if name not in result:
+                result[name] = np.empty(shape, dtype=dtype)
+
+        # таблица емкости строится заранее, потоки ее только читают
+        peak_activity = activity.max(axis=-1)
+        self._extend_capacity((subscribers * peak_activity).max(initial=0))
+
+        def run(start):
+            stop = min(start + self.chunk_size, s)
+            rows = slice(start, stop)
+            load = subscribers[rows, None] * (activity[rows] if activity.ndim == 2 else activity)
+            required = self.required_channels(load)
+            result["load"][rows] = load
+            result["required_channels"][rows] = required
+            result["required_carriers"][rows] = -(-required // self.channels_per_carrier)
+            busy = load.argmax(axis=1)
+            result["busy_hour"][rows] = busy
+            result["busy_hour_load"][rows] = load[np.arange(stop - start), busy]
+            if channels is not None:
+                result["blocking"][rows] = erlang_b_closed_form(
+                    load, np.asarray(channels)[rows, None])
+            return load.sum(axis=0)
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            network_load = sum(pool.map(run, range(0, s, self.chunk_size)), np.zeros(HOURS))
+        result["network_load"] = network_load
+        result["peak_hour"] = int(network_load.argmax())
+        result["peak_load"] = float(network_load.max())
+        return result
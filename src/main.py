@@ -1,4 +1,6 @@
+import argparse
 import json
+import sys
 from app import App
 from app.controller import ConsoleController
 
@@ -45,7 +47,86 @@ def main():
     'transmitting_antenna_height' - высота передающей антенны\n
     'distance_between_antennas' - расстояние между антеннами\n
     'city_type' - размер города\n
+
+    С ключом --jsonl сценарии читаются построчно из файла JSONL
+    (или stdin при значении "-") и считаются порциями по --batch-size,
+    по одной строке результата на сценарий выводится в --output
+    (по умолчанию stdout).
+
+    С ключом --columnar отчеты потокового расчета записываются не в JSONL,
+    а по столбцам в указанный каталог (см. app.columnar), в --output
+    выводятся только строки с ошибками. Ключ --convert SRC DST
+    преобразует JSON/JSONL в столбцы и обратно (направление - по тому,
+    является ли SRC каталогом).
+
+    С ключом --sweep выполняется перебор параметров по файлу описания
+    (см. app.sweep.Sweep.from_file), результаты по шардам записываются
+    в каталог --output-dir (в формате --shard-format: npz или по столбцам).
+
+    С ключом --serve запускается сервер расчета отчетов (app.service):
+    адрес вида HOST:PORT или unix:PATH; POST /report, POST /outage,
+    GET /metrics.
+
+    С ключом --sensitivity для сценариев из --jsonl (или initial.json)
+    считаются производные и эластичности записей отчета по непрерывным
+    исходным данным (см. app.sensitivity.sensitivity) и записываются
+    в указанный файл .npz.
+
+    С ключом --profile по окончании расчета в stderr выводятся время,
+    число вызовов и выделенная память по этапам, с ключом --trace -
+    события записываются в файл формата Chrome trace.
+
+    С ключом --cache отчеты сохраняются в файл хранилища и при повторном
+    расчете тех же исходных данных берутся из него; объем хранилища
+    ограничивается --cache-size (МиБ), статистика выводится в stderr.
     """
+    args = parse_args()
+    if args.profile or args.trace:
+        from app.profiling import profiler
+
+        profiler.enable(memory=args.profile, trace=args.trace is not None)
+        try:
+            run(args)
+        finally:
+            profiler.disable()
+            if args.trace:
+                profiler.save_trace(args.trace)
+            if args.profile:
+                print(profiler.summary(), file=sys.stderr)
+    else:
+        run(args)
+
+
+def run(args):
+    cache = None
+    if args.cache is not None:
+        from app.cache import ReportCache
+
+        cache = ReportCache(args.cache, int(args.cache_size * 2 ** 20))
+    try:
+        run_mode(args, cache)
+    finally:
+        if cache is not None:
+            print("Хранилище отчетов: {}".format(cache.stats()), file=sys.stderr)
+            cache.close()
+
+
+def run_mode(args, cache):
+    if args.serve is not None:
+        run_serve(args)
+        return
+    if args.sensitivity is not None:
+        run_sensitivity(args)
+        return
+    if args.convert is not None:
+        run_convert(args)
+        return
+    if args.jsonl is not None:
+        run_jsonl(args, cache)
+        return
+    if args.sweep is not None:
+        run_sweep(args)
+        return
 
     with open("./initial.json") as f:
         initial = json.load(f)
@@ -66,9 +147,113 @@ def main():
     )
     leb = LEB()
     mne = MobileNetworkEngineer(initial, cluster_calculator, nsp, leb)
-    app = App(mne, ConsoleView(), ConsoleController())
+    app = App(mne, ConsoleView(), ConsoleController(), cache)
     app.run()
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Расчет сети начального приближения стандарта LTE")
+    parser.add_argument("--jsonl", metavar="INPUT", help="файл JSONL со сценариями, '-' - stdin")
+    parser.add_argument("--output", metavar="OUTPUT", default="-", help="файл результатов JSONL, '-' - stdout")
+    parser.add_argument("--batch-size", type=int, default=1024, help="число сценариев в порции")
+    parser.add_argument("--columnar", metavar="DIR", help="каталог результатов по столбцам")
+    parser.add_argument("--convert", nargs=2, metavar=("SRC", "DST"), help="преобразование JSON <-> столбцы")
+    parser.add_argument("--sweep", metavar="SPEC", help="файл описания перебора параметров")
+    parser.add_argument("--output-dir", default="./sweep", help="каталог результатов перебора")
+    parser.add_argument("--shard-format", choices=("npz", "columnar"), default="npz", help="формат шардов")
+    parser.add_argument("--shard-size", type=int, default=100000, help="число сценариев в шарде")
+    parser.add_argument("--workers", type=int, help="число процессов, по умолчанию - по числу ядер")
+    parser.add_argument("--machine", type=int, default=0, help="номер машины, делящей перебор")
+    parser.add_argument("--machines", type=int, default=1, help="число машин, делящих перебор")
+    parser.add_argument("--serve", metavar="ADDRESS", help="адрес сервера: HOST:PORT или unix:PATH")
+    parser.add_argument("--sensitivity", metavar="FILE", help="файл .npz производных и эластичностей")
+    parser.add_argument("--profile", action="store_true", help="вывести замеры по этапам в stderr")
+    parser.add_argument("--trace", metavar="FILE", help="файл событий в формате Chrome trace")
+    parser.add_argument("--cache", metavar="PATH", help="файл хранилища отчетов")
+    parser.add_argument("--cache-size", type=float, default=256, help="наибольший объем хранилища, МиБ")
+    return parser.parse_args(argv)
+
+
+def run_jsonl(args, cache=None):
+    from app.stream import run_stream, run_stream_columnar
+
+    source = sys.stdin if args.jsonl == "-" else open(args.jsonl, encoding="utf8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf8")
+    try:
+        if args.columnar is not None:
+            run_stream_columnar(source, args.columnar, sink, args.batch_size, cache)
+        else:
+            run_stream(source, sink, args.batch_size, cache)
+    finally:
+        for stream in (source, sink):
+            if stream not in (sys.stdin, sys.stdout):
+                stream.close()
+
+
+def run_sweep(args):
+    from app.sweep import Sweep
+
+    sweep = Sweep.from_file(args.sweep, args.shard_size)
+    done = sweep.run(
+        args.output_dir, args.workers, args.machine, args.machines,
+        output_format=args.shard_format)
+    print("Посчитано шардов: {} из {}".format(done, sweep.shard_count))
+    for shard, error in sorted(sweep.failures.items()):
+        print("Шард {}: {}".format(shard, error), file=sys.stderr)
+
+
+def run_serve(args):
+    import asyncio
+    from app.service import ReportService
+
+    service = ReportService(max_batch=args.batch_size, workers=args.workers)
+    if args.serve.startswith("unix:"):
+        coroutine = service.serve(path=args.serve[len("unix:"):])
+    else:
+        host, _, port = args.serve.rpartition(":")
+        coroutine = service.serve(host or "127.0.0.1", int(port))
+    try:
+        asyncio.run(coroutine)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_convert(args):
+    import os
+    from app.columnar import columnar_to_json, json_to_columnar
+
+    source, target = args.convert
+    if os.path.isdir(source):
+        columnar_to_json(source, target)
+    else:
+        json_to_columnar(source, target)
+
+
+def run_sensitivity(args):
+    import numpy as np
+    from app.model import rows_to_columns
+    from app.sensitivity import sensitivity
+    from app.stream import parse_scenario
+
+    if args.jsonl is None:
+        with open("./initial.json") as f:
+            scenarios = [json.load(f)]
+    else:
+        source = sys.stdin if args.jsonl == "-" else open(args.jsonl, encoding="utf8")
+        try:
+            scenarios = [parse_scenario(line) for line in source if line.strip()]
+        finally:
+            if source is not sys.stdin:
+                source.close()
+    result = sensitivity(rows_to_columns(scenarios))
+    np.savez(
+        args.sensitivity,
+        inputs=np.array(result["inputs"]),
+        outputs=np.array(result["outputs"]),
+        jacobian=result["jacobian"],
+        elasticity=result["elasticity"],
+    )
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# пакеты ftnp, app и bench лежат в src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,54 @@
+import copy
+
+from app.model import MobileNetworkEngineer, rows_to_columns
+from ftnp.cluster import Cluster
+from ftnp.leb import LEB, CityType
+from ftnp.nsp import NSP
+
+# исходные данные, от которых отталкиваются тесты
+INITIAL = {
+    "cluster_dim": 7, "tetta": 6, "cell_sectors_num": 3, "signal_to_noise_ratio": 9,
+    "sector_radio_chan": 2, "traffic_transmission_ch_num": 20,
+    "call_blocking_admissible_prob": 0.02, "subscribers_total": 500000,
+    "land_area": 400, "one_fq_ch_bandwith": 0.2, "busy_hour_activity": 0.025,
+    "conversation_ch_num_per_carrier": 8, "building_penetraition_loses": 10,
+    "subscriber_body_loses": 3, "location_coverage": 8,
+    "eqv_isotropically_radiated_pow": [55, 23], "useful_signal_strength": [-110, -105],
+    "transmitter_output_power": 43, "transmitter_antenna_gain": 17,
+    "transmission_antenna_feeder_loss": -3, "duplex_filter_loss": -1, "diplexer_loss": -0.5,
+    "radiated_power_reduction_coefficient": 0, "bandwidth": 200000,
+    "power_to_noise_power_ratio": 9, "receiver_noise_figure": 5,
+    "radio_frequency": 1800, "receiving_antenna_height": 1.5,
+    "transmitting_antenna_height": 30, "distance_between_antennas": 2, "city_type": "LARGE",
+}
+
+SECTORS = (1, 3, 6)
+CITY_TYPES = tuple(t.name for t in CityType)
+
+
+def scenario(**changes):
+    """
+    Копия INITIAL с измененными исходными данными
+    """
+    i = copy.deepcopy(INITIAL)
+    i.update(changes)
+    return i
+
+
+def scalar_engineer(i):
+    """
+    MobileNetworkEngineer для одного сценария, как в main.py
+    """
+    cluster = Cluster(i["cluster_dim"], i["tetta"], i["cell_sectors_num"], i["signal_to_noise_ratio"])
+    nsp = NSP(
+        i["cell_sectors_num"], i["sector_radio_chan"], i["cluster_dim"],
+        i["traffic_transmission_ch_num"], i["call_blocking_admissible_prob"],
+        i["subscribers_total"])
+    return MobileNetworkEngineer(i, cluster, nsp, LEB())
+
+
+def batch_engineer(rows):
+    """
+    Пакетный MobileNetworkEngineer для списка сценариев
+    """
+    return MobileNetworkEngineer.from_columns(rows_to_columns(rows))
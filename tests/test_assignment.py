@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from ftnp.assignment import ChannelAssignment
+from ftnp.layout import SiteLayout
+
+
+class ChannelAssignmentTest(unittest.TestCase):
+
+    def setUp(self):
+        self.layout = SiteLayout.hexagonal(8, 8, 1.0, 3)
+        rng = np.random.default_rng(1)
+        self.assignment = ChannelAssignment(self.layout, rng.integers(1, 4, 8 * 8 * 3))
+
+    def assertComplete(self, assignment):
+        assigned = np.count_nonzero(assignment.channels >= 0, axis=1)
+        np.testing.assert_array_equal(assigned, assignment.demand)
+        self.assertEqual(assignment.violations(), 0)
+
+    def test_assign(self):
+        self.assignment.assign()
+        self.assertComplete(self.assignment)
+
+    def test_reassign(self):
+        """
+        После перемещения площадок и роста спроса ограничения выполняются,
+        каналы остальных секторов не меняются
+        """
+        a = self.assignment
+        a.assign()
+        before = a.channels.copy()
+        sites = [9, 27]
+        self.layout.x[sites] += 0.3
+        a.reassign(sites, demand=np.full(len(sites) * 3, 5))
+        self.assertComplete(a)
+        other = np.setdiff1d(np.arange(len(a.demand)), (np.array(sites)[:, None] * 3 + np.arange(3)).ravel())
+        np.testing.assert_array_equal(a.channels[other, :before.shape[1]], before[other])
+
+    def test_update_constraints(self):
+        """
+        Локальный пересчет графа ограничений совпадает с полным
+        """
+        a = self.assignment
+        sites = [9, 27, 28]
+        self.layout.x[sites] += [0.3, 1.7, -2.2]
+        self.layout.y[sites] -= [0.5, 0.0, 1.1]
+        a.update_constraints(sites)
+        local = (a.neighbors.copy(), a.separation.copy(), a.indptr.copy())
+        a.build_constraints()
+        np.testing.assert_array_equal(local[2], a.indptr)
+        for s in range(len(a.demand)):
+            start, stop = a.indptr[s], a.indptr[s + 1]
+            self.assertEqual(
+                sorted(zip(local[0][start:stop], local[1][start:stop])),
+                sorted(zip(a.neighbors[start:stop], a.separation[start:stop])))
+
+
+if __name__ == "__main__":
+    unittest.main()
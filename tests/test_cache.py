@@ -0,0 +1,135 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import app.cache
+from app.cache import CODE_PACKAGES, SQL_CHUNK, ReportCache, code_version, scenario_key
+from app.stream import iter_records, run_stream
+from tests.helpers import scenario
+
+
+class ReportCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "cache.db")
+
+    def open(self, **kwargs):
+        cache = ReportCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_hit_and_miss(self):
+        cache = self.open()
+        self.assertIsNone(cache.get(scenario()))
+        cache.put(scenario(), {"value": 1.5})
+        self.assertEqual(cache.get(scenario()), {"value": 1.5})
+        # целые и дробные значения исходных данных дают один ключ
+        self.assertEqual(cache.get(scenario(tetta=6.0)), {"value": 1.5})
+        self.assertIsNone(cache.get(scenario(tetta=7)))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (2, 2, 1))
+
+    def test_get_many(self):
+        """
+        Порядок и повторы сохраняются, ключи запрашиваются порциями
+        """
+        cache = self.open()
+        stored = [scenario(tetta=6 + k / 100) for k in range(SQL_CHUNK + 20)]
+        cache.put_many([(i, {"k": k}) for k, i in enumerate(stored)])
+        query = stored[::-1] + [scenario(tetta=100), stored[3]]
+        reports = cache.get_many(query)
+        expected = [{"k": k} for k in range(len(stored))][::-1] + [None, {"k": 3}]
+        self.assertEqual(reports, expected)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (len(stored) + 1, 1))
+
+    def test_replace_keeps_size(self):
+        cache = self.open()
+        cache.put(scenario(), {"value": 1})
+        size = cache.stats()["bytes"]
+        cache.put(scenario(), {"value": 2})
+        self.assertEqual(cache.stats()["bytes"], size)
+        self.assertEqual(cache.get(scenario()), {"value": 2})
+
+    def test_eviction(self):
+        """
+        При переполнении вытесняются давно не использованные отчеты
+        """
+        report = {"value": "x" * 100}
+        size = len(json.dumps(report).encode("utf8"))
+        cache = self.open(max_bytes=3 * size)
+        first, second, third, fourth = (scenario(tetta=t) for t in (1, 2, 3, 4))
+        cache.put(first, report)
+        cache.put(second, report)
+        cache.put(third, report)
+        cache.get(first)
+        cache.put(fourth, report)
+        self.assertIsNone(cache.get(second))
+        for i in (first, third, fourth):
+            self.assertEqual(cache.get(i), report)
+        stats = cache.stats()
+        self.assertEqual((stats["evictions"], stats["entries"], stats["bytes"]), (1, 3, 3 * size))
+
+    def test_shared_between_connections(self):
+        self.open().put(scenario(), {"value": 1})
+        self.assertEqual(self.open().get(scenario()), {"value": 1})
+
+    def test_stream_with_cache(self):
+        """
+        Потоковый расчет с хранилищем дает те же записи, что и без него,
+        повторный проход берет все отчеты из хранилища
+        """
+        lines = [json.dumps(scenario(tetta=6 + k / 10)) for k in range(20)]
+        lines.insert(5, "{bad")
+        expected = list(iter_records(lines, batch_size=8))
+        cache = self.open()
+        self.assertEqual(list(iter_records(lines, batch_size=8, cache=cache)), expected)
+        self.assertEqual(cache.stats()["entries"], 20)
+        sink = io.StringIO()
+        run_stream(lines, sink, batch_size=8, cache=cache)
+        self.assertEqual([json.loads(line) for line in sink.getvalue().splitlines()], expected)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (20, 20))
+
+    def test_key_ignores_extra_fields(self):
+        self.assertEqual(scenario_key(scenario()), scenario_key(dict(scenario(), comment="x")))
+
+    def test_evaluations_are_separate(self):
+        """
+        Обычный и пакетный расчеты хранятся под разными ключами
+        """
+        self.assertNotEqual(scenario_key(scenario()), scenario_key(scenario(), "batch"))
+        with self.assertRaises(ValueError):
+            scenario_key(scenario(), "table")
+        cache = self.open()
+        cache.put(scenario(), {"value": 1})
+        self.assertIsNone(cache.get(scenario(), "batch"))
+        cache.put(scenario(), {"value": 2}, "batch")
+        self.assertEqual(cache.get(scenario()), {"value": 1})
+        self.assertEqual(cache.get_or_compute(scenario(), lambda: {"value": 3}, "batch"), {"value": 2})
+
+    def test_code_version_covers_all_modules(self):
+        """
+        Версия кода меняется при изменении любого модуля расчета,
+        в том числе пакетного режима в app/stream.py
+        """
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        src = os.path.dirname(os.path.dirname(os.path.abspath(app.cache.__file__)))
+        for package in CODE_PACKAGES:
+            shutil.copytree(os.path.join(src, package), os.path.join(root, package),
+                            ignore=shutil.ignore_patterns("__pycache__"))
+        self.assertEqual(code_version(root), code_version())
+        with open(os.path.join(root, "app", "stream.py"), "a", encoding="utf8") as f:
+            f.write("\n")
+        code_version.cache_clear()
+        self.assertNotEqual(code_version(root), code_version())
+
+
+if __name__ == "__main__":
+    unittest.main()
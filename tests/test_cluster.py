@@ -0,0 +1,112 @@
+import math as m
+import unittest
+
+import numpy as np
+from scipy.integrate import quad
+
+from ftnp.cluster import Cluster, ClusterBatch, signal_to_noise_failure_probability
+
+
+def tail_quad(x1):
+    # хвост нормального распределения численным интегрированием, %
+    value = quad(lambda x: np.exp(-x ** 2 / 2), x1, np.inf, epsabs=0, epsrel=1e-13, limit=200)[0]
+    return value / m.sqrt(2 * m.pi) * 100
+
+
+class FailureProbabilityTest(unittest.TestCase):
+
+    def test_erfc_matches_quad(self):
+        """
+        Замкнутая формула через erfc совпадает с интегрированием,
+        в том числе в дальнем хвосте
+        """
+        for x1 in (-4, -1.5, 0, 0.3, 1, 2.5, 5, 8, 12):
+            with self.subTest(x1=x1):
+                self.assertAlmostEqual(
+                    signal_to_noise_failure_probability(x1) / tail_quad(x1), 1, delta=1e-10)
+
+    def test_array_matches_scalar(self):
+        x1 = np.linspace(-4, 12, 33)
+        expected = [signal_to_noise_failure_probability(float(x)) for x in x1]
+        np.testing.assert_allclose(signal_to_noise_failure_probability(x1), expected, rtol=1e-14)
+
+    def test_methods_agree(self):
+        """
+        Методы "erfc" и "quad" Cluster и пакетный расчет совпадают
+        """
+        params = [(7, 6, 3, 9), (3, 8, 1, 12), (12, 5, 6, 9), (4, 4.5, 3, 15)]
+        batch = ClusterBatch(*np.array(params, dtype=float).T).get_signal_to_noise_failure_probability()
+        for k, p in enumerate(params):
+            with self.subTest(params=p):
+                cluster = Cluster(*p)
+                erfc = cluster.get_signal_to_noise_failure_probability()
+                self.assertAlmostEqual(erfc / cluster.get_signal_to_noise_failure_probability(method="quad"), 1, delta=1e-8)
+                self.assertAlmostEqual(batch[k] / erfc, 1, delta=1e-12)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            Cluster(7, 6, 3, 9).get_signal_to_noise_failure_probability(method="simpson")
+
+
+class MemoizationTest(unittest.TestCase):
+
+    def test_cache_stats(self):
+        """
+        Промежуточные величины считаются один раз, повторные
+        обращения берутся из кэша
+        """
+        cluster = Cluster(7, 6, 3, 9)
+        cluster.get_signal_to_noise_failure_probability()
+        self.assertEqual(cluster.cache_stats["x1"], {"computed": 1, "reused": 0})
+        # tetta_e_squared нужна x1 и betta
+        self.assertEqual(cluster.cache_stats["tetta_e_squared"], {"computed": 1, "reused": 1})
+        self.assertEqual(cluster.cache_stats["betta_i"], {"computed": 1, "reused": 1})
+        cluster.get_signal_to_noise_failure_probability()
+        self.assertEqual(cluster.cache_stats["x1"], {"computed": 1, "reused": 1})
+
+    def test_setter_invalidates(self):
+        cluster = Cluster(7, 6, 3, 9)
+        before = cluster.get_signal_to_noise_failure_probability()
+        cluster.tetta = 8
+        after = cluster.get_signal_to_noise_failure_probability()
+        self.assertEqual(cluster.cache_stats["x1"]["computed"], 2)
+        self.assertAlmostEqual(after, Cluster(7, 8, 3, 9).get_signal_to_noise_failure_probability())
+        self.assertNotAlmostEqual(after, before)
+        cluster.cell_sectors_num = 1
+        self.assertEqual(cluster.derive_betta_i()[0], 6)
+
+    def test_batch_setter_invalidates(self):
+        batch = ClusterBatch([7, 7], 6, 3, 9)
+        batch.get_betta()
+        batch.cluster_dim = np.array([3, 12])
+        np.testing.assert_allclose(batch.get_betta(), ClusterBatch([3, 12], 6, 3, 9).get_betta())
+        self.assertEqual(batch.cache_stats["betta_sums"]["computed"], 2)
+
+
+class ClusterBatchTest(unittest.TestCase):
+
+    def test_betta_i_matches_scalar(self):
+        """
+        Пакетный derive_betta_i в раскладке Cluster, лишние сигналы - нули
+        """
+        params = [(3, 6, 1, 9), (7, 6, 3, 9), (12, 6, 6, 9), (4, 6, 3, 9)]
+        batch = ClusterBatch(*np.array(params).T).derive_betta_i()
+        for k, p in enumerate(params):
+            with self.subTest(params=p):
+                expected = Cluster(*p).derive_betta_i()
+                self.assertEqual(batch[0][k], expected[0])
+                np.testing.assert_allclose([b[k] for b in batch[1:expected[0] + 1]], expected[1:])
+                np.testing.assert_array_equal([b[k] for b in batch[expected[0] + 1:]], 0)
+
+    def test_broadcast_parameters(self):
+        np.testing.assert_allclose(
+            ClusterBatch(7, 6, [1, 3, 6], 9).get_betta(),
+            [Cluster(7, 6, m, 9).get_betta() for m in (1, 3, 6)])
+
+    def test_unsupported_sectors(self):
+        with self.assertRaises(ValueError):
+            ClusterBatch(7, 6, [3, 4], 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
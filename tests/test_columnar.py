@@ -0,0 +1,97 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from app.columnar import FIELD_IDS, ColumnarWriter, columnar_to_json, json_to_columnar, read_columnar
+from app.stream import run_stream, run_stream_columnar
+from tests.helpers import scenario
+
+
+class ColumnarTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_jsonl_round_trip(self):
+        """
+        JSONL потокового расчета -> столбцы -> JSONL без изменений,
+        записи с ошибками пропускаются
+        """
+        lines = [json.dumps(scenario(tetta=6 + k / 10)) for k in range(50)]
+        lines.insert(10, "{bad")
+        with open(self.path("in.jsonl"), "w", encoding="utf8") as f:
+            run_stream(lines, f)
+        json_to_columnar(self.path("in.jsonl"), self.path("columns"), chunk_size=16)
+        columnar_to_json(self.path("columns"), self.path("out.jsonl"), chunk_size=7)
+        with open(self.path("in.jsonl"), encoding="utf8") as f:
+            expected = [record for record in map(json.loads, f) if "report" in record]
+        with open(self.path("out.jsonl"), encoding="utf8") as f:
+            self.assertEqual([json.loads(line) for line in f], expected)
+        columns = read_columnar(self.path("columns"))
+        self.assertEqual(len(columns["line"]), 50)
+        self.assertIn(FIELD_IDS["Суммарные потери радиосигнала при распространении радиоволн "
+                                "от базовой станции к абонентской станции"], columns)
+
+    def test_single_report_round_trip(self):
+        report = {"Запас по потерям в линии": 21, "Эквивалентная изотропно излучаемая мощность ЭИИМ": 55.5,
+                  "Суммарные потери радиосигнала при распространении радиоволн от базовой станции "
+                  "к абонентской станции": [139, 112]}
+        with open(self.path("out.json"), "w", encoding="utf8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+        json_to_columnar(self.path("out.json"), self.path("columns"))
+        columnar_to_json(self.path("columns"), self.path("back.json"))
+        with open(self.path("back.json"), encoding="utf8") as f:
+            self.assertEqual(json.load(f), report)
+
+    def test_unfinished_chunk_is_dropped(self):
+        writer = ColumnarWriter(self.path("columns"))
+        writer.append({"line": [1, 2], "value": [0.5, 1.5]})
+        with open(self.path(os.path.join("columns", "value.bin")), "ab") as f:
+            f.write(b"\0" * 3)
+        ColumnarWriter(self.path("columns")).append({"line": [3], "value": [2.5]})
+        columns = read_columnar(self.path("columns"))
+        np.testing.assert_array_equal(columns["value"], [0.5, 1.5, 2.5])
+
+    def test_mixed_int_and_float_chunks(self):
+        """
+        Целый столбец расширяется до float64 при появлении дробных
+        значений, записанные значения сохраняются
+        """
+        writer = ColumnarWriter(self.path("columns"))
+        writer.append({"value": [21, 22], "pair": [[1, 2], [3, 4]], "city": ["SMALL", "LARGE"]})
+        writer.append({"value": [21.5, 22.7], "pair": [[1.5, 2], [3, 4.5]], "city": ["MEDIUM", "SMALL"]})
+        ColumnarWriter(self.path("columns")).append({"value": [23], "pair": [[5, 6]], "city": ["LARGE"]})
+        columns = read_columnar(self.path("columns"))
+        np.testing.assert_array_equal(columns["value"], [21, 22, 21.5, 22.7, 23])
+        self.assertEqual(columns["value"].dtype, np.float64)
+        np.testing.assert_array_equal(columns["pair"], [[1, 2], [3, 4], [1.5, 2], [3, 4.5], [5, 6]])
+        self.assertEqual(list(columns["city"]), ["SMALL", "LARGE", "MEDIUM", "SMALL", "LARGE"])
+
+    def test_incompatible_chunk(self):
+        writer = ColumnarWriter(self.path("columns"))
+        writer.append({"value": [1.5, 2.5]})
+        with self.assertRaises(ValueError):
+            writer.append({"value": ["x", "y"]})
+        np.testing.assert_array_equal(read_columnar(self.path("columns"))["value"], [1.5, 2.5])
+
+    def test_stream_with_float_after_int_inputs(self):
+        """
+        Запас по потерям в линии целый в первой порции и дробный во второй
+        """
+        lines = [json.dumps(scenario(building_penetraition_loses=value)) for value in (10, 10, 10.5, 10.5)]
+        with open(self.path("errors.jsonl"), "w", encoding="utf8") as errors:
+            run_stream_columnar(lines, self.path("columns"), errors, batch_size=2)
+        columns = read_columnar(self.path("columns"))
+        np.testing.assert_array_equal(columns[FIELD_IDS["Запас по потерям в линии"]], [21, 21, 21.5, 21.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
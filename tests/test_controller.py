@@ -0,0 +1,82 @@
+import unittest
+
+import numpy as np
+
+from app.controller import ConsoleController
+from tests.helpers import batch_engineer, scalar_engineer, scenario
+
+
+class ConsoleControllerTest(unittest.TestCase):
+
+    def assertReportEqual(self, report, expected):
+        self.assertEqual(set(report), set(expected))
+        for key, value in expected.items():
+            with self.subTest(key=key):
+                np.testing.assert_allclose(report[key], value, rtol=1e-12)
+
+    def test_update_matches_full_recompute(self):
+        controller = ConsoleController(scalar_engineer(scenario()))
+        changes = {"tetta": 8, "traffic_transmission_ch_num": 30, "city_type": "MEDIUM"}
+        updated = controller.update(changes)
+        self.assertEqual(list(updated), controller.affected(changes))
+        self.assertReportEqual(controller.report, scalar_engineer(scenario(**changes)).report())
+
+    def test_update_rows_matches_full_recompute(self):
+        """
+        Изменение отдельных сценариев пакета, в том числе имени типа
+        города длиннее прежних
+        """
+        rows = [scenario(city_type="SMALL", tetta=6 + k) for k in range(4)]
+        model = batch_engineer(rows)
+        controller = ConsoleController(model)
+        controller.update({"city_type": "MEDIUM", "cell_sectors_num": 6}, rows=[1, 3])
+        for k in (1, 3):
+            rows[k] = dict(rows[k], city_type="MEDIUM", cell_sectors_num=6)
+        expected = batch_engineer(rows).report()
+        self.assertReportEqual(controller.report, expected)
+
+    def test_invalid_update_leaves_model_unchanged(self):
+        rows = [scenario(city_type="SMALL") for _ in range(3)]
+        model = batch_engineer(rows)
+        controller = ConsoleController(model)
+        report = dict(controller.report)
+        with self.assertRaises(KeyError):
+            controller.update({"tetta": 9, "city_type": "HUGE"}, rows=[0])
+        np.testing.assert_array_equal(model.initial_data["tetta"], 6)
+        np.testing.assert_array_equal(model.cluster_calculator.tetta, 6)
+        self.assertEqual(list(model.initial_data["city_type"]), ["SMALL"] * 3)
+        self.assertReportEqual(controller.report, report)
+
+    def test_invalid_cluster_parameters(self):
+        """
+        Размерность кластера и число секторов проверяются так же,
+        как в конструкторе пакетной модели
+        """
+        model = batch_engineer([scenario() for _ in range(3)])
+        controller = ConsoleController(model)
+        for changes in ({"cell_sectors_num": 4}, {"cluster_dim": 0}, {"cluster_dim": -7, "tetta": 9}):
+            with self.subTest(changes=changes), self.assertRaises(ValueError):
+                controller.update(changes, rows=[2])
+        np.testing.assert_array_equal(model.initial_data["cluster_dim"], scenario()["cluster_dim"])
+        np.testing.assert_array_equal(model.cluster_calculator.cell_sectors_num, scenario()["cell_sectors_num"])
+        np.testing.assert_array_equal(model.initial_data["tetta"], scenario()["tetta"])
+        with self.assertRaises(ValueError):
+            ConsoleController(scalar_engineer(scenario())).update({"cell_sectors_num": 2})
+
+    def test_rows_on_scalar_model(self):
+        """
+        У обычной модели один сценарий: rows=[0] изменяет его,
+        пустой выбор ничего не меняет
+        """
+        controller = ConsoleController(scalar_engineer(scenario()))
+        controller.update({"tetta": 8}, rows=[0])
+        expected = scalar_engineer(scenario(tetta=8)).report()
+        self.assertReportEqual(controller.report, expected)
+        self.assertEqual(controller.update({"tetta": 9}, rows=[]), {})
+        self.assertEqual(controller.model.initial_data["tetta"], 8)
+        with self.assertRaises(IndexError):
+            controller.update({"tetta": 9}, rows=[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+
+import numpy as np
+
+from ftnp.erlang import ErlangBTable, erlang_b, erlang_b_table, erlang_b_traffic
+from ftnp.nsp import NSPBatch
+
+
+class ErlangBTest(unittest.TestCase):
+
+    def test_known_values(self):
+        """
+        Значения по рекурсии и по таблицам Эрланга B
+        """
+        self.assertAlmostEqual(erlang_b(1, 1), 0.5)
+        self.assertAlmostEqual(erlang_b(2, 2), 0.4)
+        self.assertAlmostEqual(erlang_b(0, 5), 0)
+        self.assertAlmostEqual(erlang_b_traffic(10, 0.01), 4.4612, places=4)
+        self.assertAlmostEqual(erlang_b_traffic(30, 0.02), 21.932, places=3)
+        self.assertAlmostEqual(erlang_b_traffic(100, 0.001), 75.24, places=2)
+
+    def test_inverse_round_trip(self):
+        n, p = np.meshgrid(np.arange(1, 201, 7), np.geomspace(1e-6, 0.9, 25))
+        traffic = erlang_b_traffic(n, p)
+        np.testing.assert_allclose(erlang_b(traffic, n), p, rtol=1e-9)
+
+    def test_scalar_path_matches_arrays(self):
+        """
+        Скалярный расчет на чистом Python совпадает с векторной рекурсией
+        """
+        for traffic, channels in ((0.5, 1), (4.4612, 10), (75.24, 100), (300.0, 250), (1e-3, 40)):
+            with self.subTest(traffic=traffic, channels=channels):
+                self.assertIsInstance(erlang_b(traffic, channels), float)
+                expected = erlang_b(np.array([traffic]), np.array([channels]))[0]
+                self.assertAlmostEqual(erlang_b(traffic, channels) / expected, 1, delta=1e-13)
+        for channels, blocking in ((1, 0.5), (10, 0.01), (73, 1e-5), (256, 0.3)):
+            with self.subTest(channels=channels, blocking=blocking):
+                expected = erlang_b_traffic(np.array([channels]), np.array([blocking]))[0]
+                self.assertAlmostEqual(erlang_b_traffic(channels, blocking) / expected, 1, delta=1e-11)
+        with self.assertRaises(ValueError):
+            erlang_b_traffic(10, 1.5)
+
+    def test_invalid_blocking(self):
+        with self.assertRaises(ValueError):
+            erlang_b_traffic(10, 0)
+        with self.assertRaises(ValueError):
+            erlang_b_traffic(0, 0.01)
+
+    def test_table_error_bound(self):
+        """
+        Интерполяция по таблице в пределах MAX_RELATIVE_ERROR,
+        вне таблицы - точный расчет
+        """
+        rng = np.random.default_rng(0)
+        n = rng.integers(1, 300, 20000)
+        p = np.exp(rng.uniform(np.log(1e-7), np.log(0.7), 20000))
+        exact = erlang_b_traffic(n, p)
+        table = erlang_b_table()
+        np.testing.assert_allclose(table.traffic(n, p), exact, rtol=ErlangBTable.MAX_RELATIVE_ERROR)
+        outside = (n > table.max_channels) | (p > 0.5) | (p < 1e-6)
+        np.testing.assert_array_equal(table.traffic(n[outside], p[outside]), exact[outside])
+
+    def test_table_rows_built_lazily(self):
+        """
+        Строки таблицы строятся только для запрошенных чисел каналов
+        """
+        table = ErlangBTable()
+        table.traffic([10, 10, 30], [0.01, 0.02, 1e-7])
+        self.assertEqual(list(np.flatnonzero(table.built) + 1), [10])
+
+    def test_batch_uses_table_by_distinct_pairs(self):
+        """
+        Пакетный расчет строит строку таблицы, только если различных пар
+        с этим числом каналов не меньше points, иначе решает точно
+        """
+        erlang_b_table.cache_clear()
+        self.addCleanup(erlang_b_table.cache_clear)
+        table = erlang_b_table()
+        # много строк, но мало различных пар - таблица не строится
+        n = np.tile([10, 20, 30], 20000)
+        p = np.tile([0.01, 0.02], 30000)
+        batch = NSPBatch(3, 2, 7, n, p, 500000)
+        np.testing.assert_array_equal(batch.calc_telephone_load_per_sector_erlang_b(), erlang_b_traffic(n, p))
+        self.assertFalse(table.built.any())
+        # для 20 каналов различных пар больше points - строится одна строка
+        p = np.geomspace(1e-4, 0.2, table.points + 100)
+        n = np.concatenate([np.full(p.size, 20), [40]])
+        p = np.concatenate([p, [0.01]])
+        batch = NSPBatch(3, 2, 7, n, p, 500000)
+        np.testing.assert_allclose(
+            batch.calc_telephone_load_per_sector_erlang_b(), erlang_b_traffic(n, p),
+            rtol=ErlangBTable.MAX_RELATIVE_ERROR)
+        self.assertEqual(list(np.flatnonzero(table.built) + 1), [20])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from ftnp.layout import SiteLayout, reuse_shift, sector_gain
+
+
+class SiteLayoutTest(unittest.TestCase):
+
+    def test_reuse_shift(self):
+        self.assertEqual(reuse_shift(1), (1, 0))
+        self.assertEqual(reuse_shift(3), (1, 1))
+        self.assertEqual(reuse_shift(7), (2, 1))
+        self.assertEqual(reuse_shift(12), (2, 2))
+        with self.assertRaises(ValueError):
+            reuse_shift(5)
+
+    def test_hexagonal_groups(self):
+        """
+        Соседние площадки на расстоянии spacing, площадки одной группы -
+        не ближе расстояния повторного использования sqrt(C) * spacing
+        """
+        for cluster_dim in (3, 4, 7, 12):
+            with self.subTest(cluster_dim=cluster_dim):
+                layout = SiteLayout.hexagonal(12, 12, 2.0, 3, cluster_dim)
+                points = np.column_stack((layout.x, layout.y))
+                distance = np.hypot(*(points[:, None] - points[None]).transpose(2, 0, 1))
+                np.fill_diagonal(distance, np.inf)
+                np.testing.assert_allclose(distance.min(axis=1), 2.0)
+                self.assertEqual(len(np.unique(layout.groups)), cluster_dim)
+                same = layout.groups[:, None] == layout.groups[None]
+                np.testing.assert_allclose(distance[same].min(), np.sqrt(cluster_dim) * 2.0)
+                # группы по ближайшим узлам решетки - то же разбиение
+                groups = layout.groups.copy()
+                regrouped = layout.assign_groups(cluster_dim)
+                np.testing.assert_array_equal(groups[:, None] == groups, regrouped[:, None] == regrouped)
+
+    def test_cochannel_pairs(self):
+        layout = SiteLayout.hexagonal(10, 10, 1.0, 3, 7)
+        layout.x += np.random.default_rng(0).normal(0, 0.05, layout.x.shape)
+        layout.assign_groups(7)
+        pairs = layout.cochannel_pairs(5.0)
+        points = np.column_stack((layout.x, layout.y))
+        distance = np.hypot(*(points[:, None] - points[None]).transpose(2, 0, 1))
+        expected = (distance <= 5.0) & (layout.groups[:, None] == layout.groups) & ~np.eye(len(points), dtype=bool)
+        self.assertEqual(sorted(map(tuple, pairs)), sorted(zip(*np.nonzero(expected))))
+        with self.assertRaises(ValueError):
+            SiteLayout([0, 1], [0, 0], 1).cochannel_pairs(1.0)
+
+    def test_interference_matches_loop(self):
+        """
+        Векторный расчет помех совпадает с перебором мешающих
+        секторов в цикле
+        """
+        layout = SiteLayout.hexagonal(8, 8, 1.0, 3, 7)
+        result = layout.interference(6.0, gamma=3.5)
+        cell_radius = 1.0 / np.sqrt(3)
+        pairs = layout.cochannel_pairs(6.0)
+        for sector in (0, 100, 131, 191):
+            site, k = divmod(sector, 3)
+            bearing = np.radians(layout.azimuth[site] + 120 * k)
+            px = layout.x[site] + cell_radius * np.sin(bearing)
+            py = layout.y[site] + cell_radius * np.cos(bearing)
+            betta = []
+            for source in pairs[pairs[:, 1] == site, 0]:
+                dx, dy = px - layout.x[source], py - layout.y[source]
+                angle = np.degrees(np.arctan2(dx, dy)) - (layout.azimuth[source] + 120 * k)
+                betta.append(sector_gain(angle, 3) * (np.hypot(dx, dy) / cell_radius) ** -3.5)
+            with self.subTest(sector=sector):
+                self.assertEqual(result["interferers"][sector], len(betta))
+                self.assertAlmostEqual(float(result["ci"][sector]), -10 * np.log10(sum(betta)), places=4)
+        self.assertTrue((result["outage"] >= 0).all() and (result["outage"] <= 100).all())
+
+    def test_save_load(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        layout = SiteLayout.hexagonal(4, 5, 1.5, 6, 4)
+        path = os.path.join(directory, "layout.npz")
+        layout.save(path)
+        loaded = SiteLayout.load(path)
+        for name in ("x", "y", "azimuth", "groups"):
+            np.testing.assert_array_equal(getattr(loaded, name), getattr(layout, name))
+        self.assertEqual((loaded.cell_sectors_num, loaded.spacing), (6, 1.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
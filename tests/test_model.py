@@ -0,0 +1,34 @@
+import unittest
+
+import numpy as np
+
+from tests.helpers import CITY_TYPES, SECTORS, batch_engineer, scalar_engineer, scenario
+
+
+class BatchReportTest(unittest.TestCase):
+
+    def test_batch_matches_scalar(self):
+        """
+        Пакетный отчет совпадает с отчетами отдельных сценариев
+        при всех числах секторов и типах городов
+        """
+        scenarios = [
+            scenario(
+                cell_sectors_num=m, city_type=city, tetta=tetta,
+                distance_between_antennas=distance, traffic_transmission_ch_num=channels,
+            )
+            for m in SECTORS
+            for city in CITY_TYPES
+            for tetta, distance, channels in ((6, 2, 20), (8, 0.5, 35), (4.5, 7, 12))
+        ]
+        batch = batch_engineer(scenarios).report()
+        for row, i in enumerate(scenarios):
+            report = scalar_engineer(i).report()
+            self.assertEqual(set(report), set(batch))
+            for key, value in report.items():
+                with self.subTest(row=row, key=key):
+                    np.testing.assert_allclose(batch[key][row], value, rtol=1e-7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import math
+import unittest
+
+from scipy.stats import norm
+
+from ftnp.cluster import Cluster
+from ftnp.montecarlo import MonteCarloOutage, count_outages
+
+
+class MonteCarloOutageTest(unittest.TestCase):
+
+    def test_single_interferer_exact(self):
+        """
+        С одной помехой отношение сигнал/помеха в дБ нормально
+        со стандартным отклонением sqrt(2) * tetta
+        """
+        betta, tetta, snr, size = 0.05, 6.0, 9.0, 400000
+        expected = norm.cdf((snr + 10 * math.log10(betta)) / (math.sqrt(2) * tetta))
+        outages = count_outages([betta], tetta, snr, size, seed=1, chunk_index=0)
+        self.assertAlmostEqual(outages / size, expected, delta=4 * math.sqrt(expected * (1 - expected) / size))
+
+    def test_reproducible_across_workers(self):
+        """
+        Результат при заданном seed не зависит от числа процессов
+        """
+        cluster = Cluster(7, 6, 3, 9)
+        results = [
+            MonteCarloOutage(cluster, chunk_size=50000, seed=42).estimate(samples=200000, workers=workers)
+            for workers in (1, 2)
+        ]
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0]["samples"], 200000)
+        self.assertLessEqual(results[0]["ci_low"], results[0]["outage"])
+        self.assertLessEqual(results[0]["outage"], results[0]["ci_high"])
+        self.assertEqual(results[0]["analytical"], cluster.get_signal_to_noise_failure_probability())
+        other = MonteCarloOutage(cluster, chunk_size=50000, seed=43).estimate(samples=200000, workers=1)
+        self.assertNotEqual(other["outage"], results[0]["outage"])
+
+    def test_stops_at_precision(self):
+        """
+        Расчет прекращается после порции, на которой достигнута точность
+        """
+        estimate = MonteCarloOutage(Cluster(7, 6, 3, 9), chunk_size=10000, seed=0).estimate(
+            samples=10 ** 7, precision=1.0, workers=1)
+        self.assertLess(estimate["samples"], 10 ** 7)
+        self.assertEqual(estimate["samples"] % 10000, 0)
+        self.assertLessEqual((estimate["ci_high"] - estimate["ci_low"]) / 2, 1.0)
+        relative = MonteCarloOutage(Cluster(7, 6, 3, 9), chunk_size=10000, seed=0).estimate(
+            samples=10 ** 7, relative_precision=0.05, workers=1)
+        self.assertLessEqual((relative["ci_high"] - relative["ci_low"]) / 2, 0.05 * relative["outage"])
+
+    def test_wilson_interval(self):
+        low, high = MonteCarloOutage.wilson_interval(0, 100, 1.96)
+        self.assertEqual(low, 0.0)
+        self.assertAlmostEqual(high, 0.037, places=3)
+        low, high = MonteCarloOutage.wilson_interval(50, 100, 1.96)
+        self.assertAlmostEqual(low + high, 1.0)
+        self.assertAlmostEqual(high - low, 2 * 0.0961, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from ftnp.erlang import erlang_b_traffic
+from ftnp.layout import SiteLayout
+from ftnp.leb import LEBBatch
+from ftnp.network import SECTOR_DTYPE, Network
+
+
+class NetworkTest(unittest.TestCase):
+
+    def setUp(self):
+        layout = SiteLayout.hexagonal(3, 4, 1.0, 3)
+        n = len(layout.x) * 3
+        self.network = Network.from_layout(
+            layout, {"cell_sectors_num": 3, "cluster_dim": 7},
+            transmitter_output_power=43, transmitter_antenna_gain=17,
+            transmission_antenna_feeder_loss=-3, duplex_filter_loss=-1, diplexer_loss=-0.5,
+            transmitting_antenna_height=30, receiving_antenna_height=1.5, radio_frequency=1800,
+            city_type=np.where(np.arange(n) % 2, "LARGE", "SMALL"),
+            carriers=2, traffic_transmission_ch_num=np.arange(n) % 40 + 5,
+            call_blocking_admissible_prob=0.02,
+        )
+
+    def test_from_layout(self):
+        s = self.network.sectors
+        self.assertEqual(len(self.network), 36)
+        np.testing.assert_array_equal(s["site"][:6], [0, 0, 0, 1, 1, 1])
+        np.testing.assert_array_equal(s["azimuth"][:3], [0, 120, 240])
+        self.assertEqual(list(self.network.city_type()[:2]), ["SMALL", "LARGE"])
+        with self.assertRaises(KeyError):
+            self.network.set("city_type", "HUGE")
+        with self.assertRaises(ValueError):
+            Network(np.zeros(3))
+
+    def test_save_load_memmap(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.network.save(directory)
+        loaded = Network.load(directory)
+        self.assertIsInstance(loaded.sectors, np.memmap)
+        self.assertEqual(loaded.sectors.dtype, SECTOR_DTYPE)
+        self.assertEqual(loaded.parameters, self.network.parameters)
+        np.testing.assert_array_equal(loaded.compute_EIRP(), self.network.compute_EIRP())
+        np.testing.assert_array_equal(Network.load(directory, mmap_mode=None).sectors, self.network.sectors)
+
+    def test_columns_match_leb(self):
+        s = self.network.sectors
+        leb = LEBBatch()
+        city_type = self.network.city_type()
+        correction = leb.compute_antenna_height_correction_factor(
+            s["radio_frequency"], s["receiving_antenna_height"], city_type)
+        losses = leb.COST231_Hata(correction, s["radio_frequency"], s["transmitting_antenna_height"], 2, city_type)
+        np.testing.assert_allclose(self.network.COST231_Hata(2), losses)
+        np.testing.assert_allclose(self.network.COST231_Hata_distance(losses), 2, rtol=1e-6)
+
+    def test_telephone_load(self):
+        s = self.network.sectors
+        np.testing.assert_allclose(
+            self.network.calc_telephone_load_per_sector(),
+            erlang_b_traffic(s["traffic_transmission_ch_num"], s["call_blocking_admissible_prob"]),
+            rtol=1e-7)
+
+    def test_nsp_requires_parameters(self):
+        """
+        Без числа секторов и размерности кластера NSPBatch не строится
+        """
+        for parameters in ({}, {"cell_sectors_num": 3}, {"cluster_dim": 7}):
+            with self.subTest(parameters=parameters):
+                self.network.parameters = parameters
+                with self.assertRaises(ValueError) as error:
+                    self.network.nsp()
+                for key in ("cell_sectors_num", "cluster_dim"):
+                    self.assertEqual(key in str(error.exception), key not in parameters)
+        self.network.parameters = {"cell_sectors_num": 3, "cluster_dim": 7}
+        np.testing.assert_array_equal(self.network.nsp().calc_total_num_of_fq_chan(), 42)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import numpy as np
+
+from ftnp.cluster import Cluster
+from ftnp.optimizer import ClusterOptimizer, valid_cluster_sizes
+
+
+class ClusterOptimizerTest(unittest.TestCase):
+
+    def test_valid_cluster_sizes(self):
+        np.testing.assert_array_equal(valid_cluster_sizes(28), [1, 3, 4, 7, 9, 12, 13, 16, 19, 21, 25, 27, 28])
+
+    def test_matches_scalar_search(self):
+        """
+        Наименьшая подходящая размерность совпадает с перебором
+        скалярным Cluster, полоса - с NSP
+        """
+        tetta = [4, 6, 8, 10]
+        snr = [9, 12, 9, 15]
+        optimizer = ClusterOptimizer(max_outage=10, max_cluster_dim=37)
+        result = optimizer.optimize(tetta, snr, 0.2)
+        for m in (1, 3, 6):
+            for d in range(len(tetta)):
+                with self.subTest(sectors=m, district=d):
+                    expected = next((
+                        (int(size), outage) for size in optimizer.cluster_sizes
+                        for outage in [Cluster(size, tetta[d], m, snr[d]).get_signal_to_noise_failure_probability()]
+                        if outage <= 10), (0, np.nan))
+                    self.assertEqual(result[m]["cluster_dim"][d], expected[0])
+                    self.assertEqual(result[m]["feasible"][d], expected[0] > 0)
+                    if expected[0]:
+                        self.assertAlmostEqual(result[m]["outage"][d], expected[1], places=9)
+                        self.assertAlmostEqual(result[m]["min_bandwidth"][d], m * expected[0] * 2 * 0.2)
+                    else:
+                        self.assertTrue(np.isnan(result[m]["min_bandwidth"][d]))
+
+    def test_infeasible(self):
+        result = ClusterOptimizer(max_outage=1e-9, max_cluster_dim=7, sectors=(1,)).optimize(12, 20, 0.2)
+        self.assertEqual(result[1]["cluster_dim"].tolist(), [0])
+        self.assertFalse(result[1]["feasible"][0])
+        self.assertTrue(np.isnan(result[1]["outage"][0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+import numpy as np
+
+from ftnp.leb import LEB
+from ftnp.propagation import MODELS, PathLoss, PropagationModel, path_loss, register_model
+from tests.helpers import CITY_TYPES
+
+
+class PropagationModelTest(unittest.TestCase):
+
+    def test_cost231_matches_leb(self):
+        """
+        COST231-Хата совпадает с LEB.COST231_Hata для всех типов городов
+        """
+        leb = LEB()
+        distance = np.array([0.5, 1, 2, 7.5])
+        for city in CITY_TYPES:
+            with self.subTest(city=city):
+                correction = leb.compute_antenna_height_correction_factor(1800, 1.5, city)
+                expected = [leb.COST231_Hata(correction, 1800, 30, d, city) for d in distance]
+                np.testing.assert_allclose(path_loss("COST231_Hata", 1800, 30, 1.5, city).loss(distance), expected)
+
+    def test_model_selection(self):
+        """
+        Модели выбираются по имени и дают разные потери
+        """
+        self.assertEqual(set(MODELS), {"Okumura_Hata", "COST231_Hata", "free_space", "two_ray"})
+        losses = {name: path_loss(name, 1800, 30, 1.5, "LARGE").loss(2.0) for name in MODELS}
+        self.assertEqual(len(set(np.round(list(losses.values()), 6))), len(MODELS))
+        self.assertAlmostEqual(losses["free_space"], 32.44 + 20 * np.log10(1800) + 20 * np.log10(2))
+        # COST231 отличается от Окумура-Хата на постоянную величину при тех же высотах
+        self.assertAlmostEqual(
+            losses["COST231_Hata"] - losses["Okumura_Hata"],
+            46.3 - 69.55 + (33.91 - 26.16) * np.log10(1800) + (13.82 - 13.821) * np.log10(30) + 3)
+        with self.assertRaises(KeyError):
+            path_loss("unknown", 1800, 30, 1.5, "LARGE")
+
+    def test_arrays_match_scalars(self):
+        frequency = np.array([900, 1800, 2000])
+        city = np.array(["SMALL", "LARGE", "MEDIUM"])
+        for name in MODELS:
+            with self.subTest(model=name):
+                batch = np.broadcast_to(path_loss(name, frequency, 30, 1.5, city).loss(3.0), 3)
+                for k in range(3):
+                    scalar = path_loss(name, frequency[k], 30, 1.5, city[k])
+                    self.assertAlmostEqual(batch[k], scalar.loss(3.0))
+
+    def test_scalar_cache(self):
+        self.assertIs(path_loss("two_ray", 1800, 30, 1.5, "SMALL"), path_loss("two_ray", 1800.0, 30.0, 1.5, "SMALL"))
+
+    def test_distance_inverts_loss(self):
+        loss = PathLoss(np.array([120.0, 130.0]), np.array([35.0, 20.0]))
+        distance = np.array([0.3, 12.0])
+        np.testing.assert_allclose(loss.distance(loss.loss(distance)), distance)
+
+    def test_incomplete_model(self):
+        """
+        Модель без coefficients не создается
+        """
+        class Incomplete(PropagationModel):
+            name = "incomplete"
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_register_model(self):
+        @register_model
+        class Flat(PropagationModel):
+            name = "flat"
+
+            def coefficients(self, radio_frequency, transmitting_antenna_height, receiving_antenna_height, city_type):
+                return 100.0, 30.0
+
+        self.addCleanup(MODELS.pop, "flat")
+        self.assertAlmostEqual(path_loss("flat", 1800, 30, 1.5, "SMALL").loss(10), 130.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from ftnp.leb import LEB, LEBBatch
+from ftnp.radius import cell_radius
+
+
+class CellRadiusTest(unittest.TestCase):
+
+    def test_distance_inverts_cost231(self):
+        """
+        COST231_Hata_distance обращает COST231_Hata для скаляров и массивов
+        """
+        leb = LEB()
+        for city_type in ("SMALL", "LARGE"):
+            correction = leb.compute_antenna_height_correction_factor(1800, 1.5, city_type)
+            loss = leb.COST231_Hata(correction, 1800, 30, 2.5, city_type)
+            self.assertAlmostEqual(leb.COST231_Hata_distance(correction, 1800, 30, loss, city_type), 2.5)
+        batch = LEBBatch()
+        city_type = np.array(["SMALL", "MEDIUM", "LARGE"])
+        correction = batch.compute_antenna_height_correction_factor(1800, 1.5, city_type)
+        distance = np.array([0.5, 3.0, 12.0])
+        loss = batch.COST231_Hata(correction, 1800, [20, 30, 50], distance, city_type)
+        np.testing.assert_allclose(
+            batch.COST231_Hata_distance(correction, 1800, [20, 30, 50], loss, city_type), distance)
+
+    def test_cell_radius(self):
+        """
+        Радиус - меньший из радиусов по направлениям и по емкости,
+        потери на радиусе покрытия равны допустимым
+        """
+        leb = LEBBatch()
+        city_type = np.array(["LARGE", "SMALL", "LARGE", "MEDIUM"])
+        frequency = np.array([1800.0, 1800.0, 1900.0, 1700.0])
+        height = np.array([30.0, 40.0, 25.0, 60.0])
+        correction = leb.compute_antenna_height_correction_factor(frequency, 1.5, city_type)
+        losses = np.array([[135.0, 132.0], [140.0, 145.0], [120.0, 120.0], [150.0, 138.0]])
+        capacity = np.array([5.0, 0.5, 5.0, 2.0])
+        result = cell_radius(losses, correction, frequency, height, city_type, capacity)
+        for key, column in (("downlink", 0), ("uplink", 1)):
+            np.testing.assert_allclose(
+                leb.COST231_Hata(correction, frequency, height, result[key], city_type), losses[:, column])
+        np.testing.assert_array_equal(result["coverage"], np.minimum(result["downlink"], result["uplink"]))
+        np.testing.assert_array_equal(result["radius"], np.minimum(result["coverage"], capacity))
+        np.testing.assert_array_equal(result["coverage_limited"], result["coverage"] < capacity)
+        self.assertTrue(result["coverage_limited"].any() and not result["coverage_limited"].all())
+
+    def test_scalar_capacity_radius(self):
+        result = cell_radius([[130.0, 128.0]], 1.0, 1800, 30, "LARGE", 1.0)
+        self.assertEqual(result["capacity"].shape, (1,))
+        self.assertEqual(result["radius"][0], min(result["coverage"][0], 1.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from ftnp.leb import LEBBatch
+from ftnp.raster import LAYERS, CoverageRaster
+
+
+class CoverageRasterTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.x, self.y = rng.uniform(0, 6, 8), rng.uniform(-6, 0, 8)
+        self.raster = CoverageRaster(
+            self.x, self.y, eirp=rng.uniform(50, 60, 8), useful_signal_required_power=-95,
+            radio_frequency=1800, transmitting_antenna_height=30, receiving_antenna_height=1.5,
+            city_type="LARGE", max_radius=3.0)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_render_tile_matches_brute_force(self):
+        """
+        Наилучшая площадка и потери до нее совпадают с перебором
+        всех площадок по LEBBatch.COST231_Hata
+        """
+        tile = self.raster.render_tile(0.0, 0.0, 0.25, 24, 24)
+        x = 0.25 * np.arange(24)[None, :, None]
+        y = -0.25 * np.arange(24)[:, None, None]
+        distance = np.hypot(x - self.x, y - self.y)
+        leb = LEBBatch()
+        correction = leb.compute_antenna_height_correction_factor(1800, 1.5, "LARGE")
+        loss = leb.COST231_Hata(correction, 1800, 30, np.maximum(distance, 0.02), "LARGE")
+        power = np.where(distance <= 3.0, self.raster.eirp - loss, -np.inf)
+        server = np.where(np.isfinite(power).any(axis=2), power.argmax(axis=2), -1)
+        np.testing.assert_array_equal(tile["server"], server)
+        served = server >= 0
+        best = np.take_along_axis(loss, np.maximum(server, 0)[..., None], axis=2)[..., 0]
+        np.testing.assert_allclose(tile["path_loss"][served], best[served], rtol=1e-12)
+        self.assertTrue(np.isnan(tile["received_power"][~served]).all())
+        np.testing.assert_array_equal(
+            tile["coverage"], served & (np.where(served, power.max(axis=2), -np.inf) >= -95))
+
+    def test_compute_independent_of_tiling(self):
+        """
+        Результат не зависит от размера плиток и числа процессов
+        """
+        expected = self.raster.render_tile(-0.5, 0.5, 0.1, 45, 70)
+        for tile, workers in ((16, 1), (7, 2)):
+            with self.subTest(tile=tile, workers=workers):
+                layers = self.raster.compute(
+                    "{}/{}-{}".format(self.directory, tile, workers), (-0.5, 0.5), 0.1, (45, 70),
+                    tile=tile, workers=workers)
+                self.assertEqual(set(layers), set(LAYERS))
+                for name, dtype in LAYERS.items():
+                    self.assertEqual(layers[name].dtype, dtype)
+                    np.testing.assert_array_equal(layers[name], np.asarray(expected[name]).astype(dtype))
+
+
+if __name__ == "__main__":
+    unittest.main()
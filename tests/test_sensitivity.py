@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from app.model import rows_to_columns
+from app.sensitivity import CONTINUOUS_INPUTS, DISCRETE_KEYS, sensitivity
+from tests.helpers import batch_engineer, scenario
+
+
+class SensitivityTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rows = [
+            scenario(tetta=6, city_type="LARGE"),
+            scenario(tetta=8, distance_between_antennas=3.5, city_type="SMALL", cell_sectors_num=6),
+        ]
+        cls.result = sensitivity(rows_to_columns(cls.rows))
+
+    def column(self, output, key):
+        k = self.result["inputs"].index(key)
+        return self.result["jacobian"][:, self.result["outputs"].index(output), k], \
+            self.result["elasticity"][:, self.result["outputs"].index(output), k]
+
+    def test_shapes_and_inputs(self):
+        self.assertEqual(self.result["jacobian"].shape,
+                         (2, len(self.result["outputs"]), len(CONTINUOUS_INPUTS)))
+        self.assertEqual(self.result["jacobian"].dtype, np.float32)
+        self.assertFalse(set(DISCRETE_KEYS) & set(self.result["inputs"]))
+        self.assertIn("eqv_isotropically_radiated_pow[1]", self.result["inputs"])
+        self.assertIn("Суммарные потери радиосигнала при распространении радиоволн от базовой станции "
+                      "к абонентской станции[0]", self.result["outputs"])
+
+    def test_analytic_derivatives(self):
+        """
+        Производные линейных и логарифмических записей совпадают с формулами
+        """
+        derivative, elasticity = self.column("Запас по потерям в линии", "subscriber_body_loses")
+        np.testing.assert_allclose(derivative, 1, rtol=1e-4)
+        derivative, elasticity = self.column("Общее число базовых станций", "subscribers_total")
+        np.testing.assert_allclose(derivative, 1 / 46000, rtol=1e-4)
+        np.testing.assert_allclose(elasticity, 1, rtol=1e-4)
+        losses = "Суммарные потери радиосигнала при распространении радиоволн от базовой станции к абонентской станции"
+        derivative, _ = self.column(losses + "[0]", "eqv_isotropically_radiated_pow[0]")
+        np.testing.assert_allclose(derivative, 1, rtol=1e-4)
+        derivative, _ = self.column(losses + "[0]", "eqv_isotropically_radiated_pow[1]")
+        np.testing.assert_allclose(derivative, 0, atol=1e-6)
+        derivative, _ = self.column(
+            "Потери сигнала от базовой станции (БС) до абонентской станции (АС)", "distance_between_antennas")
+        distance = np.array([row["distance_between_antennas"] for row in self.rows])
+        np.testing.assert_allclose(derivative, (44.9 - 6.55 * np.log10(30)) / (distance * np.log(10)), rtol=1e-4)
+
+    def test_matches_finite_difference(self):
+        """
+        Производные по tetta совпадают с разностью пакетных расчетов
+        """
+        output = "Вероятность невыполнения требований по отношению сигнал/шум"
+        derivative, elasticity = self.column(output, "tetta")
+        h = 1e-4
+        forward = batch_engineer([dict(row, tetta=row["tetta"] + h) for row in self.rows]).report()[output]
+        backward = batch_engineer([dict(row, tetta=row["tetta"] - h) for row in self.rows]).report()[output]
+        expected = (forward - backward) / (2 * h)
+        np.testing.assert_allclose(derivative, expected, rtol=1e-3)
+        value = self.result["report"][output]
+        np.testing.assert_allclose(elasticity, expected * np.array([6, 8]) / value, rtol=1e-3)
+
+    def test_selected_inputs(self):
+        result = sensitivity(rows_to_columns(self.rows), inputs=[("tetta", None)])
+        self.assertEqual(result["inputs"], ["tetta"])
+        np.testing.assert_array_equal(
+            result["jacobian"][:, :, 0], self.result["jacobian"][:, :, self.result["inputs"].index("tetta")])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from app.service import ReportService
+from app.stream import evaluate_batch
+from ftnp.cluster import Cluster
+from tests.helpers import scenario
+
+
+class ReportServiceTest(unittest.TestCase):
+    """
+    Сервер на Unix-сокете в отдельном потоке со своим циклом событий
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.directory, "service.sock")
+        cls.service = ReportService(max_delay=0.01, workers=1)
+        cls.loop = asyncio.new_event_loop()
+        cls.task = cls.loop.create_task(cls.service.serve(path=cls.path))
+        cls.thread = threading.Thread(target=cls._run_loop)
+        cls.thread.start()
+        deadline = time.monotonic() + 10
+        while not os.path.exists(cls.path):
+            if time.monotonic() > deadline:
+                raise RuntimeError("Сервер не запустился")
+            time.sleep(0.01)
+
+    @classmethod
+    def _run_loop(cls):
+        try:
+            cls.loop.run_until_complete(cls.task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            cls.loop.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.call_soon_threadsafe(cls.task.cancel)
+        cls.thread.join(60)
+        shutil.rmtree(cls.directory)
+
+    def send(self, raw):
+        """
+        Отправка запроса как есть, возвращает (код, ответ JSON)
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(60)
+            client.connect(self.path)
+            client.sendall(raw)
+            response = b""
+            while True:
+                data = client.recv(65536)
+                if not data:
+                    break
+                response += data
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body.decode("utf8"))
+
+    def request(self, method, target, payload=None):
+        body = b"" if payload is None else (
+            payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf8"))
+        return self.send(
+            "{} {} HTTP/1.1\r\nContent-Length: {}\r\nConnection: close\r\n\r\n".format(
+                method, target, len(body)).encode("latin-1") + body)
+
+    def test_report(self):
+        """
+        Одновременные запросы считаются пакетами, отчет совпадает
+        с пакетным расчетом
+        """
+        rows = [scenario(tetta=6 + k % 4, cell_sectors_num=(1, 3, 6)[k % 3]) for k in range(12)]
+        with ThreadPoolExecutor(len(rows)) as executor:
+            responses = list(executor.map(lambda row: self.request("POST", "/report", row), rows))
+        for row, (status, report), (ok, expected) in zip(rows, responses, evaluate_batch(rows)):
+            self.assertEqual(status, 200)
+            self.assertTrue(ok)
+            self.assertEqual(set(report), set(expected))
+            for key, value in expected.items():
+                self.assertEqual(report[key], value)
+        status, metrics = self.request("GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertGreaterEqual(metrics["requests"], len(rows))
+        self.assertLess(metrics["batches"], metrics["requests"])
+
+    def test_outage(self):
+        params = {"cluster_dim": 7, "tetta": 6, "cell_sectors_num": 3, "signal_to_noise_ratio": 9}
+        status, result = self.request("POST", "/outage", params)
+        self.assertEqual(status, 200)
+        expected = Cluster(7, 6, 3, 9).get_signal_to_noise_failure_probability(method="quad")
+        self.assertAlmostEqual(result["outage"], expected, places=9)
+
+    def test_bad_requests(self):
+        """
+        Ошибки в запросе - 400 с описанием "<Тип>: <сообщение>",
+        запрос не прерывает работу сервера
+        """
+        cases = [
+            (b"{not json", "JSONDecodeError: "),
+            (json.dumps({"tetta": 6}).encode("utf8"), "ValueError: Отсутствуют исходные данные"),
+            (json.dumps(scenario(city_type="HUGE")).encode("utf8"), "ValueError: Неизвестный тип города"),
+            (json.dumps(scenario(distance_between_antennas=0)).encode("utf8"),
+             "ValueError: Значения вне области определения"),
+        ]
+        for body, prefix in cases:
+            with self.subTest(prefix=prefix):
+                status, payload = self.request("POST", "/report", body)
+                self.assertEqual(status, 400)
+                self.assertTrue(payload["error"].startswith(prefix), payload["error"])
+        status, payload = self.request("POST", "/outage", {"cluster_dim": 7, "tetta": 6})
+        self.assertEqual(status, 400)
+        status, payload = self.request(
+            "POST", "/outage", {"cluster_dim": 7, "tetta": 6, "cell_sectors_num": 3,
+                                "signal_to_noise_ratio": 9, "method": "exact"})
+        self.assertEqual(status, 400)
+        for raw in (b"GARBAGE\r\n\r\n", b"POST /report HTTP/1.1\r\nContent-Length: x\r\n\r\n",
+                    b"POST /report HTTP/1.1\r\nContent-Length: -5\r\n\r\n"):
+            with self.subTest(raw=raw):
+                status, payload = self.send(raw)
+                self.assertEqual(status, 400)
+                self.assertTrue(payload["error"].startswith("Некорректный запрос"))
+        self.assertEqual(self.request("POST", "/report", scenario())[0], 200)
+
+    def test_unknown_route_and_method(self):
+        self.assertEqual(self.request("GET", "/nothing")[0], 404)
+        self.assertEqual(self.request("GET", "/report")[0], 405)
+        self.assertEqual(self.request("POST", "/metrics")[0], 405)
+
+
+if __name__ == "__main__":
+    unittest.main()
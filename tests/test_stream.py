@@ -0,0 +1,57 @@
+import io
+import json
+import unittest
+
+import numpy as np
+
+from app.stream import evaluate_batch, format_error, iter_records, run_stream
+from tests.helpers import batch_engineer, scenario
+
+
+class StreamTest(unittest.TestCase):
+
+    def test_evaluate_batch_tagged(self):
+        """
+        Отчеты и ошибки различаются признаком, а не типом значения
+        """
+        rows = [scenario(), scenario(distance_between_antennas=0), scenario(tetta=8)]
+        results = evaluate_batch(rows)
+        self.assertEqual([ok for ok, _ in results], [True, False, True])
+        self.assertIsInstance(results[1][1], ValueError)
+        self.assertIn("Потери сигнала от базовой станции", str(results[1][1]))
+        expected = batch_engineer([rows[2]]).report()
+        for key, value in results[2][1].items():
+            np.testing.assert_allclose(value, expected[key][0], rtol=1e-12)
+
+    def test_error_records(self):
+        """
+        Ошибки разбора, расчета и области определения описываются
+        одинаково: "<Тип>: <сообщение>"; ошибка касается только своей строки
+        """
+        lines = [
+            json.dumps(scenario()),
+            "{не JSON",
+            json.dumps({"tetta": 6}),
+            json.dumps(scenario(cell_sectors_num=4)),
+            "",
+            json.dumps(scenario(distance_between_antennas=0)),
+        ]
+        records = list(iter_records(lines, batch_size=16))
+        self.assertEqual([record["line"] for record in records], [1, 2, 3, 4, 6])
+        self.assertIn("report", records[0])
+        self.assertTrue(records[1]["error"].startswith("JSONDecodeError: "))
+        self.assertTrue(records[2]["error"].startswith("ValueError: Отсутствуют исходные данные"))
+        self.assertEqual(records[3]["error"], "ValueError: Неподдерживаемое число секторов: [4]")
+        self.assertTrue(records[4]["error"].startswith("ValueError: Значения вне области определения"))
+        self.assertEqual(format_error(KeyError("HUGE")), "KeyError: 'HUGE'")
+
+    def test_run_stream(self):
+        sink = io.StringIO()
+        run_stream([json.dumps(scenario(tetta=6 + k)) for k in range(5)], sink, batch_size=2)
+        records = [json.loads(line) for line in sink.getvalue().splitlines()]
+        self.assertEqual([record["line"] for record in records], [1, 2, 3, 4, 5])
+        self.assertTrue(all("report" in record for record in records))
+
+
+if __name__ == "__main__":
+    unittest.main()
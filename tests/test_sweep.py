@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from app.sweep import Checkpoint, Sweep, shard_path
+from tests.helpers import batch_engineer, scenario
+
+
+class SweepTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_shards_match_batch(self):
+        """
+        Шарды покрывают декартово произведение значений,
+        записи отчета совпадают с пакетным расчетом
+        """
+        sweep = Sweep(scenario(), {"tetta": [6, 7, 8], "cell_sectors_num": [1, 3, 6]}, shard_size=4)
+        self.assertEqual((sweep.size, sweep.shard_count), (9, 3))
+        self.assertEqual(sweep.run(self.directory, workers=2), 3)
+        rows = [scenario(tetta=t, cell_sectors_num=m) for t in (6, 7, 8) for m in (1, 3, 6)]
+        expected = batch_engineer(rows).report()
+        for shard in range(sweep.shard_count):
+            start, stop = sweep.shard_range(shard)
+            with np.load(shard_path(self.directory, shard)) as result:
+                np.testing.assert_array_equal(result["index"], np.arange(start, stop))
+                for key, value in expected.items():
+                    np.testing.assert_allclose(result[key], value[start:stop], rtol=1e-12)
+
+    def test_resume(self):
+        """
+        Повторный запуск пропускает готовые шарды, шарды делятся между машинами
+        """
+        sweep = Sweep(scenario(), {"tetta": np.arange(6, 16).tolist()}, shard_size=2)
+        self.assertEqual(sweep.run(self.directory, workers=1, machine=0, machines=2), 3)
+        self.assertEqual(sweep.run(self.directory, workers=1, machine=0, machines=2), 0)
+        os.remove(shard_path(self.directory, 2))
+        # шард из контрольной точки не пересчитывается, даже если файла нет
+        self.assertEqual(sweep.run(self.directory, workers=1, machine=0, machines=2), 0)
+        self.assertEqual(sweep.run(self.directory, workers=1, machine=1, machines=2), 2)
+        other = Sweep(scenario(), {"tetta": [6, 7]}, shard_size=2)
+        with self.assertRaises(ValueError):
+            other.run(self.directory, workers=1, machine=0, machines=2)
+        checkpoint = Checkpoint(os.path.join(self.directory, "checkpoint-1-of-2.json"), sweep.signature())
+        self.assertEqual(checkpoint.done, {1, 3})
+
+    def test_failed_shard_not_counted(self):
+        """
+        Ошибка в шарде не останавливает остальные и не считается готовым шардом
+        """
+        sweep = Sweep(scenario(), {"city_type": ["LARGE", "HUGE", "SMALL"]}, shard_size=1)
+        self.assertEqual(sweep.run(self.directory, workers=1), 2)
+        self.assertEqual(list(sweep.failures), [1])
+        self.assertTrue(sweep.failures[1].startswith("KeyError"))
+        self.assertFalse(os.path.exists(shard_path(self.directory, 1)))
+        self.assertTrue(os.path.exists(shard_path(self.directory, 2, "npz")))
+
+    def test_columnar_shards(self):
+        from app.columnar import read_columnar
+
+        sweep = Sweep(scenario(), {"tetta": [6, 7, 8]}, shard_size=2)
+        self.assertEqual(sweep.run(self.directory, workers=1, output_format="columnar"), 2)
+        columns = read_columnar(shard_path(self.directory, 1, "columnar"))
+        np.testing.assert_array_equal(columns["index"], [2])
+        np.testing.assert_array_equal(columns["tetta"], [8])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+
+from ftnp.erlang import erlang_b
+from ftnp.traffic import HOURS, TrafficProfile, erlang_b_closed_form
+
+
+class TrafficProfileTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        self.subscribers = rng.integers(100, 3000, 50)
+        hours = np.arange(HOURS)
+        self.activity = 0.025 * (0.3 + np.exp(-((hours - 19) / 3.0) ** 2))[None, :] * rng.uniform(0.5, 1.5, (50, 1))
+        self.channels = rng.integers(10, 80, 50)
+
+    def test_closed_form_matches_recursion(self):
+        a, n = np.meshgrid(np.array([0, 1e-3, 0.5, 5, 40, 90, 400, 5000.0]), np.arange(1, 120, 9))
+        np.testing.assert_allclose(erlang_b_closed_form(a, n), erlang_b(a, n), rtol=1e-9, atol=1e-12)
+
+    def test_required_channels(self):
+        """
+        Наименьшее число каналов с блокировкой не больше заданной
+        """
+        profile = TrafficProfile(blocking=0.01)
+        load = np.array([0.0, 0.01, 0.5, 4.4612, 4.47, 30.0, 250.0])
+        required = profile.required_channels(load)
+        self.assertEqual(required[0], 0)
+        for a, n in zip(load[1:], required[1:]):
+            with self.subTest(load=a):
+                self.assertLessEqual(erlang_b(a, int(n)), 0.01 * (1 + 1e-9))
+                self.assertGreater(erlang_b(a, int(n) - 1), 0.01)
+
+    def test_evaluate(self):
+        profile = TrafficProfile(blocking=0.02, channels_per_carrier=8)
+        result = profile.evaluate(self.subscribers, self.activity, self.channels)
+        load = self.subscribers[:, None] * self.activity
+        np.testing.assert_allclose(result["load"], load, rtol=1e-6)
+        self.assertEqual(result["load"].dtype, np.float32)
+        self.assertEqual(result["required_channels"].dtype, np.uint16)
+        np.testing.assert_array_equal(result["required_channels"], profile.required_channels(load))
+        np.testing.assert_array_equal(result["required_carriers"], -(-result["required_channels"].astype(int) // 8))
+        np.testing.assert_array_equal(result["busy_hour"], load.argmax(axis=1))
+        np.testing.assert_allclose(result["blocking"], erlang_b(load, self.channels[:, None]), rtol=1e-5, atol=1e-30)
+        np.testing.assert_allclose(result["network_load"], load.sum(axis=0))
+        self.assertEqual(result["peak_hour"], int(load.sum(axis=0).argmax()))
+
+    def test_chunks_and_workers(self):
+        """
+        Результат не зависит от размера порций и числа потоков,
+        заранее выделенные массивы заполняются на месте
+        """
+        expected = TrafficProfile().evaluate(self.subscribers, self.activity, self.channels)
+        out = {"load": np.zeros((50, HOURS), dtype=np.float32)}
+        result = TrafficProfile(chunk_size=7, workers=3).evaluate(self.subscribers, self.activity, self.channels, out)
+        self.assertIs(result["load"], out["load"])
+        for name in ("load", "required_channels", "required_carriers", "busy_hour", "busy_hour_load", "blocking"):
+            np.testing.assert_array_equal(result[name], expected[name])
+        np.testing.assert_allclose(result["network_load"], expected["network_load"])
+
+    def test_shared_profile(self):
+        result = TrafficProfile().evaluate(self.subscribers, self.activity[0])
+        np.testing.assert_allclose(result["load"], self.subscribers[:, None] * self.activity[0], rtol=1e-6)
+        self.assertNotIn("blocking", result)
+        with self.assertRaises(ValueError):
+            TrafficProfile().evaluate(self.subscribers, np.ones(12))
+
+
+if __name__ == "__main__":
+    unittest.main()